@@ -0,0 +1,162 @@
+"""
+Аутентификация по JWT без запроса пользователя к базе.
+
+Токен, выданный APIToken, содержит роль, признак суперпользователя
+и имя. По ним собирается несохраняемый объект пользователя, которого
+достаточно для проверки прав и указания автора. Токен доступа живет
+недолго и обновляется по refresh-токену, который при этом отзывается.
+
+Отзыв хранится в кеше: по jti для отдельных токенов и по id
+пользователя для всех токенов, выданных до смены роли или имени.
+Записи живут не дольше самих токенов, проверка - одно обращение
+к кешу.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+User = get_user_model()
+
+CLAIMS = (
+    'username',
+    'role',
+    'is_superuser',
+)
+# Поля, изменение которых отзывает выданные токены: роль и признаки
+# нужны для проверки прав, имя - для автора отзывов и комментариев.
+REVOKING_FIELDS = (
+    'username',
+    'role',
+    'is_superuser',
+    'is_active',
+)
+REVOKED_USER_KEY = 'auth:revoked:{user_id}'
+REVOKED_JTI_KEY = 'auth:jti:{jti}'
+
+
+def get_token_cache():
+    return caches[settings.AUTH_TOKEN_CACHE_ALIAS]
+
+
+def revoke_tokens(user_id):
+    """Отзывает все токены доступа пользователя, выданные до этого момента."""
+    get_token_cache().set(
+        REVOKED_USER_KEY.format(user_id=user_id),
+        time.time(),
+        timeout=int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+    )
+
+
+def revoke_token(token):
+    """
+    Отзывает токен по jti до окончания срока его действия.
+
+    Возвращает False, если токен уже был отозван.
+    """
+    return get_token_cache().add(
+        REVOKED_JTI_KEY.format(jti=token[api_settings.JTI_CLAIM]),
+        True,
+        timeout=max(token['exp'] - int(time.time()), 1),
+    )
+
+
+def is_revoked(token):
+    user_key = REVOKED_USER_KEY.format(
+        user_id=token[api_settings.USER_ID_CLAIM],
+    )
+    jti_key = REVOKED_JTI_KEY.format(jti=token[api_settings.JTI_CLAIM])
+    revoked = get_token_cache().get_many((user_key, jti_key))
+    return jti_key in revoked or (
+        user_key in revoked and token.get('iat', 0) <= revoked[user_key]
+    )
+
+
+def add_claims(token, user):
+    # Дробная часть нужна, чтобы токен, выданный сразу после смены
+    # роли, не считался отозванным.
+    token['iat'] = time.time()
+    for claim in CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class ClaimsAccessToken(AccessToken):
+    """Токен доступа с данными пользователя, нужными для проверки прав."""
+
+    @classmethod
+    def for_user(cls, user):
+        return add_claims(super().for_user(user), user)
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh-токен с теми же данными.
+
+    Они копируются в токен доступа, полученный из access_token.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        return add_claims(super().for_user(user), user)
+
+
+def get_tokens_for_user(user):
+    refresh = ClaimsRefreshToken.for_user(user)
+    return {
+        'token': str(refresh.access_token),
+        'refresh': str(refresh),
+    }
+
+
+def rotate_refresh_token(refresh):
+    """
+    Отзывает refresh-токен и выдает новую пару.
+
+    Роль и имя берутся из базы, поэтому новый токен доступа
+    содержит актуальные данные.
+    """
+    if not revoke_token(refresh):
+        raise InvalidToken('Токен уже использован или отозван.')
+    user = User.objects.filter(
+        **{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]},
+        is_active=True,
+    ).first()
+    if user is None:
+        raise InvalidToken('Пользователь не найден.')
+    return get_tokens_for_user(user)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Собирает пользователя из данных токена.
+
+    Токены без этих данных, выданные до их появления, проверяются
+    по базе, как в JWTAuthentication.
+    """
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in CLAIMS):
+            return super().get_user(validated_token)
+        if is_revoked(validated_token):
+            raise AuthenticationFailed(
+                'Токен отозван, получите новый.',
+                code='token_revoked',
+            )
+        user = User(
+            **{
+                api_settings.USER_ID_FIELD:
+                    validated_token[api_settings.USER_ID_CLAIM],
+            },
+            **{claim: validated_token[claim] for claim in CLAIMS},
+        )
+        user._state.adding = False
+        user._state.db = DEFAULT_DB_ALIAS
+        return user
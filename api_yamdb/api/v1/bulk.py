@@ -0,0 +1,98 @@
+"""Вспомогательные функции для массовых операций BulkModelMixin."""
+from django.conf import settings
+from django.db import connection, transaction
+from rest_framework.relations import ManyRelatedField
+
+from api.v1.fields import BatchSlugRelatedField
+
+
+def bulk_insert(objects):
+    """
+    Вставляет объекты одной модели пачками и заполняет их pk.
+
+    SQLite в Django 3.2 не возвращает id из bulk_create. Запись в SQLite
+    блокирует базу до конца транзакции, поэтому вставленные строки -
+    последние по id и идут в порядке вставки.
+    """
+    model = type(objects[0])
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(
+            objects,
+            batch_size=settings.BULK_BATCH_SIZE,
+        )
+    with transaction.atomic():
+        model.objects.bulk_create(
+            objects,
+            batch_size=settings.BULK_BATCH_SIZE,
+        )
+        pks = list(
+            model.objects.order_by('-pk').values_list(
+                'pk',
+                flat=True,
+            )[:len(objects)]
+        )
+    for instance, pk in zip(objects, reversed(pks)):
+        instance.pk = pk
+        instance._state.adding = False
+        instance._state.db = connection.alias
+    return objects
+
+
+def prefetch_slugs(serializer, items):
+    """
+    Загружает объекты для всех slug-полей пакета одним запросом на поле.
+
+    Результаты попадают в slug_cache из контекста serializer, откуда их
+    берут сериализаторы отдельных элементов.
+    """
+    for name, field in serializer.fields.items():
+        many = isinstance(field, ManyRelatedField)
+        relation = field.child_relation if many else field
+        if not isinstance(relation, BatchSlugRelatedField):
+            continue
+        slugs = set()
+        for item in items:
+            if not isinstance(item, dict) or name not in item:
+                continue
+            values = item[name] if many else [item[name]]
+            if isinstance(values, (list, tuple)):
+                slugs.update(
+                    str(value) for value in values
+                    if isinstance(value, (str, int))
+                )
+        relation.get_objects(slugs)
+
+
+def set_many_to_many(model, rows, replace):
+    """
+    Записывает связи многие-ко-многим пакетом.
+
+    rows - пары (объект, {имя поля: список связанных объектов}).
+    При replace прежние связи этих объектов удаляются одним запросом.
+    """
+    for field in model._meta.many_to_many:
+        changed = [
+            (instance, relations[field.name])
+            for instance, relations in rows
+            if field.name in relations
+        ]
+        if not changed:
+            continue
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        if replace:
+            through.objects.filter(**{
+                f'{source}__in': [instance.pk for instance, _ in changed],
+            }).delete()
+        through.objects.bulk_create(
+            (
+                through(**{
+                    f'{source}_id': instance.pk,
+                    f'{target}_id': related.pk,
+                })
+                for instance, related_objects in changed
+                for related in dict.fromkeys(related_objects)
+            ),
+            batch_size=settings.BULK_BATCH_SIZE,
+        )
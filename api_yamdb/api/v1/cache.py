@@ -0,0 +1,114 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+GENERATION_KEY = 'catalog:generation:{namespace}'
+RESPONSE_KEY = 'catalog:response:{namespace}:{generation}:{digest}'
+COUNT_KEY = 'catalog:count:{generations}:{digest}'
+COUNT_IGNORED_PARAMS = frozenset((
+    'page',
+    'page_size',
+    'cursor',
+    'pagination',
+    'fields',
+    'omit',
+    'format',
+))
+STATS_KEYS = {
+    'hits': 'catalog:stats:hits',
+    'misses': 'catalog:stats:misses',
+}
+
+
+def get_catalog_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def get_generations(namespaces):
+    """
+    Возвращает текущие поколения для групп ресурсов.
+
+    Поколение - это отметка времени последнего изменения в наносекундах,
+    поэтому его же можно отдавать клиенту как Last-Modified.
+    """
+    cache = get_catalog_cache()
+    keys = [
+        GENERATION_KEY.format(namespace=namespace)
+        for namespace in namespaces
+    ]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            # После вытеснения счетчика поколение не должно совпасть
+            # ни с одним из прежних, поэтому стартуем от текущего времени.
+            cache.add(key, time.time_ns(), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def get_generation(namespace):
+    return get_generations((namespace,))[0]
+
+
+def bump_generation(*namespaces):
+    """Делает недействительными все ответы для групп ресурсов."""
+    cache = get_catalog_cache()
+    for namespace in namespaces:
+        key = GENERATION_KEY.format(namespace=namespace)
+        generation = cache.get(key, 0)
+        cache.set(key, max(time.time_ns(), generation + 1), timeout=None)
+
+
+def make_response_key(namespace, request):
+    """
+    Ключ строится по хосту, пути, отсортированным параметрам запроса
+    и согласованному типу ответа: Accept с pagination=cursor меняет
+    форму списка.
+    """
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    media_type = getattr(request, 'accepted_media_type', '')
+    location = f'{media_type}:{request.get_host()}{request.path}?{query}'
+    return RESPONSE_KEY.format(
+        namespace=namespace,
+        generation=get_generation(namespace),
+        digest=hashlib.sha1(location.encode()).hexdigest(),
+    )
+
+
+def make_count_key(namespaces, request):
+    """
+    Ключ количества объектов списка.
+
+    Параметры страницы и формы ответа на количество не влияют
+    и в ключ не входят.
+    """
+    query = urlencode(sorted(
+        (name, values) for name, values in request.query_params.lists()
+        if name not in COUNT_IGNORED_PARAMS
+    ), doseq=True)
+    generations = ':'.join(map(str, get_generations(namespaces)))
+    return COUNT_KEY.format(
+        generations=generations,
+        digest=hashlib.sha1(f'{request.path}?{query}'.encode()).hexdigest(),
+    )
+
+
+def record(outcome):
+    cache = get_catalog_cache()
+    key = STATS_KEYS[outcome]
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_cache_stats():
+    """Возвращает счетчики попаданий и промахов кеша каталога."""
+    values = get_catalog_cache().get_many(STATS_KEYS.values())
+    return {
+        outcome: values.get(key, 0) for outcome, key in STATS_KEYS.items()
+    }
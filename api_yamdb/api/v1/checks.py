@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+CACHE_BUCKET_STORE = 'api.v1.throttling.CacheBucketStore'
+
+
+def is_process_local(alias):
+    return settings.CACHES[alias]['BACKEND'] in PROCESS_LOCAL_CACHES
+
+
+@register(Tags.caches, Tags.security)
+def check_auth_caches(app_configs, **kwargs):
+    """
+    Отзыв токенов и ограничение частоты должны храниться в общем кеше.
+
+    В кеше памяти процесса отозванный токен доступа и уже обмененный
+    refresh-токен продолжают работать в других процессах. При DEBUG
+    проверка не выполняется.
+    """
+    if settings.DEBUG:
+        return []
+    messages = []
+    if is_process_local(settings.AUTH_TOKEN_CACHE_ALIAS):
+        messages.append(Error(
+            'Кеш AUTH_TOKEN_CACHE_ALIAS хранится в памяти процесса: '
+            'отзыв токенов не действует в других процессах.',
+            hint='Задайте общий бэкенд кеша переменными CACHE_BACKEND '
+                 'и CACHE_LOCATION, например '
+                 'django.core.cache.backends.db.DatabaseCache.',
+            id='api.E001',
+        ))
+    if (
+        settings.AUTH_THROTTLE_STORE == CACHE_BUCKET_STORE
+        and is_process_local(settings.AUTH_THROTTLE_CACHE_ALIAS)
+    ):
+        messages.append(Warning(
+            'Кеш AUTH_THROTTLE_CACHE_ALIAS хранится в памяти процесса: '
+            'ограничение частоты считается в каждом процессе отдельно.',
+            hint='Задайте общий бэкенд кеша переменной CACHE_BACKEND.',
+            id='api.W001',
+        ))
+    return messages
@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+from api.v1.cache import get_catalog_cache, make_count_key
+
+
+class CountingPaginator(Paginator):
+    """Paginator, который берет количество объектов у стратегии подсчета."""
+
+    def __init__(self, object_list, per_page, counter, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.counter = counter
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            # Списки, например результаты поиска, считаются как обычно.
+            return len(self.object_list)
+        return self.counter(self.object_list)
+
+
+class ExactCount:
+    """Точный SELECT COUNT(*) на каждый запрос."""
+
+    def __init__(self, view, request):
+        self.view = view
+        self.request = request
+
+    def count(self, queryset):
+        return queryset.count()
+
+
+class CachedCount(ExactCount):
+    """
+    Количество из кеша каталога.
+
+    Ключ строится по пути, параметрам фильтрации и поколениям
+    get_version_namespaces() представления, поэтому сигналы,
+    сдвигающие поколения, делают сохраненное количество устаревшим.
+    """
+
+    def get_cache_key(self):
+        return make_count_key(
+            self.view.get_version_namespaces(),
+            self.request,
+        )
+
+    def count(self, queryset):
+        cache = get_catalog_cache()
+        key = self.get_cache_key()
+        count = cache.get(key)
+        if count is None:
+            count = super().count(queryset)
+            cache.set(key, count, timeout=settings.COUNT_CACHE_TIMEOUT)
+        return count
+
+
+class AutoCount(CachedCount):
+    """
+    Точный подсчет для небольших выборок, кешированный - для больших.
+
+    Подзапрос с LIMIT COUNT_EXACT_THRESHOLD + 1 останавливается,
+    как только строк становится больше порога.
+    """
+
+    def count(self, queryset):
+        threshold = settings.COUNT_EXACT_THRESHOLD
+        count = queryset.order_by()[:threshold + 1].count()
+        if count <= threshold:
+            return count
+        return super().count(queryset)
+
+
+class RelatedCount(ExactCount):
+    """
+    Количество из счетчика родительской записи.
+
+    Представление возвращает его свойством stored_count, например
+    rating_count произведения для списка отзывов; свойство читается
+    один раз за запрос и используется также для ETag списка.
+    Если счетчика нет, выполняется точный подсчет.
+    """
+
+    def count(self, queryset):
+        count = self.view.stored_count
+        if count is None:
+            return super().count(queryset)
+        return count
+
+
+COUNT_STRATEGIES = {
+    'exact': ExactCount,
+    'cached': CachedCount,
+    'auto': AutoCount,
+    'related': RelatedCount,
+}
+
+
+def get_count_strategy(name, view, request):
+    try:
+        strategy_class = COUNT_STRATEGIES[name]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f'Неизвестная стратегия подсчета в PAGINATION_POLICIES: {name}'
+        )
+    return strategy_class(view, request)
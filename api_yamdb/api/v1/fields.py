@@ -0,0 +1,90 @@
+from rest_framework.relations import (MANY_RELATION_KWARGS, ManyRelatedField,
+                                      SlugRelatedField)
+
+
+class ManySlugRelatedField(ManyRelatedField):
+    """Список slug, который разрешается одним запросом."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.resolve(data)
+
+
+class BatchSlugRelatedField(SlugRelatedField):
+    """
+    SlugRelatedField, который загружает объекты запросом slug__in.
+
+    С many=True весь список разрешается одним запросом, а отсутствующие
+    slug перечисляются в одной ошибке. Если в контексте сериализатора
+    есть словарь slug_cache, найденные и отсутствующие объекты
+    запоминаются в нем, и сериализаторы одного пакета делят результаты
+    запросов: {(модель, slug_field): {slug: объект или None}}.
+    """
+
+    default_error_messages = {
+        'does_not_exist_many': 'Объекты с {slug_name}={value} не существуют.',
+    }
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {
+            'child_relation': cls(*args, **kwargs),
+        }
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManySlugRelatedField(**list_kwargs)
+
+    def get_cache_key(self):
+        return self.get_queryset().model, self.slug_field
+
+    def get_objects(self, slugs):
+        """Возвращает словарь {slug: объект или None} для всех slugs."""
+        cache = self.context.get('slug_cache')
+        objects = (
+            {} if cache is None
+            else cache.setdefault(self.get_cache_key(), {})
+        )
+        missing = set(slugs) - set(objects)
+        if missing:
+            found = {
+                str(getattr(instance, self.slug_field)): instance
+                for instance in self.get_queryset().filter(
+                    **{f'{self.slug_field}__in': missing},
+                )
+            }
+            for slug in missing:
+                objects[slug] = found.get(slug)
+        return objects
+
+    def resolve(self, values):
+        if any(not isinstance(value, (str, int)) for value in values):
+            self.fail('invalid')
+        slugs = [str(value) for value in values]
+        objects = self.get_objects(slugs)
+        missing = [
+            slug for slug in dict.fromkeys(slugs)
+            if objects[slug] is None
+        ]
+        if missing:
+            self.fail(
+                'does_not_exist_many',
+                slug_name=self.slug_field,
+                value=', '.join(missing),
+            )
+        return [objects[slug] for slug in slugs]
+
+    def to_internal_value(self, data):
+        if not isinstance(data, (str, int)):
+            self.fail('invalid')
+        instance = self.get_objects([str(data)])[str(data)]
+        if instance is None:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field,
+                value=str(data),
+            )
+        return instance
@@ -1,3 +1,4 @@
+from django.db.models import Exists, OuterRef
 from django_filters.rest_framework import CharFilter, FilterSet
 
 from reviews.models import Title
@@ -7,7 +8,7 @@ class TitleFilter(FilterSet):
     """Фильтр преобразовывает поля жанра и категории."""
 
     genre = CharFilter(
-        field_name='genre__slug',
+        method='filter_genre',
     )
     category = CharFilter(
         field_name='category__slug',
@@ -19,3 +20,15 @@ class TitleFilter(FilterSet):
             'name',
             'year',
         )
+
+    def filter_genre(self, queryset, name, value):
+        # Подзапрос вместо JOIN: произведения читаются по индексу
+        # в порядке name, без сортировки во временном B-дереве.
+        return queryset.filter(
+            Exists(
+                Title.genre.through.objects.filter(
+                    title=OuterRef('pk'),
+                    genre__slug=value,
+                ),
+            ),
+        )
@@ -1,5 +1,30 @@
-from django.db.models import prefetch_related_objects
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count, Max, prefetch_related_objects
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
+from rest_framework.status import (HTTP_200_OK, HTTP_201_CREATED,
+                                   HTTP_204_NO_CONTENT, HTTP_304_NOT_MODIFIED,
+                                   HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND)
+
+from api_yamdb.constants import BULK_URL_PATH
+from api.v1.bulk import bulk_insert, prefetch_slugs, set_many_to_many
+from api.v1.cache import (get_catalog_cache, get_generations,
+                          make_response_key, record)
+from api.v1.pagination import COUNT_RELATED, get_pagination_policy
+from api.v1.sparse import is_sparse_request, prune_queryset
+from reviews.signals import bulk_saved
+
+
+class NotModified(Exception):
+    def __init__(self, response):
+        self.response = response
 
 
 class PatchModelMixin:
@@ -25,3 +50,418 @@ class PatchModelMixin:
                 *queryset._prefetch_related_lookups,
             )
         return Response(serializer.data)
+
+
+class CatalogCacheMixin:
+    """
+    Миксин кеширует ответы на GET-запросы анонимных пользователей.
+
+    Ключ кеша содержит поколение группы ресурсов cache_namespace,
+    которое увеличивается сигналами при изменении моделей каталога.
+    """
+
+    cache_namespace = None
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        cache = get_catalog_cache()
+        key = make_response_key(self.cache_namespace, request)
+        data = cache.get(key)
+        if data is not None:
+            record('hits')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        record('misses')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == HTTP_200_OK:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list,
+            request,
+            *args,
+            **kwargs,
+        )
+
+
+class ConditionalGetMixin:
+    """
+    Миксин поддерживает условные GET-запросы для list и retrieve.
+
+    ETag и Last-Modified строятся из поколений version_namespaces,
+    а для списков с version_date_field - еще и из количества объектов
+    и максимальной даты. Если количество хранится у родительской
+    записи (стратегия подсчета related), агрегатный запрос
+    не выполняется: любое изменение списка сдвигает поколение.
+    Совпавший If-None-Match возвращает 304 до выборки и сериализации
+    объектов.
+    """
+
+    version_namespaces = ()
+    version_date_field = None
+
+    def get_version_namespaces(self):
+        return self.version_namespaces
+
+    def get_validators(self):
+        generations = get_generations(self.get_version_namespaces())
+        parts = [self.request.accepted_media_type, *generations]
+        last_modified = max(generations, default=0) / 10 ** 9
+        if self.action == 'list' and self.version_date_field:
+            stored_count = self.get_stored_list_count()
+            if stored_count is not None:
+                parts.append(stored_count)
+                return self.make_validators(parts, last_modified)
+            aggregate = self.filter_queryset(
+                self.get_queryset(),
+            ).aggregate(
+                count=Count('pk'),
+                last=Max(self.version_date_field),
+            )
+            parts.extend((aggregate['count'], aggregate['last']))
+            if aggregate['last']:
+                last_modified = max(
+                    last_modified,
+                    aggregate['last'].timestamp(),
+                )
+        return self.make_validators(parts, last_modified)
+
+    def get_stored_list_count(self):
+        policy = get_pagination_policy(
+            getattr(self, 'pagination_policy', 'default'),
+        )
+        if policy['count'] != COUNT_RELATED:
+            return None
+        return self.stored_count
+
+    def make_validators(self, parts, last_modified):
+        etag = hashlib.sha1(
+            ':'.join(map(str, parts)).encode(),
+        ).hexdigest()
+        return quote_etag(etag), int(last_modified)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validators = None
+        if (
+            request.method not in ('GET', 'HEAD')
+            or self.action not in ('list', 'retrieve')
+            or not (self.get_version_namespaces() or self.version_date_field)
+        ):
+            return
+        self.validators = self.get_validators()
+        etag, last_modified = self.validators
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request,
+            response,
+            *args,
+            **kwargs,
+        )
+        validators = getattr(self, 'validators', None)
+        if validators and response.status_code in (
+            HTTP_200_OK,
+            HTTP_304_NOT_MODIFIED,
+        ):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class SparseFieldsViewMixin:
+    """
+    Миксин убирает из выборки связи, которые не попадут в ответ.
+
+    Поля ответа ограничиваются параметрами fields и omit (см.
+    api.v1.sparse.SparseFieldsMixin у сериализаторов); если, например,
+    жанры не запрошены, их prefetch_related не выполняется.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not is_sparse_request(self.request):
+            return queryset
+        sources = {
+            field.source.split('.')[0]
+            for field in self.get_serializer().fields.values()
+            if not field.write_only
+        }
+        if '*' in sources:
+            return queryset
+        return prune_queryset(queryset, sources)
+
+
+class BulkModelMixin:
+    """
+    Миксин добавляет массовые операции по адресу bulk/.
+
+    POST создает объекты из списка, PATCH частично изменяет объекты,
+    найденные по bulk_lookup_field, DELETE удаляет объекты по списку
+    значений bulk_lookup_field. Связанные объекты по slug загружаются
+    одним запросом на поле, объекты и связи многие-ко-многим пишутся
+    пачками. Ошибка в одном элементе не отменяет остальные: ответ -
+    список результатов в порядке элементов запроса.
+    """
+
+    bulk_lookup_field = None
+
+    def get_bulk_lookup_field(self):
+        if self.bulk_lookup_field:
+            return self.bulk_lookup_field
+        return 'id' if self.lookup_field == 'pk' else self.lookup_field
+
+    @action(
+        methods=[
+            'post',
+            'patch',
+            'delete',
+        ],
+        detail=False,
+        url_path=BULK_URL_PATH,
+    )
+    def bulk(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError('Ожидается непустой список.')
+        if len(items) > settings.BULK_MAX_ITEMS:
+            raise ValidationError(
+                f'За один запрос можно передать не больше '
+                f'{settings.BULK_MAX_ITEMS} элементов.'
+            )
+        handler = {
+            'POST': self.bulk_create,
+            'PATCH': self.bulk_update,
+            'DELETE': self.bulk_destroy,
+        }[request.method]
+        return Response(handler(items))
+
+    def get_bulk_keys(self, values, results):
+        """Приводит значения lookup к типу поля модели."""
+        lookup = self.get_bulk_lookup_field()
+        field = self.get_queryset().model._meta.get_field(lookup)
+        keys = []
+        for index, value in enumerate(values):
+            try:
+                if value is None or isinstance(value, (dict, list)):
+                    raise DjangoValidationError('')
+                keys.append(field.to_python(value))
+            except DjangoValidationError:
+                keys.append(None)
+                results[index] = {
+                    'status': HTTP_400_BAD_REQUEST,
+                    'errors': {
+                        lookup: ['Укажите корректное значение.'],
+                    },
+                }
+        return keys
+
+    def validate_bulk(self, items, instances, results):
+        """Проверяет элементы, которые еще не получили результат."""
+        model = self.get_queryset().model
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        context['slug_cache'] = {}
+        prefetch_slugs(serializer_class(context=context), items)
+        # Повторы внутри пакета не видны валидаторам уникальности.
+        seen = {
+            field.name: set()
+            for field in model._meta.fields
+            if field.unique and not field.primary_key
+        }
+        valid = []
+        for index, (item, instance) in enumerate(zip(items, instances)):
+            if results[index] is not None:
+                continue
+            serializer = serializer_class(
+                instance,
+                data=item,
+                partial=instance is not None,
+                context=context,
+            )
+            if not serializer.is_valid():
+                results[index] = {
+                    'status': HTTP_400_BAD_REQUEST,
+                    'errors': serializer.errors,
+                }
+                continue
+            data = serializer.validated_data
+            duplicates = {
+                name: ['Значение повторяется в запросе.']
+                for name, values in seen.items()
+                if name in data and data[name] in values
+            }
+            if duplicates:
+                results[index] = {
+                    'status': HTTP_400_BAD_REQUEST,
+                    'errors': duplicates,
+                }
+                continue
+            for name, values in seen.items():
+                if name in data:
+                    values.add(data[name])
+            valid.append((index, serializer))
+        return valid
+
+    def split_validated_data(self, serializer):
+        model = self.get_queryset().model
+        data = dict(serializer.validated_data)
+        relations = {
+            field.name: data.pop(field.name)
+            for field in model._meta.many_to_many
+            if field.name in data
+        }
+        return data, relations
+
+    def finish_bulk_save(self, instances):
+        model = self.get_queryset().model
+        for instance in instances:
+            instance._prefetched_objects_cache = {}
+        prefetch_related_objects(
+            instances,
+            *self.get_queryset()._prefetch_related_lookups,
+        )
+        bulk_saved.send(sender=model, instances=instances)
+
+    def bulk_create(self, items):
+        model = self.get_queryset().model
+        results = [None] * len(items)
+        rows = []
+        for index, serializer in self.validate_bulk(
+            items,
+            [None] * len(items),
+            results,
+        ):
+            data, relations = self.split_validated_data(serializer)
+            serializer.instance = model(**data)
+            rows.append((index, serializer, relations))
+        if rows:
+            instances = [serializer.instance for _, serializer, _ in rows]
+            with transaction.atomic():
+                bulk_insert(instances)
+                set_many_to_many(
+                    model,
+                    [
+                        (serializer.instance, relations)
+                        for _, serializer, relations in rows
+                    ],
+                    replace=False,
+                )
+            self.finish_bulk_save(instances)
+        for index, serializer, _ in rows:
+            results[index] = {
+                'status': HTTP_201_CREATED,
+                'data': serializer.data,
+            }
+        return results
+
+    def bulk_update(self, items):
+        model = self.get_queryset().model
+        lookup = self.get_bulk_lookup_field()
+        results = [None] * len(items)
+        keys = self.get_bulk_keys(
+            [
+                item.get(lookup) if isinstance(item, dict) else None
+                for item in items
+            ],
+            results,
+        )
+        found = self.get_queryset().in_bulk(
+            {key for key in keys if key is not None},
+            field_name=lookup,
+        )
+        instances = []
+        seen = set()
+        for index, key in enumerate(keys):
+            instance = found.get(key)
+            if results[index] is None and instance is None:
+                results[index] = {
+                    'status': HTTP_404_NOT_FOUND,
+                    'errors': {'detail': NotFound.default_detail},
+                }
+            elif results[index] is None and key in seen:
+                results[index] = {
+                    'status': HTTP_400_BAD_REQUEST,
+                    'errors': {lookup: ['Объект повторяется в запросе.']},
+                }
+            seen.add(key)
+            instances.append(instance)
+        rows = []
+        fields = set()
+        for index, serializer in self.validate_bulk(
+            items,
+            instances,
+            results,
+        ):
+            data, relations = self.split_validated_data(serializer)
+            for attr, value in data.items():
+                setattr(serializer.instance, attr, value)
+            fields.update(data)
+            rows.append((index, serializer, relations))
+        if rows:
+            instances = [serializer.instance for _, serializer, _ in rows]
+            with transaction.atomic():
+                if fields:
+                    model.objects.bulk_update(
+                        instances,
+                        fields,
+                        batch_size=settings.BULK_BATCH_SIZE,
+                    )
+                set_many_to_many(
+                    model,
+                    [
+                        (serializer.instance, relations)
+                        for _, serializer, relations in rows
+                    ],
+                    replace=True,
+                )
+            self.finish_bulk_save(instances)
+        for index, serializer, _ in rows:
+            results[index] = {
+                'status': HTTP_200_OK,
+                'data': serializer.data,
+            }
+        return results
+
+    def bulk_destroy(self, items):
+        model = self.get_queryset().model
+        lookup = self.get_bulk_lookup_field()
+        results = [None] * len(items)
+        keys = self.get_bulk_keys(items, results)
+        queryset = model.objects.filter(**{
+            f'{lookup}__in': {key for key in keys if key is not None},
+        })
+        with transaction.atomic():
+            existing = set(queryset.values_list(lookup, flat=True))
+            queryset.delete()
+        for index, key in enumerate(keys):
+            if results[index] is not None:
+                continue
+            if key in existing:
+                results[index] = {
+                    'status': HTTP_204_NO_CONTENT,
+                }
+            else:
+                results[index] = {
+                    'status': HTTP_404_NOT_FOUND,
+                    'errors': {'detail': NotFound.default_detail},
+                }
+        return results
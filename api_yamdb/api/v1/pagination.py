@@ -0,0 +1,199 @@
+from functools import partial
+
+from django.conf import settings
+from django.http.multipartparser import parse_header
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+from api.v1.counting import CountingPaginator, get_count_strategy
+
+COUNT_EXACT = 'exact'
+COUNT_NONE = 'none'
+COUNT_RELATED = 'related'
+
+
+def get_pagination_policy(name):
+    """
+    Возвращает настройки пагинации для группы маршрутов.
+
+    Значения из PAGINATION_POLICIES[name] дополняются политикой default.
+    """
+    policies = settings.PAGINATION_POLICIES
+    return {
+        **policies['default'],
+        **policies.get(name, {}),
+    }
+
+
+class UncountedPage:
+    """Страница без COUNT(*): о следующей говорит лишняя строка выборки."""
+
+    def __init__(self, object_list, number, has_next):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self.number > 1
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class PolicyPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с настройками из PAGINATION_POLICIES.
+
+    Группа настроек берется из атрибута pagination_policy представления.
+    Размер страницы можно передать параметром ?page_size= не больше
+    max_page_size. Параметр count выбирает стратегию подсчета
+    из api.v1.counting.COUNT_STRATEGIES; при count='none' COUNT(*)
+    не выполняется, а в ответе count равен null.
+    """
+
+    page_size_query_param = 'page_size'
+    uncounted = False
+
+    def apply_policy(self, view):
+        self.policy = get_pagination_policy(
+            getattr(view, 'pagination_policy', 'default'),
+        )
+        self.page_size = self.policy['page_size']
+        self.max_page_size = self.policy['max_page_size']
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.apply_policy(view)
+        self.uncounted = self.policy['count'] == COUNT_NONE
+        if self.uncounted:
+            return self.paginate_uncounted(queryset, request)
+        strategy = get_count_strategy(self.policy['count'], view, request)
+        self.django_paginator_class = partial(
+            CountingPaginator,
+            counter=strategy.count,
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def paginate_uncounted(self, queryset, request):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        try:
+            number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            number = 0
+        if number < 1:
+            raise NotFound(self.invalid_page_message)
+        offset = (number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if number > 1 and not rows:
+            raise NotFound(self.invalid_page_message)
+        self.page = UncountedPage(
+            rows[:page_size],
+            number,
+            has_next=len(rows) > page_size,
+        )
+        self.request = request
+        return list(self.page)
+
+    def get_count(self):
+        return None if self.uncounted else self.page.paginator.count
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.get_count(),
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_html_context(self):
+        if self.uncounted:
+            return {
+                'previous_url': self.get_previous_link(),
+                'next_url': self.get_next_link(),
+                'page_links': [],
+            }
+        return super().get_html_context()
+
+
+class OptionalCursorPagination(PolicyPagination):
+    """
+    Постраничная пагинация с переключением на курсорную.
+
+    Курсорный режим включается параметром ?pagination=cursor,
+    заголовком Accept: application/json; pagination=cursor
+    или наличием параметра ?cursor= из ссылок next/previous.
+    В курсорном режиме не выполняется COUNT(*) и OFFSET по номеру страницы.
+    """
+
+    cursor_ordering = ('id',)
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+
+    def use_cursor(self, request):
+        if CursorPagination.cursor_query_param in request.query_params:
+            return True
+        if request.query_params.get(self.mode_query_param) == self.cursor_mode:
+            return True
+        accepted_media_type = getattr(request, 'accepted_media_type', '')
+        if not accepted_media_type:
+            return False
+        _, params = parse_header(accepted_media_type.encode('ascii'))
+        return params.get(self.mode_query_param) == self.cursor_mode.encode()
+
+    def get_cursor_paginator(self):
+        paginator = CursorPagination()
+        paginator.ordering = self.cursor_ordering
+        paginator.page_size = self.page_size
+        paginator.page_size_query_param = self.page_size_query_param
+        paginator.max_page_size = self.max_page_size
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request):
+            self.apply_policy(view)
+            self.cursor_paginator = self.get_cursor_paginator()
+            return self.cursor_paginator.paginate_queryset(
+                queryset,
+                request,
+                view,
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
+
+
+class TitlePagination(OptionalCursorPagination):
+    cursor_ordering = (
+        'name',
+        'id',
+    )
+
+
+class PubDatePagination(OptionalCursorPagination):
+    cursor_ordering = (
+        'pub_date',
+        'id',
+    )
@@ -0,0 +1,261 @@
+"""
+Профилирование запросов.
+
+Профиль включается заголовком PROFILING_HEADER (только при DEBUG
+или для администратора) или случайно с вероятностью
+PROFILING_SAMPLE_RATE. Для включенного профиля
+записывается время этапов (аутентификация, права, фильтрация,
+сериализация, рендеринг) и запросов к базе. Результат пишется
+в лог api.v1.profiling строкой JSON, а для запросов с заголовком -
+еще и в заголовок ответа Server-Timing. Без профиля этапы
+не измеряются и запросы к базе не оборачиваются.
+"""
+import json
+import logging
+import random
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.exceptions import APIException
+
+from api.v1.authentication import ClaimsJWTAuthentication
+
+logger = logging.getLogger(__name__)
+
+SQL_LOG_LENGTH = 300
+
+_profile = ContextVar('profile', default=None)
+
+
+def get_profile():
+    return _profile.get()
+
+
+def span(name):
+    """Измеряет этап, если для текущего запроса включен профиль."""
+    profile = _profile.get()
+    if profile is None:
+        return nullcontext()
+    return profile.span(name)
+
+
+def to_ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+class RequestProfile:
+    """Время этапов и запросов к базе одного HTTP-запроса."""
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.total = None
+        self.timings = defaultdict(float)
+        self.active = set()
+        self.queries = []
+
+    @contextmanager
+    def span(self, name):
+        # Вложенный этап с тем же именем уже измеряется внешним.
+        if name in self.active:
+            yield
+            return
+        self.active.add(name)
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += perf_counter() - started
+            self.active.discard(name)
+
+    def wrap(self, name, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def execute(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, perf_counter() - started))
+
+    def finish(self):
+        self.total = perf_counter() - self.started
+
+    def get_db_stats(self):
+        counts = Counter(sql for sql, _ in self.queries)
+        slowest = max(self.queries, key=lambda query: query[1], default=None)
+        return {
+            'count': len(self.queries),
+            'time_ms': to_ms(sum(duration for _, duration in self.queries)),
+            'duplicates': [
+                {'sql': sql[:SQL_LOG_LENGTH], 'count': count}
+                for sql, count in counts.most_common()
+                if count > 1
+            ],
+            'slowest': slowest and {
+                'sql': slowest[0][:SQL_LOG_LENGTH],
+                'ms': to_ms(slowest[1]),
+            },
+        }
+
+    def get_server_timing(self):
+        db = self.get_db_stats()
+        timings = {
+            'total': self.total,
+            **self.timings,
+            'db': sum(duration for _, duration in self.queries),
+        }
+        metrics = []
+        for name, duration in timings.items():
+            metric = f'{name};dur={to_ms(duration)}'
+            if name == 'db':
+                metric += (
+                    f';desc="{db["count"]} queries, '
+                    f'{len(db["duplicates"])} duplicated"'
+                )
+            metrics.append(metric)
+        return ', '.join(metrics)
+
+    def as_dict(self):
+        return {
+            'total_ms': to_ms(self.total),
+            'timings_ms': {
+                name: to_ms(duration)
+                for name, duration in self.timings.items()
+            },
+            'db': self.get_db_stats(),
+        }
+
+
+def is_staff_request(request):
+    # Middleware стоит до AuthenticationMiddleware, поэтому пользователь
+    # берется из JWT так же, как в API, без запроса к базе.
+    try:
+        authenticated = ClaimsJWTAuthentication().authenticate(request)
+    except APIException:
+        return False
+    return authenticated is not None and authenticated[0].is_admin
+
+
+def is_profiling_requested(request):
+    """Заголовок учитывается только при DEBUG или от администратора."""
+    header = settings.PROFILING_HEADER
+    if not header:
+        return False
+    meta_key = 'HTTP_' + header.upper().replace('-', '_')
+    if request.META.get(meta_key, '') in ('', '0'):
+        return False
+    return settings.DEBUG or is_staff_request(request)
+
+
+class ProfilingMiddleware:
+    """
+    Middleware включает профиль запроса.
+
+    Должно стоять первым в MIDDLEWARE, чтобы total покрывал
+    остальные middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        requested = is_profiling_requested(request)
+        sample_rate = settings.PROFILING_SAMPLE_RATE
+        if not requested and not (
+            sample_rate and random.random() < sample_rate
+        ):
+            return self.get_response(request)
+        profile = RequestProfile()
+        token = _profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(profile.execute),
+                    )
+                response = self.get_response(request)
+        finally:
+            _profile.reset(token)
+        profile.finish()
+        if requested:
+            response['Server-Timing'] = profile.get_server_timing()
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **profile.as_dict(),
+        }
+        logger.info(
+            json.dumps(record, ensure_ascii=False),
+            extra={'profile': record},
+        )
+        return response
+
+
+class ProfilingViewMixin:
+    """
+    Миксин делит время обработки во view на этапы профиля.
+
+    Аутентификация, проверки прав и частоты, filter_queryset
+    (в том числе TitleFilter), сериализация и рендеринг ответа
+    измеряются отдельно. Без профиля методы не оборачиваются.
+    """
+
+    def perform_authentication(self, request):
+        with span('auth'):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with span('permissions'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with span('permissions'):
+            super().check_object_permissions(request, obj)
+
+    def check_throttles(self, request):
+        with span('throttles'):
+            super().check_throttles(request)
+
+    def filter_queryset(self, queryset):
+        with span('filter'):
+            return super().filter_queryset(queryset)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        profile = get_profile()
+        if profile is not None:
+            # Данные ответа строятся в to_representation, для списков
+            # произведений - в to_values_representation.
+            serializer.to_representation = profile.wrap(
+                'serialize',
+                serializer.to_representation,
+            )
+            if hasattr(serializer, 'to_values_representation'):
+                serializer.to_values_representation = profile.wrap(
+                    'serialize',
+                    serializer.to_values_representation,
+                )
+        return serializer
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request,
+            response,
+            *args,
+            **kwargs,
+        )
+        profile = get_profile()
+        renderer = getattr(response, 'accepted_renderer', None)
+        if profile is not None and renderer is not None:
+            renderer.render = profile.wrap('render', renderer.render)
+        return response
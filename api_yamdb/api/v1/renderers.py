@@ -0,0 +1,54 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson, если пакет установлен.
+
+    Вывод совпадает с JSONRenderer при настройках по умолчанию:
+    компактный, без экранирования не-ASCII символов. Отступы для
+    браузера, другие настройки JSON, значения, которые orjson не умеет
+    кодировать, и отсутствие orjson обрабатываются JSONRenderer.
+    В отличие от него NaN и Infinity выводятся как null.
+    """
+
+    def use_orjson(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and self.compact
+            and not self.ensure_ascii
+            and not self.get_indent(accepted_media_type, renderer_context)
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.use_orjson(
+            accepted_media_type,
+            renderer_context or {},
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                # Даты кодирует JSONEncoder DRF: у orjson другой формат.
+                option=(
+                    orjson.OPT_NON_STR_KEYS
+                    | orjson.OPT_PASSTHROUGH_DATETIME
+                ),
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Как и JSONRenderer, экранируем разделители строк для JavaScript.
+        return ret.replace(
+            LINE_SEPARATOR, b'\\u2028',
+        ).replace(
+            PARAGRAPH_SEPARATOR, b'\\u2029',
+        )
@@ -1,17 +1,25 @@
 from django.contrib.auth import get_user_model
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from rest_framework import serializers
 from rest_framework.fields import CharField
 from rest_framework.relations import SlugRelatedField
 from rest_framework.serializers import ModelSerializer
 from rest_framework.validators import UniqueTogetherValidator
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from api.v1.fields import BatchSlugRelatedField
+from api.v1.sparse import SparseFieldsMixin
+from api.v1.values import ValuesSerializerMixin
 from api_yamdb.constants import MAX_LENGHT_TOKEN
+from ranking.models import RankingEntry
 from reviews.models import Category, Comment, Genre, Review, Title
+from search.models import SearchDocument
 
 User = get_user_model()
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         fields = (
             'name',
@@ -20,7 +28,7 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         fields = (
             'name',
@@ -29,12 +37,12 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleCreateSerializer(serializers.ModelSerializer):
-    category = SlugRelatedField(
+class TitleCreateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    category = BatchSlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all(),
     )
-    genre = SlugRelatedField(
+    genre = BatchSlugRelatedField(
         slug_field='slug',
         queryset=Genre.objects.all(),
         many=True,
@@ -56,7 +64,7 @@ class TitleCreateSerializer(serializers.ModelSerializer):
         model = Title
 
 
-class TitleGetSerializer(TitleCreateSerializer):
+class TitleGetSerializer(ValuesSerializerMixin, TitleCreateSerializer):
     category = CategorySerializer()
     genre = GenreSerializer(
         read_only=True,
@@ -64,6 +72,38 @@ class TitleGetSerializer(TitleCreateSerializer):
     )
 
 
+class TitleStatsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Статистика оценок произведения из денормализованных полей."""
+
+    histogram = serializers.DictField(
+        child=serializers.IntegerField(),
+        read_only=True,
+    )
+    review_count = serializers.IntegerField(
+        source='rating_count',
+        read_only=True,
+    )
+    mean = serializers.FloatField(
+        source='rating',
+        read_only=True,
+    )
+    median = serializers.FloatField(
+        source='score_median',
+        read_only=True,
+    )
+
+    class Meta:
+        fields = (
+            'id',
+            'histogram',
+            'review_count',
+            'comment_count',
+            'mean',
+            'median',
+        )
+        model = Title
+
+
 class CurrentTitleDefault:
     requires_context = True
 
@@ -71,7 +111,7 @@ class CurrentTitleDefault:
         return serializer_field.context['view'].kwargs['title_id']
 
 
-class ReviewSerializer(ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, ModelSerializer):
     author = SlugRelatedField(
         read_only=True,
         slug_field='username',
@@ -103,7 +143,7 @@ class ReviewSerializer(ModelSerializer):
         ]
 
 
-class CommentSerializer(ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, ModelSerializer):
     author = SlugRelatedField(
         read_only=True,
         slug_field='username',
@@ -127,6 +167,17 @@ class SignUpSerializer(serializers.ModelSerializer):
             'username',
             'email',
         )
+        # Уникальность проверяет api.v1.services.sign_up одним запросом.
+        extra_kwargs = {
+            'username': {
+                'validators': (
+                    UnicodeUsernameValidator(),
+                ),
+            },
+            'email': {
+                'validators': (),
+            },
+        }
 
     def validate_username(self, value):
         if value == 'me':
@@ -143,7 +194,29 @@ class TokenSerializer(serializers.Serializer):
     confirmation_code = CharField()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class RefreshSerializer(serializers.Serializer):
+    refresh = CharField()
+
+    def validate_refresh(self, value):
+        try:
+            return RefreshToken(value)
+        except TokenError as error:
+            raise InvalidToken(error.args[0])
+
+
+class RevokeSerializer(RefreshSerializer):
+    token = CharField(
+        required=False,
+    )
+
+    def validate_token(self, value):
+        try:
+            return AccessToken(value)
+        except TokenError as error:
+            raise InvalidToken(error.args[0])
+
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
@@ -161,3 +234,59 @@ class UserSerializer(serializers.ModelSerializer):
                 'Недопустимое имя пользователя: me.'
             )
         return value
+
+
+class SearchResultSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    type = serializers.CharField(
+        source='object_type',
+    )
+    id = serializers.IntegerField(
+        source='object_id',
+    )
+    text = serializers.CharField(
+        source='body',
+    )
+    rank = serializers.FloatField()
+
+    class Meta:
+        model = SearchDocument
+        fields = (
+            'type',
+            'id',
+            'title_id',
+            'review_id',
+            'heading',
+            'text',
+            'rank',
+        )
+
+
+class LeaderboardEntrySerializer(
+    SparseFieldsMixin,
+    serializers.ModelSerializer,
+):
+    position = serializers.IntegerField()
+    id = serializers.IntegerField(
+        source='title_id',
+    )
+    name = serializers.CharField(
+        source='title.name',
+    )
+    year = serializers.IntegerField(
+        source='title.year',
+    )
+    review_count = serializers.IntegerField(
+        source='rating_count',
+    )
+
+    class Meta:
+        model = RankingEntry
+        fields = (
+            'position',
+            'id',
+            'name',
+            'year',
+            'rating',
+            'weighted_rating',
+            'review_count',
+        )
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+User = get_user_model()
+
+
+def get_conflict_errors(users, username, email):
+    """Ошибки для полей, значения которых заняты другими пользователями."""
+    errors = {}
+    for field, value in (('username', username), ('email', email)):
+        if any(getattr(user, field) == value for user in users):
+            errors[field] = [
+                User._meta.get_field(field).error_messages['unique']
+            ]
+    return errors
+
+
+def sign_up(username, email):
+    """
+    Возвращает пользователя с переданными username и email.
+
+    Если такого пользователя нет, создает его. Одним запросом находятся
+    все пользователи с тем же username или email: совпадение обоих
+    полей означает повторную регистрацию, совпадение одного - ошибку.
+    Новый пользователь сохраняется одним INSERT без повторного чтения.
+    """
+    users = list(
+        User.objects.filter(Q(username=username) | Q(email=email))[:2]
+    )
+    for user in users:
+        if user.username == username and user.email == email:
+            return user
+    if users:
+        raise ValidationError(get_conflict_errors(users, username, email))
+    user = User(username=username, email=email)
+    try:
+        with transaction.atomic():
+            user.save(force_insert=True)
+    except IntegrityError:
+        # Пользователь зарегистрировался параллельным запросом.
+        users = User.objects.filter(Q(username=username) | Q(email=email))
+        raise ValidationError(get_conflict_errors(users, username, email))
+    return user
@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save)
+from django.dispatch import receiver
+
+from api.v1.authentication import REVOKING_FIELDS, revoke_tokens
+from api.v1.cache import bump_generation
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import bulk_saved
+
+User = get_user_model()
+
+# Произведения вкладывают категорию, жанры и рейтинг из отзывов,
+# поэтому их кеш сбрасывается при изменении любой из этих моделей.
+INVALIDATED_NAMESPACES = {
+    Category: ('categories', 'titles'),
+    Genre: ('genres', 'titles'),
+    Title: ('titles',),
+    Review: ('titles',),
+}
+
+
+def get_access(user):
+    return tuple(user.__dict__.get(field) for field in REVOKING_FIELDS)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def catalog_changed(sender, **kwargs):
+    bump_generation(*INVALIDATED_NAMESPACES[sender])
+
+
+@receiver(bulk_saved, sender=Category)
+@receiver(bulk_saved, sender=Genre)
+@receiver(bulk_saved, sender=Title)
+def catalog_bulk_saved(sender, **kwargs):
+    bump_generation(*INVALIDATED_NAMESPACES[sender])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_generation('titles')
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    bump_generation(f'reviews:{instance.title_id}')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    bump_generation(f'comments:{instance.review_id}')
+
+
+@receiver(post_init, sender=User)
+def user_initialized(sender, instance, **kwargs):
+    instance._initial_username = instance.__dict__.get('username')
+    instance._initial_access = get_access(instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    bump_generation('users')
+    # Имя автора выводится в отзывах и комментариях.
+    if instance._initial_username != instance.username:
+        bump_generation('usernames')
+    instance._initial_username = instance.username
+
+
+@receiver(post_save, sender=User)
+def user_access_changed(sender, instance, created, **kwargs):
+    access = get_access(instance)
+    if not created and instance._initial_access != access:
+        revoke_tokens(instance.pk)
+    instance._initial_access = access
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    revoke_tokens(instance.pk)
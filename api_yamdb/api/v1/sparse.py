@@ -0,0 +1,112 @@
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import ListSerializer
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+SPARSE_METHODS = ('GET', 'HEAD')
+
+
+def parse_names(request, param):
+    return list(dict.fromkeys(
+        name.strip()
+        for value in request.query_params.getlist(param)
+        for name in value.split(',')
+        if name.strip()
+    ))
+
+
+def is_sparse_request(request):
+    return request.method in SPARSE_METHODS and any(
+        param in request.query_params
+        for param in (FIELDS_PARAM, OMIT_PARAM)
+    )
+
+
+def get_sparse_fields(request, available):
+    """
+    Возвращает имена полей, оставленных параметрами fields и omit.
+
+    Порядок полей совпадает с порядком в сериализаторе. Если параметров
+    нет или запрос не на чтение, возвращает None.
+    """
+    if request is None or not is_sparse_request(request):
+        return None
+    fields = parse_names(request, FIELDS_PARAM)
+    omit = parse_names(request, OMIT_PARAM)
+    errors = {}
+    for param, names in ((FIELDS_PARAM, fields), (OMIT_PARAM, omit)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            errors[param] = f'Неизвестные поля: {", ".join(unknown)}.'
+    if errors:
+        raise ValidationError(errors)
+    return [
+        name for name in available
+        if (not fields or name in fields) and name not in omit
+    ]
+
+
+class SparseFieldsMixin:
+    """
+    Миксин оставляет в ответе только поля из параметров fields и omit.
+
+    Действует только на корневой сериализатор ответа: вложенные
+    сериализаторы выводятся целиком.
+    """
+
+    def is_root(self):
+        parent = self.parent
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.is_root():
+            return fields
+        selected = get_sparse_fields(
+            self.context.get('request'),
+            [name for name, field in fields.items() if not field.write_only],
+        )
+        if selected is None:
+            return fields
+        return {
+            name: field for name, field in fields.items()
+            if name in selected or field.write_only
+        }
+
+
+def flatten_select_related(select_related, prefix=''):
+    for name, nested in select_related.items():
+        path = f'{prefix}{name}'
+        if nested:
+            yield from flatten_select_related(nested, f'{path}__')
+        else:
+            yield path
+
+
+def prune_queryset(queryset, sources):
+    """
+    Убирает select_related и prefetch_related для невыводимых связей.
+
+    sources - первые части source у выводимых полей сериализатора.
+    """
+    lookups = queryset._prefetch_related_lookups
+    kept = [
+        lookup for lookup in lookups
+        if (
+            lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+        ).split('__')[0] in sources
+    ]
+    if len(kept) != len(lookups):
+        queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        paths = list(flatten_select_related(select_related))
+        kept = [path for path in paths if path.split('__')[0] in sources]
+        if len(kept) != len(paths):
+            queryset = queryset.select_related(None)
+            if kept:
+                queryset = queryset.select_related(*kept)
+    return queryset
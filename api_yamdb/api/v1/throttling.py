@@ -0,0 +1,178 @@
+"""
+Ограничение частоты запросов к auth/signup и auth/token.
+
+Для каждого ключа (IP, username, email) хранится корзина токенов:
+в ней не больше capacity токенов, каждый запрос забирает один,
+и корзина равномерно пополняется за период из настройки вида
+'10/hour'. Проверка выполняется до разбора данных в сериализаторе,
+запросов к базе и проверки кода подтверждения.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {
+    's': 1,
+    'm': 60,
+    'h': 60 * 60,
+    'd': 24 * 60 * 60,
+}
+
+_stores = {}
+
+
+def parse_rate(rate):
+    """Переводит '10/hour' в (вместимость, токенов в секунду)."""
+    count, period = rate.split('/')
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+def take_token(state, capacity, refill_rate, now):
+    """
+    Пополняет корзину на прошедшее время и забирает из нее токен.
+
+    Возвращает новое состояние (токены, время) и время ожидания
+    в секундах: 0, если токен удалось забрать.
+    """
+    tokens, updated = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * refill_rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) / refill_rate
+
+
+class BaseBucketStore:
+    """Хранилище корзин токенов."""
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        """Забирает токен из корзины key, возвращает время ожидания."""
+        raise NotImplementedError
+
+
+class LocalBucketStore(BaseBucketStore):
+    """
+    Корзины в памяти процесса, подходит для одного узла.
+
+    Хранится не больше max_keys корзин, давно не использованные
+    вытесняются первыми.
+    """
+
+    max_keys = 100_000
+
+    def __init__(self):
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            state, wait = take_token(
+                self.buckets.pop(key, None), capacity, refill_rate, now,
+            )
+            self.buckets[key] = state
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheBucketStore(BaseBucketStore):
+    """
+    Корзины в кеше AUTH_THROTTLE_CACHE_ALIAS, общие для всех узлов.
+
+    Чтение и запись не атомарны: при одновременных запросах
+    с одним ключом корзина может пропустить несколько лишних запросов.
+    """
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        now = time.time() if now is None else now
+        cache = caches[settings.AUTH_THROTTLE_CACHE_ALIAS]
+        cache_key = f'throttle:{key}'
+        state, wait = take_token(
+            cache.get(cache_key), capacity, refill_rate, now,
+        )
+        # Полная корзина не отличается от отсутствующей.
+        timeout = (capacity - state[0]) / refill_rate
+        cache.set(cache_key, state, max(int(timeout) + 1, 1))
+        return wait
+
+
+def get_bucket_store():
+    path = settings.AUTH_THROTTLE_STORE
+    if path not in _stores:
+        _stores[path] = import_string(path)()
+    return _stores[path]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Базовый класс ограничения по корзине токенов.
+
+    Частота берется из AUTH_THROTTLE_RATES по ключу
+    '<throttle_scope представления>_<kind>'. Если частота не задана,
+    запросы не ограничиваются.
+    """
+
+    kind = None
+
+    def get_value(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        scope = f'{getattr(view, "throttle_scope", "")}_{self.kind}'
+        rate = settings.AUTH_THROTTLE_RATES.get(scope)
+        value = self.get_value(request)
+        if rate is None or not value:
+            return True
+        digest = hashlib.md5(
+            str(value).strip().lower().encode(),
+        ).hexdigest()
+        wait = get_bucket_store().consume(
+            f'{scope}:{digest}', *parse_rate(rate),
+        )
+        if wait:
+            self.retry_after = wait
+            return False
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class IPThrottle(TokenBucketThrottle):
+    kind = 'ip'
+
+    def get_value(self, request):
+        return self.get_ident(request)
+
+
+class FieldThrottle(TokenBucketThrottle):
+    """Ограничение по строковому полю тела запроса."""
+
+    def get_value(self, request):
+        # Тело-список или значение не строкой разберет сериализатор
+        # и вернет 400.
+        if not isinstance(request.data, Mapping):
+            return None
+        value = request.data.get(self.kind)
+        return value if isinstance(value, str) else None
+
+
+class UsernameThrottle(FieldThrottle):
+    kind = 'username'
+
+
+class EmailThrottle(FieldThrottle):
+    kind = 'email'
@@ -1,9 +1,12 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from api.v1.views import (APISignUp, APIToken, CategoryViewSet, CommentViewSet,
-                          GenreViewSet, ReviewViewSet, TitleViewSet,
+from api.v1.views import (APISignUp, APIToken, APITokenRefresh,
+                          APITokenRevoke, CacheStatsView, CategoryViewSet,
+                          CommentViewSet, GenreViewSet, LeaderboardView,
+                          ReviewViewSet, SearchView, TitleViewSet,
                           UsersViewSet)
+from ranking.models import RankingEntry
 
 router_v1 = routers.DefaultRouter()
 router_v1.register(
@@ -37,6 +40,29 @@ router_v1.register(
     basename='comments',
 )
 
+leaderboard_urls = [
+    path(
+        '',
+        LeaderboardView.as_view(),
+        name='leaderboard',
+    ),
+    path(
+        'category/<slug:slug>/',
+        LeaderboardView.as_view(board=RankingEntry.Boards.CATEGORY),
+        name='leaderboard_category',
+    ),
+    path(
+        'genre/<slug:slug>/',
+        LeaderboardView.as_view(board=RankingEntry.Boards.GENRE),
+        name='leaderboard_genre',
+    ),
+    path(
+        'year/<int:year>/',
+        LeaderboardView.as_view(board=RankingEntry.Boards.YEAR),
+        name='leaderboard_year',
+    ),
+]
+
 auth_urls = [
     path(
         'signup/',
@@ -48,6 +74,16 @@ auth_urls = [
         APIToken.as_view(),
         name='token',
     ),
+    path(
+        'token/refresh/',
+        APITokenRefresh.as_view(),
+        name='token_refresh',
+    ),
+    path(
+        'token/revoke/',
+        APITokenRevoke.as_view(),
+        name='token_revoke',
+    ),
 ]
 
 urlpatterns = [
@@ -59,4 +95,18 @@ urlpatterns = [
         'auth/',
         include(auth_urls),
     ),
+    path(
+        'leaderboard/',
+        include(leaderboard_urls),
+    ),
+    path(
+        'search/',
+        SearchView.as_view(),
+        name='search',
+    ),
+    path(
+        'cache/stats/',
+        CacheStatsView.as_view(),
+        name='cache_stats',
+    ),
 ]
@@ -0,0 +1,150 @@
+from collections import defaultdict
+
+from rest_framework import ISO_8601
+from rest_framework.fields import DateTimeField
+from rest_framework.relations import SlugRelatedField
+from rest_framework.serializers import ListSerializer, Serializer
+from rest_framework.settings import api_settings
+
+
+def to_representation(field, value):
+    # Как Serializer.to_representation: None не передается в поле.
+    return None if value is None else field.to_representation(value)
+
+
+def get_datetime_representation(field):
+    """
+    DateTimeField.to_representation с часовым поясом, найденным один раз.
+
+    Поле DRF ищет текущий часовой пояс для каждого значения, на длинных
+    списках это заметная часть времени сериализации.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = getattr(field, 'timezone', None)
+    if field_timezone is None:
+        field_timezone = field.default_timezone()
+    if output_format != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def represent(value):
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return represent
+
+
+def get_readable_fields(serializer):
+    return [
+        (name, field) for name, field in serializer.fields.items()
+        if not field.write_only
+    ]
+
+
+class ValuesSerializerMixin:
+    """
+    Режим только для чтения: ответ строится из строк queryset.values().
+
+    Модели не создаются. Значения полей проходят через to_representation
+    тех же полей сериализатора, поэтому ответ совпадает с обычным режимом.
+    Вложенный сериализатор связи ForeignKey и SlugRelatedField читаются
+    через JOIN в том же запросе, а вложенный список ManyToMany -
+    одним запросом к промежуточной таблице на всю страницу.
+    """
+
+    def get_model_field(self, source):
+        return self.Meta.model._meta.get_field(source)
+
+    def get_field_lookups(self, field):
+        source = field.source.replace('.', '__')
+        if isinstance(field, ListSerializer):
+            return []
+        if isinstance(field, Serializer):
+            return [source] + [
+                f'{source}__{child.source}'
+                for _, child in get_readable_fields(field)
+            ]
+        if isinstance(field, SlugRelatedField):
+            return [f'{source}__{field.slug_field}']
+        return [source]
+
+    def get_values_queryset(self, queryset, extra=()):
+        """
+        Возвращает queryset.values() с путями для выводимых полей.
+
+        extra - дополнительные пути, например поля курсорной пагинации.
+        """
+        lookups = ['pk', *extra]
+        for _, field in get_readable_fields(self):
+            lookups.extend(self.get_field_lookups(field))
+        return queryset.select_related(None).prefetch_related(None).values(
+            *dict.fromkeys(lookups),
+        )
+
+    def get_many_values(self, field, pks):
+        """Значения вложенного списка ManyToMany для объектов pks."""
+        model_field = self.get_model_field(field.source)
+        through = model_field.remote_field.through
+        owner = model_field.m2m_field_name()
+        target = model_field.m2m_reverse_field_name()
+        children = get_readable_fields(field.child)
+        rows = through.objects.filter(
+            **{f'{owner}__in': pks},
+        ).order_by(
+            owner,
+            target,
+        ).values_list(
+            owner,
+            *(f'{target}__{child.source}' for _, child in children),
+        )
+        related = defaultdict(list)
+        for owner_pk, *values in rows:
+            related[owner_pk].append({
+                name: to_representation(child, value)
+                for (name, child), value in zip(children, values)
+            })
+        return related
+
+    def get_converter(self, field, many):
+        """Функция, которая достает значение поля из строки values()."""
+        source = field.source.replace('.', '__')
+        if isinstance(field, ListSerializer):
+            return lambda row: many.get(row['pk'], [])
+        if isinstance(field, Serializer):
+            children = [
+                (name, child, f'{source}__{child.source}')
+                for name, child in get_readable_fields(field)
+            ]
+            return lambda row: None if row[source] is None else {
+                name: to_representation(child, row[lookup])
+                for name, child, lookup in children
+            }
+        if isinstance(field, SlugRelatedField):
+            lookup = f'{source}__{field.slug_field}'
+            return lambda row: row[lookup]
+        represent = (
+            get_datetime_representation(field)
+            if isinstance(field, DateTimeField) else field.to_representation
+        )
+        return lambda row: (
+            None if row[source] is None else represent(row[source])
+        )
+
+    def to_values_representation(self, rows):
+        """Строит список словарей ответа по строкам get_values_queryset."""
+        pks = [row['pk'] for row in rows]
+        converters = [
+            (
+                name,
+                self.get_converter(
+                    field,
+                    self.get_many_values(field, pks)
+                    if isinstance(field, ListSerializer) else None,
+                ),
+            )
+            for name, field in get_readable_fields(self)
+        ]
+        return [
+            {name: convert(row) for name, convert in converters}
+            for row in rows
+        ]
@@ -1,98 +1,206 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
+from django.db.models import Prefetch
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
-from rest_framework.generics import get_object_or_404
+from rest_framework.generics import ListAPIView, get_object_or_404
 from rest_framework.response import Response
-from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+from rest_framework.status import (HTTP_200_OK, HTTP_204_NO_CONTENT,
+                                   HTTP_400_BAD_REQUEST)
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 
+from api.v1.authentication import (get_tokens_for_user, revoke_token,
+                                   rotate_refresh_token)
+from api.v1.cache import get_cache_stats
 from api.v1.filters import TitleFilter
+from api.v1.mixins import BulkModelMixin, CatalogCacheMixin
+from api.v1.pagination import PubDatePagination, TitlePagination
 from api.v1.permissions import (IsAdmin, IsAdminModeratorAuthorOrReadOnly,
                                 IsAdminOrReadOnly, OwnerOnly)
+from api.v1.profiling import ProfilingViewMixin
 from api.v1.serializers import (CategorySerializer, CommentSerializer,
-                                GenreSerializer, ReviewSerializer,
-                                SignUpSerializer, TitleCreateSerializer,
-                                TitleGetSerializer, TokenSerializer,
+                                GenreSerializer, LeaderboardEntrySerializer,
+                                RefreshSerializer,
+                                ReviewSerializer, RevokeSerializer,
+                                SearchResultSerializer, SignUpSerializer,
+                                TitleCreateSerializer, TitleGetSerializer,
+                                TitleStatsSerializer, TokenSerializer,
                                 UserSerializer)
+from api.v1.services import sign_up
+from api.v1.throttling import EmailThrottle, IPThrottle, UsernameThrottle
 from api.v1.utils import send_confirmation_code
 from api.v1.viewsets import (ListCreateDestroyViewSet,
                              ListCreateRetrievePatchDestroyViewSet)
-from reviews.models import Category, Comment, Genre, Review, Title
+from ranking.models import RankingEntry
+from ranking.rankings import ORDERINGS, get_top
+from reviews.models import (STATS_FIELDS, Category, Comment, Genre, Review,
+                            Title)
+from search.backends import get_backend
+from search.models import SearchDocument
 
 User = get_user_model()
 
 
-class CategoryViewSet(ListCreateDestroyViewSet):
+class CategoryViewSet(
+    BulkModelMixin,
+    CatalogCacheMixin,
+    ListCreateDestroyViewSet,
+):
     """
     Обрабатывает запросы, связанные с категориями.
 
     Получение списка категорий - доступно всем без токена.
     Создание категории, удаление категории - только администратору.
+    Массовые операции по адресу bulk/ - только администратору.
     """
 
     queryset = Category.objects.all().order_by('name')
     serializer_class = CategorySerializer
+    pagination_policy = 'catalog'
     lookup_field = 'slug'
+    cache_namespace = 'categories'
+    version_namespaces = (
+        'categories',
+    )
     permission_classes = (
         IsAdminOrReadOnly,
     )
 
 
-class GenreViewSet(ListCreateDestroyViewSet):
+class GenreViewSet(
+    BulkModelMixin,
+    CatalogCacheMixin,
+    ListCreateDestroyViewSet,
+):
     """
     Обрабатывает запросы, связанные с категориями.
 
     Получение списка жанров - доступно всем без токена.
     Создание и удаление жанра - только администратору.
     Удаление происходит по slug.
+    Массовые операции по адресу bulk/ - только администратору.
     """
 
     queryset = Genre.objects.all().order_by('name')
     serializer_class = GenreSerializer
+    pagination_policy = 'catalog'
     lookup_field = 'slug'
+    cache_namespace = 'genres'
+    version_namespaces = (
+        'genres',
+    )
     permission_classes = (
         IsAdminOrReadOnly,
     )
 
 
-class TitleViewSet(ListCreateRetrievePatchDestroyViewSet):
+class TitleViewSet(
+    BulkModelMixin,
+    CatalogCacheMixin,
+    ListCreateRetrievePatchDestroyViewSet,
+):
     """
     Обрабатывает запросы, связанные с записями.
 
     Получение списка произведений - доступно всем без токена.
     Фильтрация по slug, году, названию, году.
     Создание, частичное изменение, удаление - только администратору.
+    Массовые операции по адресу bulk/ - только администратору.
     Нельзя добавлять произведения, которые еще не вышли.
     Получение объекта по titles_id - доступно всем без токена.
+    Статистика оценок по адресу {id}/stats/ - доступна всем без токена.
     """
 
     queryset = (
         Title.objects.prefetch_related(
-            'genre',
+            # Порядок жанров совпадает с порядком в list_from_values.
+            Prefetch(
+                'genre',
+                queryset=Genre.objects.order_by('pk'),
+            ),
         ).select_related(
             'category',
         ).order_by(
             'name',
-        ).annotate(
-            rating=Avg('reviews__score'),
         )
     )
     filter_backends = (
         DjangoFilterBackend,
     )
     filterset_class = TitleFilter
+    pagination_class = TitlePagination
+    pagination_policy = 'titles'
+    cache_namespace = 'titles'
+    version_namespaces = (
+        'titles',
+    )
     permission_classes = (
         IsAdminOrReadOnly,
     )
 
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            self.list_from_values,
+            request,
+            *args,
+            **kwargs,
+        )
+
+    def list_from_values(self, request, *args, **kwargs):
+        """
+        Список произведений без создания моделей.
+
+        Произведения читаются через values(), жанры страницы - одним
+        запросом к промежуточной таблице. Ответ побайтно совпадает
+        с ListModelMixin.list.
+        """
+        serializer = self.get_serializer()
+        queryset = serializer.get_values_queryset(
+            self.filter_queryset(self.get_queryset()),
+            extra=[
+                field.lstrip('-')
+                for field in getattr(self.paginator, 'cursor_ordering', ())
+            ],
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_values_representation(page),
+            )
+        return Response(serializer.to_values_representation(list(queryset)))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve,
+            request,
+            *args,
+            **kwargs,
+        )
+
+    @action(
+        detail=True,
+        methods=('get',),
+    )
+    def stats(self, request, pk=None):
+        # Статистика хранится в строке произведения, обход отзывов
+        # и комментариев не нужен.
+        title = get_object_or_404(
+            Title.objects.only('id', *STATS_FIELDS),
+            pk=pk,
+        )
+        self.check_object_permissions(request, title)
+        return Response(self.get_serializer(title).data)
+
     def get_serializer_class(self):
         if self.action == 'list' or self.action == 'retrieve':
             return TitleGetSerializer
+        if self.action == 'stats':
+            return TitleStatsSerializer
         return TitleCreateSerializer
 
 
@@ -100,10 +208,29 @@ class ReviewViewSet(ListCreateRetrievePatchDestroyViewSet):
     """Получает список review, отдельный элемент."""
 
     serializer_class = ReviewSerializer
+    pagination_class = PubDatePagination
+    pagination_policy = 'reviews'
+    version_date_field = 'pub_date'
     permission_classes = (
         IsAdminModeratorAuthorOrReadOnly,
     )
 
+    def get_version_namespaces(self):
+        return (
+            f'reviews:{self.kwargs.get("title_id")}',
+            'usernames',
+        )
+
+    @cached_property
+    def stored_count(self):
+        # Количество отзывов уже хранится в произведении.
+        return Title.objects.filter(
+            pk=self.kwargs.get('title_id'),
+        ).values_list(
+            'rating_count',
+            flat=True,
+        ).first()
+
     def get_queryset(self):
         return Review.objects.select_related(
             'author',
@@ -128,10 +255,28 @@ class CommentViewSet(ListCreateRetrievePatchDestroyViewSet):
     """Получение списка comment, отдельного элемента."""
 
     serializer_class = CommentSerializer
+    pagination_class = PubDatePagination
+    pagination_policy = 'comments'
+    version_date_field = 'pub_date'
     permission_classes = (
         IsAdminModeratorAuthorOrReadOnly,
     )
 
+    def get_version_namespaces(self):
+        return (
+            f'comments:{self.kwargs.get("review_id")}',
+            'usernames',
+        )
+
+    @cached_property
+    def stored_count(self):
+        return Review.objects.filter(
+            pk=self.kwargs.get('review_id'),
+        ).values_list(
+            'comment_count',
+            flat=True,
+        ).first()
+
     def get_queryset(self):
         return Comment.objects.select_related(
             'author',
@@ -152,41 +297,26 @@ class CommentViewSet(ListCreateRetrievePatchDestroyViewSet):
         )
 
 
-class APISignUp(APIView):
+class APISignUp(ProfilingViewMixin, APIView):
     """Регистрирует пользователя и отправляет код подтверждения на email."""
 
+    authentication_classes = ()
+    throttle_classes = (
+        IPThrottle,
+        UsernameThrottle,
+        EmailThrottle,
+    )
+    throttle_scope = 'signup'
+
     def post(self, request):
         serializer = SignUpSerializer(
             data=request.data,
         )
-        if not serializer.is_valid():
-            username = serializer.data.get('username')
-            email = serializer.data.get('email')
-            if User.objects.filter(
-                    username=username,
-                    email=email,
-            ).exists():
-                send_confirmation_code(
-                    user=User.objects.get(
-                        username=username,
-                        email=email,
-                    ),
-                    email=email,
-                )
-                return Response(
-                    serializer.data,
-                    status=HTTP_200_OK,
-                )
-            raise ValidationError(serializer.errors)
-        serializer.save()
-        username = serializer.validated_data.get('username')
-        email = serializer.validated_data.get('email')
+        serializer.is_valid(raise_exception=True)
+        user = sign_up(**serializer.validated_data)
         send_confirmation_code(
-            user=User.objects.get(
-                username=username,
-                email=email,
-            ),
-            email=email,
+            user=user,
+            email=user.email,
         )
         return Response(
             serializer.validated_data,
@@ -194,9 +324,16 @@ class APISignUp(APIView):
         )
 
 
-class APIToken(APIView):
+class APIToken(ProfilingViewMixin, APIView):
     """Возвращает JWT токен."""
 
+    authentication_classes = ()
+    throttle_classes = (
+        IPThrottle,
+        UsernameThrottle,
+    )
+    throttle_scope = 'token'
+
     def post(self, request):
         serializer = TokenSerializer(
             data=request.data,
@@ -210,11 +347,8 @@ class APIToken(APIView):
                 user,
                 serializer.validated_data.get('confirmation_code'),
         ):
-            token = {
-                'token': f'{AccessToken.for_user(user)}'
-            }
             return Response(
-                token,
+                get_tokens_for_user(user),
                 status=HTTP_200_OK,
             )
         return Response(
@@ -223,6 +357,49 @@ class APIToken(APIView):
         )
 
 
+class RefreshTokenView(ProfilingViewMixin, APIView):
+    """Базовое представление для операций с refresh-токеном."""
+
+    authentication_classes = ()
+    throttle_classes = (
+        IPThrottle,
+    )
+    throttle_scope = 'refresh'
+
+    def get_authenticate_header(self, request):
+        # Без заголовка DRF заменит ответ 401 на 403.
+        return f'{jwt_settings.AUTH_HEADER_TYPES[0]} realm="api"'
+
+
+class APITokenRefresh(RefreshTokenView):
+    """Выдает новую пару токенов, переданный refresh-токен отзывается."""
+
+    def post(self, request):
+        serializer = RefreshSerializer(
+            data=request.data,
+        )
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            rotate_refresh_token(serializer.validated_data['refresh']),
+            status=HTTP_200_OK,
+        )
+
+
+class APITokenRevoke(RefreshTokenView):
+    """Отзывает refresh-токен и, если передан, токен доступа."""
+
+    def post(self, request):
+        serializer = RevokeSerializer(
+            data=request.data,
+        )
+        serializer.is_valid(raise_exception=True)
+        for token in serializer.validated_data.values():
+            revoke_token(token)
+        return Response(
+            status=HTTP_204_NO_CONTENT,
+        )
+
+
 class UsersViewSet(ListCreateRetrievePatchDestroyViewSet):
     """
     Обрабатывает запросы, связанные с пользователями.
@@ -233,6 +410,10 @@ class UsersViewSet(ListCreateRetrievePatchDestroyViewSet):
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    pagination_policy = 'users'
+    version_namespaces = (
+        'users',
+    )
     permission_classes = (
         IsAdmin,
     )
@@ -255,10 +436,10 @@ class UsersViewSet(ListCreateRetrievePatchDestroyViewSet):
         detail=False,
     )
     def me_path(self, request):
-        serializer = UserSerializer(
+        serializer = self.get_serializer(
             get_object_or_404(
                 User,
-                username=request.user,
+                pk=request.user.pk,
             )
         )
         return Response(
@@ -270,7 +451,7 @@ class UsersViewSet(ListCreateRetrievePatchDestroyViewSet):
         serializer = UserSerializer(
             get_object_or_404(
                 User,
-                username=request.user,
+                pk=request.user.pk,
             ),
             data=request.data,
             partial=True,
@@ -283,3 +464,127 @@ class UsersViewSet(ListCreateRetrievePatchDestroyViewSet):
             serializer.data,
             status=HTTP_200_OK,
         )
+
+
+class SearchView(ProfilingViewMixin, ListAPIView):
+    """
+    Полнотекстовый поиск по произведениям, отзывам и комментариям.
+
+    Запрос передается в параметре q, тип объектов можно ограничить
+    параметром type (title, review, comment). Результаты отсортированы
+    по убыванию релевантности.
+    """
+
+    serializer_class = SearchResultSerializer
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError(
+                {'q': 'Укажите поисковый запрос.'}
+            )
+        types = self.request.query_params.getlist('type')
+        unknown = set(types) - set(SearchDocument.Types.values)
+        if unknown:
+            raise ValidationError(
+                {'type': f'Неизвестный тип объектов: {", ".join(unknown)}.'}
+            )
+        ranked = get_backend().search(
+            query,
+            types or SearchDocument.Types.values,
+            settings.SEARCH_MAX_RESULTS,
+        )
+        documents = SearchDocument.objects.in_bulk(
+            [document_id for document_id, _ in ranked],
+        )
+        results = []
+        for document_id, rank in ranked:
+            if document_id in documents:
+                documents[document_id].rank = rank
+                results.append(documents[document_id])
+        return results
+
+
+class CacheStatsView(ProfilingViewMixin, APIView):
+    """
+    Счетчики попаданий и промахов кеша каталога для администратора.
+
+    Счетчики хранятся в кеше CATALOG_CACHE_ALIAS, поэтому с кешем
+    в памяти процесса видны только запросы, обработанные этим процессом.
+    """
+
+    permission_classes = (
+        IsAdmin,
+    )
+
+    def get(self, request):
+        stats = get_cache_stats()
+        total = stats['hits'] + stats['misses']
+        return Response({
+            **stats,
+            'hit_ratio': round(stats['hits'] / total, 3) if total else None,
+        })
+
+
+class LeaderboardView(ProfilingViewMixin, ListAPIView):
+    """
+    Лучшие произведения: общая таблица и таблицы категории, жанра, года.
+
+    Параметр order выбирает сортировку: weighted (по умолчанию) -
+    байесовский рейтинг, rating - средняя оценка. Страница задается
+    параметрами offset и limit. Произведения без оценок не выводятся.
+    """
+
+    serializer_class = LeaderboardEntrySerializer
+    pagination_class = None
+    board = RankingEntry.Boards.ALL
+
+    def get_board_key(self):
+        if self.board == RankingEntry.Boards.CATEGORY:
+            return get_object_or_404(
+                Category.objects.only('id'),
+                slug=self.kwargs['slug'],
+            ).pk
+        if self.board == RankingEntry.Boards.GENRE:
+            return get_object_or_404(
+                Genre.objects.only('id'),
+                slug=self.kwargs['slug'],
+            ).pk
+        if self.board == RankingEntry.Boards.YEAR:
+            return self.kwargs['year']
+        return 0
+
+    def get_number(self, name, default, minimum, maximum=None):
+        value = self.request.query_params.get(name, default)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise ValidationError(
+                {name: 'Укажите целое число.'}
+            )
+        if value < minimum or maximum is not None and value > maximum:
+            raise ValidationError(
+                {name: f'Значение должно быть не меньше {minimum}'
+                       + (f' и не больше {maximum}.' if maximum else '.')}
+            )
+        return value
+
+    def get_queryset(self):
+        ordering = self.request.query_params.get('order', 'weighted')
+        if ordering not in ORDERINGS:
+            raise ValidationError(
+                {'order': f'Допустимые значения: {", ".join(ORDERINGS)}.'}
+            )
+        offset = self.get_number('offset', 0, 0)
+        limit = self.get_number(
+            'limit',
+            settings.LEADERBOARD_PAGE_SIZE,
+            1,
+            settings.LEADERBOARD_MAX_PAGE_SIZE,
+        )
+        entries = list(
+            get_top(self.board, self.get_board_key(), ordering, offset, limit)
+        )
+        for position, entry in enumerate(entries, offset + 1):
+            entry.position = position
+        return entries
@@ -1,9 +1,14 @@
 from rest_framework import filters, mixins, viewsets
 
-from api.v1.mixins import PatchModelMixin
+from api.v1.mixins import (ConditionalGetMixin, PatchModelMixin,
+                           SparseFieldsViewMixin)
+from api.v1.profiling import ProfilingViewMixin
 
 
 class ListCreateDestroyViewSet(
+    ProfilingViewMixin,
+    ConditionalGetMixin,
+    SparseFieldsViewMixin,
     mixins.ListModelMixin,
     mixins.DestroyModelMixin,
     mixins.CreateModelMixin,
@@ -20,6 +25,9 @@ class ListCreateDestroyViewSet(
 
 
 class ListCreateRetrievePatchDestroyViewSet(
+    ProfilingViewMixin,
+    ConditionalGetMixin,
+    SparseFieldsViewMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
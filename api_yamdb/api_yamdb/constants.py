@@ -4,3 +4,9 @@ MAX_LENGHT_SLUG = 50
 MAX_LENGHT_EMAIL = 254
 MAX_LENGTH_STR = 10
 MAX_LENGHT_TOKEN = 150
+MIN_SCORE = 1
+MAX_SCORE = 10
+# Адрес массовых операций в каталоге; slug с таким значением занял бы
+# тот же URL, что и bulk/, поэтому он зарезервирован.
+BULK_URL_PATH = 'bulk'
+RESERVED_SLUGS = (BULK_URL_PATH,)
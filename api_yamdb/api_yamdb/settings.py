@@ -28,10 +28,14 @@ INSTALLED_APPS = [
 
     'reviews.apps.ReviewsConfig',
     'users.apps.UsersConfig',
+    'search.apps.SearchConfig',
+    'ranking.apps.RankingConfig',
+    'mailing.apps.MailingConfig',
     'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
+    'api.v1.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -69,6 +73,20 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_yamdb'),
+    }
+}
+
+CATALOG_CACHE_ALIAS = 'default'
+
+CATALOG_CACHE_TIMEOUT = 300
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -104,20 +122,148 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+# Доставка писем из очереди: thread - фоновым потоком после коммита,
+# sync - сразу после коммита, command - командой send_outbox.
+EMAIL_OUTBOX_DELIVERY = os.getenv('EMAIL_OUTBOX_DELIVERY', 'thread')
+
+EMAIL_OUTBOX_BATCH_SIZE = 100
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+# Задержка перед первой повторной попыткой в секундах,
+# каждая следующая задержка вдвое больше.
+EMAIL_OUTBOX_RETRY_DELAY = 60
+
+EMAIL_OUTBOX_LEASE = 300
+
+# Текст отправленного письма стирается сразу, а сами отправленные
+# и недоставленные письма удаляются командой send_outbox --purge
+# через столько дней после создания.
+EMAIL_OUTBOX_RETENTION_DAYS = 7
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.v1.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.AllowAny',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 5,
+    # С установленным orjson JSON кодируется быстрее, без него -
+    # стандартным модулем json.
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.v1.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'api.v1.pagination.PolicyPagination',
+    'PAGE_SIZE': int(os.getenv('PAGE_SIZE', 5)),
+    # Число доверенных прокси перед приложением. При 0 адрес клиента
+    # для ограничения частоты берется из REMOTE_ADDR, а X-Forwarded-For,
+    # который клиент может подменять, не учитывается.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
+}
+
+# Пагинация по группам маршрутов (атрибут pagination_policy у view).
+# page_size - размер страницы, max_page_size - предел для ?page_size=,
+# count - стратегия подсчета поля count из api.v1.counting (exact, cached,
+# auto, related) или none (count равен null, COUNT(*) не выполняется).
+# Незаданные значения берутся из default.
+PAGINATION_POLICIES = {
+    'default': {
+        'page_size': REST_FRAMEWORK['PAGE_SIZE'],
+        'max_page_size': int(os.getenv('MAX_PAGE_SIZE', 100)),
+        'count': os.getenv('PAGINATION_COUNT', 'exact'),
+    },
+    'catalog': {},
+    'titles': {
+        'count': 'auto',
+    },
+    'reviews': {
+        'max_page_size': 500,
+        'count': 'related',
+    },
+    'comments': {
+        'max_page_size': 500,
+        'count': 'related',
+    },
+    'users': {},
 }
 
+# Стратегия auto считает точно не больше COUNT_EXACT_THRESHOLD строк,
+# большие количества берет из кеша каталога на COUNT_CACHE_TIMEOUT секунд.
+COUNT_EXACT_THRESHOLD = 1000
+
+COUNT_CACHE_TIMEOUT = 300
+
+# Профилирование запросов: заголовок запроса, включающий профиль
+# и Server-Timing в ответе (по умолчанию отключено; учитывается только
+# при DEBUG или от staff-пользователя), и доля запросов, которые
+# профилируются случайно - только с записью в лог.
+PROFILING_HEADER = os.getenv('PROFILING_HEADER', '')
+
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', 0))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.v1.profiling': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
+# Ограничения массовых операций bulk/ в каталоге.
+BULK_MAX_ITEMS = 1000
+
+BULK_BATCH_SIZE = 500
+
 SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
-    'ACCESS_TOKEN_LIFETIME': timedelta(days=7),
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=15),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    'ROTATE_REFRESH_TOKENS': True,
 }
 
 PRODUCT_EMAIL = 'support@yamdb.ru'
+
+# Кеш отозванных токенов. Он должен быть общим для всех процессов
+# (CACHE_BACKEND не LocMemCache), иначе при DEBUG = False проверка
+# api.E001 не даст запустить проект.
+AUTH_TOKEN_CACHE_ALIAS = 'default'
+
+# Хранилище корзин для ограничения запросов к auth/: CacheBucketStore -
+# общий для всех узлов кеш, LocalBucketStore - память процесса.
+AUTH_THROTTLE_STORE = os.getenv(
+    'AUTH_THROTTLE_STORE',
+    'api.v1.throttling.CacheBucketStore',
+)
+
+AUTH_THROTTLE_CACHE_ALIAS = 'default'
+
+AUTH_THROTTLE_RATES = {
+    'signup_ip': '20/hour',
+    'signup_username': '5/hour',
+    'signup_email': '5/hour',
+    'token_ip': '60/hour',
+    'token_username': '10/hour',
+    'refresh_ip': '120/hour',
+}
+
+# Пустое значение - выбор бэкенда поиска по типу базы данных.
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', '')
+
+SEARCH_MAX_RESULTS = 100
+
+# Байесовский рейтинг: пока у произведения меньше LEADERBOARD_MIN_VOTES
+# оценок, его рейтинг тянется к LEADERBOARD_PRIOR_RATING. После смены
+# значений таблицы нужно перестроить командой rebuild_rankings.
+LEADERBOARD_MIN_VOTES = 5
+LEADERBOARD_PRIOR_RATING = 5.5
+LEADERBOARD_PAGE_SIZE = 10
+LEADERBOARD_MAX_PAGE_SIZE = 100
@@ -0,0 +1,67 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from mailing.models import OutgoingEmail
+from mailing.outbox import deliver_pending, purge_processed, requeue_dead
+
+
+class Command(BaseCommand):
+    """Отправляет письма из очереди исходящих писем."""
+
+    help = 'Отправляет письма из очереди исходящих писем'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='количество писем, отправляемых через одно соединение',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='работать постоянно, проверяя очередь с интервалом',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='интервал проверки очереди в секундах для --loop',
+        )
+        parser.add_argument(
+            '--requeue_dead',
+            action='store_true',
+            help='вернуть недоставленные письма в очередь перед отправкой',
+        )
+        parser.add_argument(
+            '--purge',
+            action='store_true',
+            help='удалить отправленные и недоставленные письма старше '
+                 'EMAIL_OUTBOX_RETENTION_DAYS дней',
+        )
+
+    def handle(self, *args, **options):
+        if options['requeue_dead']:
+            self.stdout.write(
+                f'Возвращено в очередь: {requeue_dead()}.'
+            )
+        if options['purge']:
+            self.stdout.write(
+                f'Удалено писем: {purge_processed()}.'
+            )
+        while True:
+            self.report(deliver_pending(options['batch_size']))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def report(self, stats):
+        if not stats:
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено: {stats[OutgoingEmail.Statuses.SENT]}, '
+            f'отложено: {stats[OutgoingEmail.Statuses.PENDING]}, '
+            f'не доставлено: {stats[OutgoingEmail.Statuses.DEAD]}.'
+        ))
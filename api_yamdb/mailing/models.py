@@ -0,0 +1,70 @@
+from django.db import models
+from django.utils import timezone
+
+from api_yamdb.constants import (MAX_LENGHT_EMAIL, MAX_LENGHT_NAME,
+                                 MAX_LENGTH_STR)
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку."""
+
+    class Statuses(models.TextChoices):
+        PENDING = 'pending'
+        SENT = 'sent'
+        DEAD = 'dead'
+
+    subject = models.CharField(
+        'Тема',
+        max_length=MAX_LENGHT_NAME,
+    )
+    body = models.TextField(
+        'Текст',
+    )
+    from_email = models.EmailField(
+        'Отправитель',
+        max_length=MAX_LENGHT_EMAIL,
+    )
+    recipient = models.EmailField(
+        'Получатель',
+        max_length=MAX_LENGHT_EMAIL,
+    )
+    status = models.CharField(
+        'Статус',
+        max_length=MAX_LENGTH_STR,
+        choices=Statuses.choices,
+        default=Statuses.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попыток отправки',
+        default=0,
+    )
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now,
+    )
+    last_error = models.TextField(
+        'Последняя ошибка',
+        blank=True,
+    )
+    created = models.DateTimeField(
+        'Дата создания',
+        auto_now_add=True,
+    )
+    sent_at = models.DateTimeField(
+        'Дата отправки',
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=['status', 'next_attempt_at'],
+                name='outgoing_email_due_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,211 @@
+"""
+Очередь исходящих писем.
+
+Письма сохраняются в таблицу OutgoingEmail и отправляются пачками
+через одно соединение с почтовым бэкендом. Неудачная отправка
+повторяется с экспоненциальной задержкой, после
+EMAIL_OUTBOX_MAX_ATTEMPTS попыток письмо получает статус dead.
+"""
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from mailing.models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_SYNC = 'sync'
+DELIVERY_THREAD = 'thread'
+DELIVERY_COMMAND = 'command'
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='outbox')
+_scheduled = threading.Event()
+
+
+def enqueue(subject, message, recipient, from_email=None):
+    """Ставит письмо в очередь и планирует отправку после коммита."""
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipient=recipient,
+    )
+    delivery = settings.EMAIL_OUTBOX_DELIVERY
+    if delivery == DELIVERY_SYNC:
+        transaction.on_commit(deliver_pending)
+    elif delivery == DELIVERY_THREAD:
+        transaction.on_commit(schedule_delivery)
+    return email
+
+
+def schedule_delivery():
+    """Запускает отправку в фоновом потоке, если она еще не запланирована."""
+    if not _scheduled.is_set():
+        _scheduled.set()
+        _executor.submit(_deliver_in_thread)
+
+
+def _deliver_in_thread():
+    _scheduled.clear()
+    try:
+        deliver_pending()
+        delay = next_attempt_delay()
+        if delay is not None:
+            timer = threading.Timer(delay, schedule_delivery)
+            timer.daemon = True
+            timer.start()
+    except Exception:
+        logger.exception('Не удалось отправить письма из очереди.')
+    finally:
+        connection.close()
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def next_attempt_delay():
+    """Секунды до ближайшей повторной попытки или None."""
+    next_attempt_at = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.Statuses.PENDING,
+    ).aggregate(next_attempt_at=Min('next_attempt_at'))['next_attempt_at']
+    if next_attempt_at is None:
+        return None
+    return max((next_attempt_at - timezone.now()).total_seconds(), 0)
+
+
+def claim_batch(batch_size):
+    """
+    Забирает пачку писем, время отправки которых подошло.
+
+    Письма откладываются на EMAIL_OUTBOX_LEASE секунд, чтобы другой
+    обработчик не отправил их повторно.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = OutgoingEmail.objects.filter(
+            status=OutgoingEmail.Statuses.PENDING,
+            next_attempt_at__lte=now,
+        ).order_by('next_attempt_at')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        batch = list(due[:batch_size])
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in batch],
+        ).update(
+            next_attempt_at=now + timedelta(
+                seconds=settings.EMAIL_OUTBOX_LEASE
+            ),
+        )
+    return batch
+
+
+def mark_sent(email):
+    # Текст письма содержит код подтверждения, после отправки
+    # хранить его незачем.
+    email.body = ''
+    email.attempts += 1
+    email.status = OutgoingEmail.Statuses.SENT
+    email.sent_at = timezone.now()
+    email.last_error = ''
+
+
+def mark_failed(email, error):
+    email.attempts += 1
+    email.last_error = f'{type(error).__name__}: {error}'
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = OutgoingEmail.Statuses.DEAD
+        logger.error(
+            'Письмо %s для %s не доставлено после %s попыток: %s',
+            email.pk, email.recipient, email.attempts, email.last_error,
+        )
+    else:
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+
+
+def send_batch(batch):
+    """Отправляет пачку писем через одно соединение."""
+    processed = 0
+    try:
+        with get_connection(fail_silently=False) as mail_connection:
+            for email in batch:
+                try:
+                    mail_connection.send_messages([EmailMessage(
+                        subject=email.subject,
+                        body=email.body,
+                        from_email=email.from_email,
+                        to=(email.recipient,),
+                    )])
+                except Exception as error:
+                    mark_failed(email, error)
+                else:
+                    mark_sent(email)
+                processed += 1
+    except Exception as error:
+        for email in batch[processed:]:
+            mark_failed(email, error)
+    OutgoingEmail.objects.bulk_update(
+        batch,
+        (
+            'body',
+            'status',
+            'attempts',
+            'next_attempt_at',
+            'last_error',
+            'sent_at',
+        ),
+    )
+    return Counter(email.status for email in batch)
+
+
+def deliver_pending(batch_size=None):
+    """
+    Отправляет все письма, время отправки которых подошло.
+
+    Возвращает количество писем по итоговым статусам.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    stats = Counter()
+    while True:
+        batch = claim_batch(batch_size)
+        if not batch:
+            return stats
+        stats.update(send_batch(batch))
+
+
+def requeue_dead():
+    """Возвращает недоставленные письма в очередь."""
+    return OutgoingEmail.objects.filter(
+        status=OutgoingEmail.Statuses.DEAD,
+    ).update(
+        status=OutgoingEmail.Statuses.PENDING,
+        attempts=0,
+        next_attempt_at=timezone.now(),
+    )
+
+
+def purge_processed():
+    """
+    Удаляет отправленные и недоставленные письма старше
+    EMAIL_OUTBOX_RETENTION_DAYS дней.
+    """
+    deleted, _ = OutgoingEmail.objects.filter(
+        status__in=(
+            OutgoingEmail.Statuses.SENT,
+            OutgoingEmail.Statuses.DEAD,
+        ),
+        created__lt=timezone.now() - timedelta(
+            days=settings.EMAIL_OUTBOX_RETENTION_DAYS,
+        ),
+    ).delete()
+    return deleted
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class RankingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'ranking'
+    verbose_name = 'Рейтинговые таблицы'
+
+    def ready(self):
+        import ranking.signals  # noqa: F401
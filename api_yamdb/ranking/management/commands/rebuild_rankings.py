@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ranking.rankings import rebuild_rankings
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """Перестраивает рейтинговые таблицы по сохраненным рейтингам."""
+
+    help = 'Перестраивает рейтинговые таблицы произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='количество строк в одном bulk_create',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            built = rebuild_rankings(options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Строк в рейтинговых таблицах: {built}.')
+        )
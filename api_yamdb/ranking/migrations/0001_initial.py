@@ -0,0 +1,44 @@
+# Generated by Django 3.2 on 2026-10-18 19:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('reviews', '0005_title_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(choices=[('all', 'All'), ('category', 'Category'), ('genre', 'Genre'), ('year', 'Year')], max_length=10, verbose_name='Таблица')),
+                ('key', models.PositiveIntegerField(default=0, help_text='id категории или жанра, год; 0 для общей таблицы', verbose_name='Ключ таблицы')),
+                ('rating', models.FloatField(blank=True, null=True, verbose_name='Рейтинг')),
+                ('weighted_rating', models.FloatField(blank=True, null=True, verbose_name='Взвешенный рейтинг')),
+                ('rating_count', models.PositiveIntegerField(default=0, verbose_name='Количество оценок')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranking_entries', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'строка рейтинга',
+                'verbose_name_plural': 'Строки рейтинга',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='rankingentry',
+            index=models.Index(fields=['board', 'key', '-rating', 'title'], name='ranking_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rankingentry',
+            index=models.Index(fields=['board', 'key', '-weighted_rating', 'title'], name='ranking_weighted_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='rankingentry',
+            constraint=models.UniqueConstraint(fields=('board', 'key', 'title'), name='unique_ranking_entry'),
+        ),
+    ]
@@ -0,0 +1,88 @@
+from django.db import models
+
+from api_yamdb.constants import MAX_LENGTH_STR
+from reviews.models import Title
+
+
+class RankingEntry(models.Model):
+    """
+    Модель для хранения строки рейтинговой таблицы.
+
+    Каждое произведение попадает в общую таблицу, в таблицы своей
+    категории, года и каждого из жанров. Индексы по (board, key, оценка)
+    позволяют получить верх таблицы без обхода отзывов и сортировки.
+    """
+
+    class Boards(models.TextChoices):
+        ALL = 'all'
+        CATEGORY = 'category'
+        GENRE = 'genre'
+        YEAR = 'year'
+
+    board = models.CharField(
+        'Таблица',
+        max_length=MAX_LENGTH_STR,
+        choices=Boards.choices,
+    )
+    key = models.PositiveIntegerField(
+        'Ключ таблицы',
+        default=0,
+        help_text='id категории или жанра, год; 0 для общей таблицы',
+    )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='ranking_entries',
+        verbose_name='Произведение',
+    )
+    rating = models.FloatField(
+        'Рейтинг',
+        blank=True,
+        null=True,
+    )
+    weighted_rating = models.FloatField(
+        'Взвешенный рейтинг',
+        blank=True,
+        null=True,
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0,
+    )
+
+    class Meta:
+        verbose_name = 'строка рейтинга'
+        verbose_name_plural = 'Строки рейтинга'
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    'board',
+                    'key',
+                    'title',
+                ],
+                name='unique_ranking_entry',
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=[
+                    'board',
+                    'key',
+                    '-rating',
+                    'title',
+                ],
+                name='ranking_rating_idx',
+            ),
+            models.Index(
+                fields=[
+                    'board',
+                    'key',
+                    '-weighted_rating',
+                    'title',
+                ],
+                name='ranking_weighted_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.board} {self.key}: {self.title_id}'
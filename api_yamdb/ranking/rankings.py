@@ -0,0 +1,158 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import (Case, F, FloatField, OuterRef, Subquery, Value,
+                              When)
+from django.db.models.functions import Cast
+
+from ranking.models import RankingEntry
+from reviews.models import Title
+
+ORDERINGS = {
+    'weighted': 'weighted_rating',
+    'rating': 'rating',
+}
+
+
+def weighted_rating():
+    """
+    Байесовская оценка произведения по сохраненным сумме и числу оценок.
+
+    (сумма + m * C) / (количество + m): пока оценок меньше
+    LEADERBOARD_MIN_VOTES (m), рейтинг тянется к LEADERBOARD_PRIOR_RATING
+    (C). Априорная оценка задается в настройках, а не считается по всем
+    отзывам, поэтому изменение одного отзыва не сдвигает чужие строки.
+    """
+    min_votes = settings.LEADERBOARD_MIN_VOTES
+    prior = settings.LEADERBOARD_PRIOR_RATING
+    return Case(
+        When(
+            rating_count=0,
+            then=Value(None),
+        ),
+        default=(
+            (Cast(F('rating_sum'), FloatField()) + min_votes * prior)
+            / (F('rating_count') + min_votes)
+        ),
+        output_field=FloatField(),
+    )
+
+
+def get_board_keys(title, genre_ids):
+    keys = [
+        (RankingEntry.Boards.ALL, 0),
+        (RankingEntry.Boards.YEAR, title.year),
+    ]
+    if title.category_id is not None:
+        keys.append((RankingEntry.Boards.CATEGORY, title.category_id))
+    keys.extend((RankingEntry.Boards.GENRE, pk) for pk in genre_ids)
+    return keys
+
+
+def build_entries(title, genre_ids):
+    return [
+        RankingEntry(
+            board=board,
+            key=key,
+            title_id=title.pk,
+            rating=title.rating,
+            weighted_rating=title.weighted_rating,
+            rating_count=title.rating_count,
+        )
+        for board, key in get_board_keys(title, genre_ids)
+    ]
+
+
+def get_genre_ids(title_ids=None):
+    links = Title.genre.through.objects.all()
+    if title_ids is not None:
+        links = links.filter(title_id__in=title_ids)
+    genre_ids = defaultdict(list)
+    for title_id, genre_id in links.values_list('title_id', 'genre_id'):
+        genre_ids[title_id].append(genre_id)
+    return genre_ids
+
+
+def sync_titles(title_ids):
+    """Перестраивает строки рейтинга после изменения произведений."""
+    titles = Title.objects.filter(
+        pk__in=title_ids,
+    ).annotate(
+        weighted_rating=weighted_rating(),
+    ).only(
+        'year',
+        'category',
+        'rating_sum',
+        'rating_count',
+        'rating',
+    )
+    genre_ids = get_genre_ids(title_ids)
+    RankingEntry.objects.filter(title_id__in=title_ids).delete()
+    RankingEntry.objects.bulk_create(
+        entry
+        for title in titles
+        for entry in build_entries(title, genre_ids[title.pk])
+    )
+
+
+def update_scores(title_id):
+    """Переносит рейтинг произведения во все его строки одним запросом."""
+    titles = Title.objects.filter(pk=OuterRef('title_id'))
+    RankingEntry.objects.filter(
+        title_id=title_id,
+    ).update(
+        rating=Subquery(titles.values('rating')),
+        rating_count=Subquery(titles.values('rating_count')),
+        weighted_rating=Subquery(
+            titles.annotate(weighted=weighted_rating()).values('weighted'),
+        ),
+    )
+
+
+def remove_board(board, key):
+    RankingEntry.objects.filter(board=board, key=key).delete()
+
+
+def get_top(board, key, ordering, offset, limit):
+    """Возвращает страницу таблицы, отсортированную по индексу."""
+    field = ORDERINGS[ordering]
+    return RankingEntry.objects.filter(
+        board=board,
+        key=key,
+        **{f'{field}__isnull': False},
+    ).select_related(
+        'title',
+    ).only(
+        'rating',
+        'weighted_rating',
+        'rating_count',
+        'title__name',
+        'title__year',
+    ).order_by(
+        f'-{field}',
+        'title',
+    )[offset:offset + limit]
+
+
+def rebuild_rankings(batch_size):
+    """Заново строит все рейтинговые таблицы."""
+    RankingEntry.objects.all().delete()
+    genre_ids = get_genre_ids()
+    titles = Title.objects.annotate(
+        weighted_rating=weighted_rating(),
+    ).only(
+        'year',
+        'category',
+        'rating_sum',
+        'rating_count',
+        'rating',
+    )
+    RankingEntry.objects.bulk_create(
+        (
+            entry
+            for title in titles.iterator(chunk_size=batch_size)
+            for entry in build_entries(title, genre_ids[title.pk])
+        ),
+        batch_size=batch_size,
+    )
+    return RankingEntry.objects.count()
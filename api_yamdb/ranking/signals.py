@@ -0,0 +1,57 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from ranking.models import RankingEntry
+from ranking.rankings import remove_board, sync_titles, update_scores
+from reviews.models import Category, Genre, Review, Title
+from reviews.signals import bulk_saved
+
+
+# Приложение reviews подключает свои обработчики раньше, поэтому здесь
+# рейтинг произведения уже пересчитан, а в _rated_title_ids записаны
+# произведения, у которых он изменился. Правка только текста отзыва
+# рейтинговые таблицы не трогает.
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, **kwargs):
+    title_ids = getattr(instance, '_rated_title_ids', (instance.title_id,))
+    for title_id in title_ids:
+        update_scores(title_id)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    update_scores(instance.title_id)
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, **kwargs):
+    sync_titles([instance.pk])
+
+
+@receiver(bulk_saved, sender=Title)
+def titles_bulk_saved(sender, instances, **kwargs):
+    sync_titles([instance.pk for instance in instances])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        sync_titles([instance.pk])
+    elif action == 'post_clear':
+        remove_board(RankingEntry.Boards.GENRE, instance.pk)
+    else:
+        sync_titles(pk_set)
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    # Произведения получают category=NULL через UPDATE без сигналов.
+    remove_board(RankingEntry.Boards.CATEGORY, instance.pk)
+
+
+@receiver(post_delete, sender=Genre)
+def genre_deleted(sender, instance, **kwargs):
+    remove_board(RankingEntry.Boards.GENRE, instance.pk)
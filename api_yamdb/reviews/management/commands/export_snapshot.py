@@ -0,0 +1,55 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from reviews.snapshot import COMPRESSIONS, SNAPSHOT_MODELS, SnapshotWriter
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+class Command(BaseCommand):
+    """Сохраняет пользователей и каталог в бинарный снимок."""
+
+    help = 'Экспортирует данные в колоночный бинарный снимок'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            type=str,
+            default='snapshot.ymdb',
+            help='путь к файлу снимка',
+        )
+        parser.add_argument(
+            '--compression',
+            choices=tuple(COMPRESSIONS),
+            default='zlib',
+            help='способ сжатия блоков',
+        )
+        parser.add_argument(
+            '--chunk_size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='количество строк в одном блоке',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        with open(options['output'], 'wb') as stream:
+            writer = SnapshotWriter(stream, options['compression'])
+            for label in SNAPSHOT_MODELS:
+                model = apps.get_model(label)
+                rows = model._base_manager.order_by('pk').values_list(
+                    *(field.attname for field in model._meta.concrete_fields)
+                ).iterator(chunk_size=options['chunk_size'])
+                written = writer.write_table(
+                    model,
+                    rows,
+                    options['chunk_size'],
+                )
+                self.stdout.write(f'{label}: выгружено строк {written}.')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Снимок сохранен за {time.monotonic() - started:.2f} с.'
+            )
+        )
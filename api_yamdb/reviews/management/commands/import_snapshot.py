@@ -0,0 +1,82 @@
+import time
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from reviews.snapshot import SnapshotError, SnapshotReader, keep_auto_dates
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    """Загружает пользователей и каталог из бинарного снимка."""
+
+    help = 'Импортирует данные из снимка в пустую базу данных'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--input',
+            type=str,
+            default='snapshot.ymdb',
+            help='путь к файлу снимка',
+        )
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='количество строк в одном bulk_create',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        try:
+            with open(options['input'], 'rb') as stream:
+                with transaction.atomic():
+                    models = self.load(
+                        SnapshotReader(stream),
+                        options['batch_size'],
+                    )
+        except SnapshotError as error:
+            raise CommandError(error)
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in sequence_sql:
+                cursor.execute(sql)
+        call_command('rebuild_search_index', stdout=self.stdout)
+        call_command('rebuild_rankings', stdout=self.stdout)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Снимок загружен за {time.monotonic() - started:.2f} с.'
+            )
+        )
+
+    def load(self, reader, batch_size):
+        models = []
+        with connection.constraint_checks_disabled():
+            for label, columns, chunks in reader.read_tables():
+                model = apps.get_model(label)
+                expected = [
+                    field.attname for field in model._meta.concrete_fields
+                ]
+                if columns != expected:
+                    raise SnapshotError(
+                        f'{label}: колонки снимка {columns} не совпадают '
+                        f'с полями модели {expected}.'
+                    )
+                loaded = 0
+                with keep_auto_dates(model):
+                    for chunk in chunks:
+                        model._base_manager.bulk_create(
+                            [model(*row) for row in chunk],
+                            batch_size=batch_size,
+                        )
+                        loaded += len(chunk)
+                models.append(model)
+                self.stdout.write(f'{label}: загружено строк {loaded}.')
+        connection.check_constraints(
+            table_names=[model._meta.db_table for model in models],
+        )
+        return models
@@ -0,0 +1,124 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from reviews.management.commands.load_data_from_csv import DEFAULT_BATCH_SIZE
+
+DATA_FILES = {
+    'users.CustomUser': 'users.csv',
+    'reviews.Category': 'category.csv',
+    'reviews.Genre': 'genre.csv',
+    'reviews.Title': 'titles.csv',
+    'reviews.Title_genre': 'genre_title.csv',
+    'reviews.Review': 'review.csv',
+    'reviews.Comment': 'comments.csv',
+}
+DEFAULT_WORKERS = 4
+
+
+def get_dependencies(models):
+    """Строит граф зависимостей моделей по их внешним ключам."""
+    return {
+        model: {
+            field.related_model
+            for field in model._meta.concrete_fields
+            if field.is_relation
+            and field.related_model in models
+            and field.related_model is not model
+        }
+        for model in models
+    }
+
+
+def load_model(model, file_name, batch_size, stdout):
+    """Загружает файл в отдельном потоке со своим соединением с БД."""
+    try:
+        with connection.constraint_checks_disabled():
+            call_command(
+                'load_data_from_csv',
+                file_name=file_name,
+                app_name=model._meta.app_label,
+                model_name=model._meta.object_name,
+                batch_size=batch_size,
+                skip_rebuild=True,
+                stdout=stdout,
+            )
+        connection.check_constraints(table_names=[model._meta.db_table])
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    """Загружает все файлы csv с учетом зависимостей между моделями."""
+
+    help = 'Загружает в базу данных все файлы из static/data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_WORKERS,
+            help='количество параллельно загружаемых файлов',
+        )
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='количество строк в одном bulk_create',
+        )
+
+    def handle(self, *args, **options):
+        files = {
+            apps.get_model(label): file_name
+            for label, file_name in DATA_FILES.items()
+        }
+        dependencies = get_dependencies(set(files))
+        workers = options['workers']
+        if connection.vendor == 'sqlite':
+            # SQLite допускает только одного пишущего, параллельная
+            # загрузка приведет лишь к ошибкам database is locked.
+            workers = 1
+        loaded = set()
+        running = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while len(loaded) < len(files):
+                for model in files:
+                    if (
+                        model in loaded
+                        or model in running.values()
+                        or not dependencies[model] <= loaded
+                    ):
+                        continue
+                    future = executor.submit(
+                        load_model,
+                        model,
+                        files[model],
+                        options['batch_size'],
+                        self.stdout,
+                    )
+                    running[future] = model
+                if not running:
+                    raise CommandError(
+                        'Циклическая зависимость между моделями: '
+                        f'{set(files) - loaded}.'
+                    )
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    model = running.pop(future)
+                    if future.exception():
+                        for pending in running:
+                            pending.cancel()
+                        raise CommandError(
+                            f'{files[model]}: {future.exception()}'
+                        )
+                    loaded.add(model)
+        # bulk_create не отправляет сигналы, индекс поиска и рейтинговые
+        # таблицы строятся заново.
+        call_command('rebuild_search_index', stdout=self.stdout)
+        call_command('rebuild_rankings', stdout=self.stdout)
+        self.stdout.write(
+            self.style.SUCCESS(f'Загружено файлов: {len(loaded)}.')
+        )
@@ -1,7 +1,46 @@
 import csv
+import time
+from itertools import islice
+from pathlib import Path
 
 from django.apps import apps
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+DEFAULT_BATCH_SIZE = 1000
+# Модели, после загрузки которых нужно перестроить производные данные.
+STATS_MODELS = ('reviews.Review', 'reviews.Comment')
+RANKING_MODELS = ('reviews.Title', 'reviews.Title_genre', 'reviews.Review')
+SEARCH_MODELS = ('reviews.Title', 'reviews.Review', 'reviews.Comment')
+
+
+def read_rows(csv_file, model, skip=0):
+    """Построчно читает csv и приводит значения к типам полей модели."""
+    reader = csv.reader(
+        csv_file,
+        delimiter=',',
+    )
+    header = next(reader)
+    fields = [model._meta.get_field(name) for name in header]
+    for row in islice(reader, skip, None):
+        yield model(**{
+            field.attname: (
+                None if value == '' and field.null
+                else field.to_python(value)
+            )
+            for field, value in zip(fields, row)
+        })
+
+
+def read_batches(rows, batch_size):
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
 
 
 class Command(BaseCommand):
@@ -25,23 +64,94 @@ class Command(BaseCommand):
             type=str,
             help='приложение модели',
         )
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='количество строк в одном bulk_create',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help=(
+                'фиксировать каждую пачку отдельно и продолжить '
+                'с последней зафиксированной строки'
+            ),
+        )
+        parser.add_argument(
+            '--skip_rebuild',
+            action='store_true',
+            help=(
+                'не перестраивать рейтинговые таблицы и поисковый индекс '
+                '(load_all строит их один раз после всех файлов)'
+            ),
+        )
 
     def handle(self, *args, **options):
-        file_path = 'static/data/' + options['file_name']
+        file_path = DATA_DIR / options['file_name']
         model = apps.get_model(
             options['app_name'],
             options['model_name'],
         )
+        if options['batch_size'] < 1:
+            raise CommandError('batch_size должен быть положительным.')
+        checkpoint = Path(f'{file_path}.checkpoint')
+        loaded = 0
+        if options['resume'] and checkpoint.exists():
+            loaded = int(checkpoint.read_text())
         with open(file_path, 'r', encoding='utf-8') as csv_file:
-            reader = csv.reader(
-                csv_file,
-                delimiter=','
+            batches = read_batches(
+                read_rows(csv_file, model, skip=loaded),
+                options['batch_size'],
             )
-            header = next(reader)
-            objects_of_model = []
-            for row in reader:
-                object_dict = {
-                    key: value for key, value in zip(header, row)
-                }
-                objects_of_model.append(model(**object_dict))
-            model.objects.bulk_create(objects_of_model)
+            if options['resume']:
+                loaded = self.load(model, batches, loaded, checkpoint)
+                checkpoint.unlink(missing_ok=True)
+            else:
+                with transaction.atomic():
+                    loaded = self.load(model, batches, loaded)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{model.__name__}: загружено строк {loaded}.'
+            )
+        )
+        # bulk_create не отправляет сигналы, поэтому рейтинг, счетчики
+        # комментариев, рейтинговые таблицы и поисковый индекс
+        # перестраиваются после загрузки.
+        label = model._meta.label
+        if label in STATS_MODELS:
+            call_command('recalculate_ratings', stdout=self.stdout)
+        if options['skip_rebuild']:
+            return
+        if label in RANKING_MODELS:
+            call_command('rebuild_rankings', stdout=self.stdout)
+        if label in SEARCH_MODELS:
+            call_command('rebuild_search_index', stdout=self.stdout)
+
+    def load(self, model, batches, loaded, checkpoint=None):
+        """
+        Загружает пачки через bulk_create.
+
+        С checkpoint каждая пачка фиксируется отдельной транзакцией,
+        а номер последней зафиксированной строки сохраняется в файл.
+        """
+        started = time.monotonic()
+        loaded_now = 0
+        for batch in batches:
+            if checkpoint is None:
+                model.objects.bulk_create(batch)
+            else:
+                with transaction.atomic():
+                    model.objects.bulk_create(batch)
+            loaded_now += len(batch)
+            if checkpoint is not None:
+                checkpoint.write_text(str(loaded + loaded_now))
+            self.report(loaded + loaded_now, loaded_now, started)
+        return loaded + loaded_now
+
+    def report(self, loaded, loaded_now, started):
+        elapsed = time.monotonic() - started
+        rate = loaded_now / elapsed if elapsed else 0
+        self.stdout.write(
+            f'Загружено строк: {loaded} ({rate:.0f} строк/с)'
+        )
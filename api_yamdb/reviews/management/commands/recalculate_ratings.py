@@ -0,0 +1,103 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F
+
+from reviews.models import (STATS_FIELDS, Comment, Review, Title,
+                            get_score_field)
+
+
+class Command(BaseCommand):
+    """
+    Пересчитывает сохраненную статистику произведений.
+
+    Сверяются сумма, количество и распределение оценок по отзывам
+    и количество комментариев у произведений и отзывов.
+    """
+
+    help = 'Сверяет и пересчитывает рейтинг и статистику произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='только показать расхождения, ничего не сохраняя',
+        )
+
+    def get_actual_stats(self):
+        actual = defaultdict(lambda: dict.fromkeys(STATS_FIELDS, 0))
+        for row in Review.objects.values('title', 'score').annotate(
+            score_count=Count('id'),
+        ).order_by():
+            stats = actual[row['title']]
+            stats['rating_sum'] += row['score'] * row['score_count']
+            stats['rating_count'] += row['score_count']
+            stats[get_score_field(row['score'])] = row['score_count']
+        for row in Comment.objects.values(
+            title=F('review__title'),
+        ).annotate(
+            comment_count=Count('id'),
+        ).order_by():
+            actual[row['title']]['comment_count'] = row['comment_count']
+        for stats in actual.values():
+            stats['rating'] = (
+                stats['rating_sum'] / stats['rating_count']
+                if stats['rating_count'] else None
+            )
+        return actual
+
+    def handle(self, *args, **options):
+        actual = self.get_actual_stats()
+        empty = dict.fromkeys(STATS_FIELDS, 0)
+        empty['rating'] = None
+        drifted = []
+        with transaction.atomic():
+            titles = Title.objects.only(*STATS_FIELDS).select_for_update()
+            for title in titles.iterator():
+                stats = actual.get(title.pk, empty)
+                changed = [
+                    field for field in STATS_FIELDS
+                    if getattr(title, field) != stats[field]
+                ]
+                if not changed:
+                    continue
+                self.stdout.write(
+                    f'Произведение {title.pk}: ' + ', '.join(
+                        f'{field} {getattr(title, field)} -> {stats[field]}'
+                        for field in changed
+                    )
+                )
+                for field in changed:
+                    setattr(title, field, stats[field])
+                drifted.append(title)
+            if drifted and not options['dry_run']:
+                Title.objects.bulk_update(drifted, STATS_FIELDS)
+            drifted.extend(self.recalculate_reviews(options['dry_run']))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Расхождений найдено: {len(drifted)}.'
+            )
+        )
+
+    def recalculate_reviews(self, dry_run):
+        actual = dict(
+            Comment.objects.values_list('review').annotate(
+                Count('id'),
+            ).order_by()
+        )
+        drifted = []
+        reviews = Review.objects.only('comment_count').select_for_update()
+        for review in reviews.iterator():
+            comment_count = actual.get(review.pk, 0)
+            if review.comment_count == comment_count:
+                continue
+            self.stdout.write(
+                f'Отзыв {review.pk}: comment_count '
+                f'{review.comment_count} -> {comment_count}'
+            )
+            review.comment_count = comment_count
+            drifted.append(review)
+        if drifted and not dry_run:
+            Review.objects.bulk_update(drifted, ('comment_count',))
+        return drifted
@@ -0,0 +1,45 @@
+# Generated by Django 3.2 on 2026-10-18 18:43
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    aggregates = Review.objects.values('title').annotate(
+        score_sum=Sum('score'),
+        score_count=Count('id'),
+    ).order_by()
+    for row in aggregates:
+        Title.objects.filter(pk=row['title']).update(
+            rating_sum=row['score_sum'],
+            rating_count=row['score_count'],
+            rating=row['score_sum'] / row['score_count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_rating, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 20:20
+
+from django.db import migrations, models
+import reviews.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_review_comment_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(unique=True, validators=[reviews.validators.validate_slug_not_reserved], verbose_name='Идентификатор'),
+        ),
+        migrations.AlterField(
+            model_name='genre',
+            name='slug',
+            field=models.SlugField(unique=True, validators=[reviews.validators.validate_slug_not_reserved], verbose_name='Идентификатор'),
+        ),
+    ]
@@ -1,13 +1,30 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
 from api_yamdb.constants import (MAX_LENGHT_NAME, MAX_LENGHT_SLUG,
-                                 MAX_LENGTH_STR)
-from reviews.validators import validate_year
+                                 MAX_LENGTH_STR, MAX_SCORE, MIN_SCORE)
+from reviews.validators import validate_slug_not_reserved, validate_year
 
 User = get_user_model()
 
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+
+
+def get_score_field(score):
+    """Имя поля Title, в котором хранится количество оценок score."""
+    return f'score_{score}'
+
+
+# Денормализованная статистика произведения, которую ведут сигналы.
+STATS_FIELDS = (
+    'rating_sum',
+    'rating_count',
+    'rating',
+    *(get_score_field(score) for score in SCORES),
+    'comment_count',
+)
+
 
 class Category(models.Model):
     """Модель для хранения категорий."""
@@ -20,11 +37,20 @@ class Category(models.Model):
         'Идентификатор',
         max_length=MAX_LENGHT_SLUG,
         unique=True,
+        validators=[validate_slug_not_reserved],
     )
 
     class Meta:
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            models.Index(
+                fields=[
+                    'name',
+                ],
+                name='category_name_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.name[:MAX_LENGTH_STR]
@@ -41,11 +67,20 @@ class Genre(models.Model):
         'Идентификатор',
         max_length=MAX_LENGHT_SLUG,
         unique=True,
+        validators=[validate_slug_not_reserved],
     )
 
     class Meta:
         verbose_name = 'жанр'
         verbose_name_plural = 'Жанры'
+        indexes = [
+            models.Index(
+                fields=[
+                    'name',
+                ],
+                name='genre_name_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.name[:MAX_LENGTH_STR]
@@ -80,14 +115,133 @@ class Title(models.Model):
         related_name='titles_of_genre',
         verbose_name='Жанр',
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0,
+        editable=False,
+    )
+    rating = models.FloatField(
+        'Рейтинг',
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    # Распределение оценок: score_N - количество отзывов с оценкой N.
+    score_1 = models.PositiveIntegerField(
+        'Оценок 1',
+        default=0,
+        editable=False,
+    )
+    score_2 = models.PositiveIntegerField(
+        'Оценок 2',
+        default=0,
+        editable=False,
+    )
+    score_3 = models.PositiveIntegerField(
+        'Оценок 3',
+        default=0,
+        editable=False,
+    )
+    score_4 = models.PositiveIntegerField(
+        'Оценок 4',
+        default=0,
+        editable=False,
+    )
+    score_5 = models.PositiveIntegerField(
+        'Оценок 5',
+        default=0,
+        editable=False,
+    )
+    score_6 = models.PositiveIntegerField(
+        'Оценок 6',
+        default=0,
+        editable=False,
+    )
+    score_7 = models.PositiveIntegerField(
+        'Оценок 7',
+        default=0,
+        editable=False,
+    )
+    score_8 = models.PositiveIntegerField(
+        'Оценок 8',
+        default=0,
+        editable=False,
+    )
+    score_9 = models.PositiveIntegerField(
+        'Оценок 9',
+        default=0,
+        editable=False,
+    )
+    score_10 = models.PositiveIntegerField(
+        'Оценок 10',
+        default=0,
+        editable=False,
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(
+                fields=[
+                    'name',
+                ],
+                name='title_name_idx',
+            ),
+            models.Index(
+                fields=[
+                    'year',
+                    'name',
+                ],
+                name='title_year_name_idx',
+            ),
+            models.Index(
+                fields=[
+                    'category',
+                    'name',
+                ],
+                name='title_category_name_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.name[:MAX_LENGTH_STR]
 
+    @property
+    def histogram(self):
+        return {
+            score: getattr(self, get_score_field(score))
+            for score in SCORES
+        }
+
+    @property
+    def score_median(self):
+        """Медиана оценок, найденная по распределению без обхода отзывов."""
+        if not self.rating_count:
+            return None
+        positions = {
+            (self.rating_count + 1) // 2,
+            self.rating_count // 2 + 1,
+        }
+        middle = []
+        seen = 0
+        for score, count in self.histogram.items():
+            seen += count
+            while positions and min(positions) <= seen:
+                positions.remove(min(positions))
+                middle.append(score)
+        return sum(middle) / len(middle)
+
 
 class Review(models.Model):
     """Модель для хранения обзоров на произведения."""
@@ -111,11 +265,11 @@ class Review(models.Model):
         'Рейтинг',
         validators=[
             MaxValueValidator(
-                10,
+                MAX_SCORE,
                 message='Оценка должна быть не более 10 баллов.',
             ),
             MinValueValidator(
-                1,
+                MIN_SCORE,
                 message='Оценка должна быть не менее 1 балла.',
             ),
         ]
@@ -124,6 +278,11 @@ class Review(models.Model):
         'Дата и время публикации',
         auto_now_add=True,
     )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'обзор'
@@ -137,11 +296,26 @@ class Review(models.Model):
                 name='unique_title_owner',
             )
         ]
+        indexes = [
+            models.Index(
+                fields=[
+                    'title',
+                    'pub_date',
+                ],
+                name='review_title_pub_date_idx',
+            ),
+        ]
         ordering = ('-pub_date',)
 
     def __str__(self):
         return self.text[:MAX_LENGTH_STR]
 
+    def save(self, *args, **kwargs):
+        # Рейтинг произведения пересчитывается в post_save,
+        # поэтому обе записи должны попасть в одну транзакцию.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Модель для хранения комментариев к обзорам."""
@@ -169,6 +343,20 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=[
+                    'review',
+                    'pub_date',
+                ],
+                name='comment_review_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text[:MAX_LENGTH_STR]
+
+    def save(self, *args, **kwargs):
+        # Счетчик комментариев произведения обновляется в post_save.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
@@ -0,0 +1,128 @@
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import Signal, receiver
+
+from reviews.models import Comment, Review, Title, get_score_field
+
+# Отправляется после bulk_create/bulk_update, которые не вызывают
+# post_save. Аргументы: sender - модель, instances - список объектов.
+bulk_saved = Signal()
+
+
+def update_title_rating(title_id, score_delta, count_delta, histogram):
+    """
+    Атомарно сдвигает сумму, количество и распределение оценок.
+
+    histogram - словарь {оценка: изменение количества отзывов с ней}.
+    """
+    Title.objects.filter(
+        pk=title_id,
+    ).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+        rating=Case(
+            When(
+                rating_count=-count_delta,
+                then=Value(None),
+            ),
+            default=(
+                Cast(F('rating_sum') + score_delta, FloatField())
+                / (F('rating_count') + count_delta)
+            ),
+            output_field=FloatField(),
+        ),
+        **{
+            get_score_field(score): F(get_score_field(score)) + delta
+            for score, delta in histogram.items()
+        },
+    )
+
+
+def update_comment_count(review_id, delta):
+    """Сдвигает счетчики комментариев отзыва и его произведения."""
+    Review.objects.filter(
+        pk=review_id,
+    ).update(
+        comment_count=F('comment_count') + delta,
+    )
+    Title.objects.filter(
+        reviews=review_id,
+    ).update(
+        comment_count=F('comment_count') + delta,
+    )
+
+
+def remember_score(instance):
+    instance._initial_title_id = instance.__dict__.get('title_id')
+    instance._initial_score = instance.__dict__.get('score')
+
+
+@receiver(post_init, sender=Review)
+def review_initialized(sender, instance, **kwargs):
+    remember_score(instance)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw, **kwargs):
+    if raw:
+        # loaddata сохраняет произведение вместе с готовым рейтингом.
+        return
+    # Произведения, рейтинг которых изменился: по ним обработчики
+    # других приложений (рейтинговые таблицы) решают, нужна ли работа.
+    instance._rated_title_ids = ()
+    if created:
+        update_title_rating(
+            instance.title_id,
+            instance.score,
+            1,
+            {instance.score: 1},
+        )
+        instance._rated_title_ids = (instance.title_id,)
+    elif instance._initial_title_id != instance.title_id:
+        update_title_rating(
+            instance._initial_title_id,
+            -instance._initial_score,
+            -1,
+            {instance._initial_score: -1},
+        )
+        update_title_rating(
+            instance.title_id,
+            instance.score,
+            1,
+            {instance.score: 1},
+        )
+        instance._rated_title_ids = (
+            instance._initial_title_id,
+            instance.title_id,
+        )
+    elif instance._initial_score != instance.score:
+        update_title_rating(
+            instance.title_id,
+            instance.score - instance._initial_score,
+            0,
+            {instance._initial_score: -1, instance.score: 1},
+        )
+        instance._rated_title_ids = (instance.title_id,)
+    remember_score(instance)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    update_title_rating(
+        instance.title_id,
+        -instance.score,
+        -1,
+        {instance.score: -1},
+    )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        update_comment_count(instance.review_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    update_comment_count(instance.review_id, -1)
@@ -0,0 +1,273 @@
+"""
+Колоночный бинарный формат снимка данных.
+
+Файл: MAGIC, версия формата и способ сжатия, затем таблицы.
+Таблица: метка модели, список колонок (имя и тип) и последовательность
+блоков, каждый из которых предваряется длиной; блок нулевой длины
+завершает таблицу. Блок содержит число строк и по одному массиву
+с префиксом длины на каждую колонку, поэтому ни экспорт, ни импорт
+не держат в памяти таблицу целиком.
+"""
+import lzma
+import struct
+import sys
+import zlib
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+SNAPSHOT_MODELS = (
+    'users.CustomUser',
+    'reviews.Category',
+    'reviews.Genre',
+    'reviews.Title',
+    'reviews.Title_genre',
+    'reviews.Review',
+    'reviews.Comment',
+)
+MAGIC = b'YMDBSNAP'
+VERSION = 1
+COMPRESSIONS = {
+    'none': (0, lambda data: data, lambda data: data),
+    'zlib': (1, zlib.compress, zlib.decompress),
+    'lzma': (2, lzma.compress, lzma.decompress),
+}
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+INTEGER_TYPES = {
+    'AutoField',
+    'BigAutoField',
+    'BigIntegerField',
+    'IntegerField',
+    'PositiveBigIntegerField',
+    'PositiveIntegerField',
+    'PositiveSmallIntegerField',
+    'SmallAutoField',
+    'SmallIntegerField',
+}
+STRING_TYPES = {
+    'CharField',
+    'EmailField',
+    'SlugField',
+    'TextField',
+}
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def get_column_type(field):
+    if field.is_relation:
+        field = field.target_field
+    internal_type = field.get_internal_type()
+    if internal_type in INTEGER_TYPES:
+        return 'i'
+    if internal_type in STRING_TYPES:
+        return 's'
+    if internal_type == 'FloatField':
+        return 'f'
+    if internal_type == 'BooleanField':
+        return 'b'
+    if internal_type == 'DateTimeField':
+        return 't'
+    raise SnapshotError(
+        f'Тип поля {field.name} не поддерживается: {internal_type}.'
+    )
+
+
+@contextmanager
+def keep_auto_dates(model):
+    """Не дает auto_now/auto_now_add перезаписать даты из снимка."""
+    fields = [
+        (field, field.auto_now, field.auto_now_add)
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    for field, _, _ in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in fields:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+def to_little_endian(values):
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def from_little_endian(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def encode_column(column_type, values):
+    nulls = bytes(value is None for value in values)
+    if column_type == 's':
+        encoded = [
+            b'' if value is None else value.encode() for value in values
+        ]
+        data = to_little_endian(array('I', map(len, encoded)))
+        data += b''.join(encoded)
+    elif column_type == 'i':
+        data = to_little_endian(array('q', (value or 0 for value in values)))
+    elif column_type == 'f':
+        data = to_little_endian(
+            array('d', (value or 0.0 for value in values))
+        )
+    elif column_type == 'b':
+        data = bytes(bool(value) for value in values)
+    else:
+        data = to_little_endian(array('q', (
+            0 if value is None else (value - EPOCH) // MICROSECOND
+            for value in values
+        )))
+    return pack_blob(nulls if any(nulls) else b'') + pack_blob(data)
+
+
+def decode_column(column_type, rows, nulls, data):
+    if column_type == 's':
+        size = rows * array('I').itemsize
+        offset = size
+        values = []
+        for length in from_little_endian('I', data[:size]):
+            values.append(data[offset:offset + length].decode())
+            offset += length
+    elif column_type == 'i':
+        values = from_little_endian('q', data).tolist()
+    elif column_type == 'f':
+        values = from_little_endian('d', data).tolist()
+    elif column_type == 'b':
+        values = [bool(value) for value in data]
+    else:
+        values = [
+            EPOCH + value * MICROSECOND
+            for value in from_little_endian('q', data)
+        ]
+    if nulls:
+        values = [
+            None if is_null else value
+            for value, is_null in zip(values, nulls)
+        ]
+    return values
+
+
+def pack_blob(data):
+    return struct.pack('<I', len(data)) + data
+
+
+def read_blob(stream):
+    header = stream.read(4)
+    if len(header) != 4:
+        raise SnapshotError('Файл снимка обрезан.')
+    (length,) = struct.unpack('<I', header)
+    data = stream.read(length)
+    if len(data) != length:
+        raise SnapshotError('Файл снимка обрезан.')
+    return data
+
+
+def read_blob_from(data, offset):
+    (length,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    return data[offset:offset + length], offset + length
+
+
+class SnapshotWriter:
+    def __init__(self, stream, compression='zlib'):
+        code, self.compress, _ = COMPRESSIONS[compression]
+        self.stream = stream
+        self.stream.write(MAGIC + struct.pack('<BB', VERSION, code))
+
+    def write_table(self, model, rows, chunk_size):
+        """Записывает таблицу модели из итератора кортежей значений."""
+        fields = model._meta.concrete_fields
+        types = [get_column_type(field) for field in fields]
+        self.stream.write(pack_blob(model._meta.label.encode()))
+        self.stream.write(struct.pack('<H', len(fields)))
+        for field, column_type in zip(fields, types):
+            self.stream.write(pack_blob(field.attname.encode()))
+            self.stream.write(column_type.encode())
+        written = 0
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                self.write_chunk(types, chunk)
+                written += len(chunk)
+                chunk = []
+        if chunk:
+            self.write_chunk(types, chunk)
+            written += len(chunk)
+        self.stream.write(pack_blob(b''))
+        return written
+
+    def write_chunk(self, types, chunk):
+        payload = struct.pack('<I', len(chunk)) + b''.join(
+            encode_column(column_type, values)
+            for column_type, values in zip(types, zip(*chunk))
+        )
+        self.stream.write(pack_blob(self.compress(payload)))
+
+
+class SnapshotReader:
+    def __init__(self, stream):
+        self.stream = stream
+        header = stream.read(len(MAGIC) + 2)
+        if header[:len(MAGIC)] != MAGIC:
+            raise SnapshotError('Файл не является снимком YaMDb.')
+        version, code = struct.unpack('<BB', header[len(MAGIC):])
+        if version != VERSION:
+            raise SnapshotError(f'Неизвестная версия снимка: {version}.')
+        for _, (known_code, _, decompress) in COMPRESSIONS.items():
+            if known_code == code:
+                self.decompress = decompress
+                break
+        else:
+            raise SnapshotError(f'Неизвестный способ сжатия: {code}.')
+
+    def read_tables(self):
+        """
+        Возвращает пары (метка модели, колонки, итератор блоков).
+
+        Блоки таблицы нужно прочитать до перехода к следующей таблице.
+        """
+        while True:
+            label = self.stream.read(4)
+            if not label:
+                return
+            label = self.stream.read(struct.unpack('<I', label)[0]).decode()
+            (count,) = struct.unpack('<H', self.stream.read(2))
+            columns = []
+            for _ in range(count):
+                name = read_blob(self.stream).decode()
+                columns.append((name, self.stream.read(1).decode()))
+            yield label, [name for name, _ in columns], self.read_chunks(
+                [column_type for _, column_type in columns],
+            )
+
+    def read_chunks(self, types):
+        while True:
+            data = read_blob(self.stream)
+            if not data:
+                return
+            data = self.decompress(data)
+            (rows,) = struct.unpack_from('<I', data)
+            offset = 4
+            columns = []
+            for column_type in types:
+                nulls, offset = read_blob_from(data, offset)
+                values, offset = read_blob_from(data, offset)
+                columns.append(
+                    decode_column(column_type, rows, nulls, values)
+                )
+            yield list(zip(*columns))
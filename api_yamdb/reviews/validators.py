@@ -1,9 +1,19 @@
 from django.utils import timezone
 from rest_framework import serializers
 
+from api_yamdb.constants import RESERVED_SLUGS
+
 
 def validate_year(value):
     """Проверяет, что год выпуска не будущее время."""
     year = timezone.now().year
     if value > year:
         raise serializers.ValidationError('Проверьте год выпуска!')
+
+
+def validate_slug_not_reserved(value):
+    """Проверяет, что slug не совпадает с зарезервированным адресом."""
+    if value in RESERVED_SLUGS:
+        raise serializers.ValidationError(
+            f'Идентификатор {value} зарезервирован.'
+        )
@@ -0,0 +1,151 @@
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from search.stemmer import WORD, stem, stem_text
+
+FTS_TABLE = 'search_searchdocument_fts'
+HEADING_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+
+class BaseSearchBackend:
+    """
+    Интерфейс поискового бэкенда.
+
+    Документы хранятся в модели SearchDocument, бэкенд отвечает только
+    за полнотекстовый индекс над ними и ранжирование.
+    """
+
+    def create_index(self, schema_editor):
+        pass
+
+    def drop_index(self, schema_editor):
+        pass
+
+    def index(self, documents):
+        pass
+
+    def remove(self, document_ids):
+        pass
+
+    def clear(self):
+        pass
+
+    def search(self, query, types, limit):
+        """Возвращает список пар (id документа, ранг) по убыванию ранга."""
+        raise NotImplementedError
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    Индекс FTS5 с русским стеммингом на стороне Python.
+
+    rowid записи FTS совпадает с id документа, в индекс пишутся основы
+    слов, а запрос ищет их как префиксы.
+    """
+
+    def create_index(self, schema_editor):
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} '
+            'USING fts5(heading, body, '
+            "tokenize='unicode61 remove_diacritics 0')"
+        )
+
+    def drop_index(self, schema_editor):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+    def index(self, documents):
+        self.remove([document.id for document in documents])
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, heading, body) '
+                'VALUES (%s, %s, %s)',
+                [
+                    (
+                        document.id,
+                        stem_text(document.heading),
+                        stem_text(document.body),
+                    )
+                    for document in documents
+                ],
+            )
+
+    def remove(self, document_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                [(document_id,) for document_id in document_ids],
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+    def search(self, query, types, limit):
+        terms = ' '.join(
+            f'"{stem(word)}"*' for word in WORD.findall(query.lower())
+        )
+        if not terms:
+            return []
+        placeholders = ', '.join(['%s'] * len(types))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT fts.rowid, -bm25({FTS_TABLE}, %s, %s) AS rank '
+                f'FROM {FTS_TABLE} AS fts '
+                'JOIN search_searchdocument AS document '
+                'ON document.id = fts.rowid '
+                f'WHERE {FTS_TABLE} MATCH %s '
+                f'AND document.object_type IN ({placeholders}) '
+                'ORDER BY rank DESC LIMIT %s',
+                [HEADING_WEIGHT, BODY_WEIGHT, terms, *types, limit],
+            )
+            return cursor.fetchall()
+
+
+class PostgresBackend(BaseSearchBackend):
+    """
+    Индекс GIN по tsvector с русской конфигурацией PostgreSQL.
+
+    Индекс построен по тому же выражению, что используется в запросе,
+    поэтому отдельная колонка и синхронизация не нужны.
+    """
+
+    vector = (
+        "setweight(to_tsvector('russian', heading), 'A') || "
+        "setweight(to_tsvector('russian', body), 'B')"
+    )
+
+    def create_index(self, schema_editor):
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS search_document_vector_idx '
+            f'ON search_searchdocument USING GIN (({self.vector}))'
+        )
+
+    def drop_index(self, schema_editor):
+        schema_editor.execute(
+            'DROP INDEX IF EXISTS search_document_vector_idx'
+        )
+
+    def search(self, query, types, limit):
+        placeholders = ', '.join(['%s'] * len(types))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT id, ts_rank({self.vector}, '
+                "websearch_to_tsquery('russian', %s)) AS rank "
+                'FROM search_searchdocument '
+                f"WHERE {self.vector} @@ websearch_to_tsquery('russian', %s) "
+                f'AND object_type IN ({placeholders}) '
+                'ORDER BY rank DESC LIMIT %s',
+                [query, query, *types, limit],
+            )
+            return cursor.fetchall()
+
+
+def get_backend(vendor=None):
+    """Возвращает бэкенд из настроек или по типу базы данных."""
+    if settings.SEARCH_BACKEND:
+        return import_string(settings.SEARCH_BACKEND)()
+    if (vendor or connection.vendor) == 'postgresql':
+        return PostgresBackend()
+    return SQLiteFTSBackend()
@@ -0,0 +1,112 @@
+from reviews.models import Comment, Review, Title
+from search.backends import get_backend
+from search.models import SearchDocument
+
+
+def title_document(title):
+    return {
+        'title_id': title.pk,
+        'heading': title.name,
+        'body': title.description,
+    }
+
+
+def review_document(review):
+    return {
+        'title_id': review.title_id,
+        'body': review.text,
+    }
+
+
+def comment_document(comment):
+    return {
+        'title_id': comment.review.title_id,
+        'review_id': comment.review_id,
+        'body': comment.text,
+    }
+
+
+DOCUMENTS = {
+    Title: (SearchDocument.Types.TITLE, title_document),
+    Review: (SearchDocument.Types.REVIEW, review_document),
+    Comment: (SearchDocument.Types.COMMENT, comment_document),
+}
+
+
+def index_instance(instance):
+    object_type, build = DOCUMENTS[type(instance)]
+    document, _ = SearchDocument.objects.update_or_create(
+        object_type=object_type,
+        object_id=instance.pk,
+        defaults=build(instance),
+    )
+    get_backend().index([document])
+
+
+def index_instances(instances):
+    """Индексирует пакет объектов одной модели."""
+    object_type, build = DOCUMENTS[type(instances[0])]
+    object_ids = [instance.pk for instance in instances]
+    documents = SearchDocument.objects.filter(
+        object_type=object_type,
+        object_id__in=object_ids,
+    )
+    backend = get_backend()
+    backend.remove(list(documents.values_list('id', flat=True)))
+    documents.delete()
+    SearchDocument.objects.bulk_create(
+        SearchDocument(
+            object_type=object_type,
+            object_id=instance.pk,
+            **build(instance),
+        )
+        for instance in instances
+    )
+    backend.index(list(documents))
+
+
+def remove_instance(instance):
+    object_type, _ = DOCUMENTS[type(instance)]
+    documents = SearchDocument.objects.filter(
+        object_type=object_type,
+        object_id=instance.pk,
+    )
+    get_backend().remove(list(documents.values_list('id', flat=True)))
+    documents.delete()
+
+
+def rebuild_index(batch_size):
+    """Заново строит документы и полнотекстовый индекс."""
+    backend = get_backend()
+    backend.clear()
+    SearchDocument.objects.all().delete()
+    querysets = {
+        Title: Title.objects.all(),
+        Review: Review.objects.all(),
+        Comment: Comment.objects.select_related('review'),
+    }
+    for model, queryset in querysets.items():
+        object_type, build = DOCUMENTS[model]
+        SearchDocument.objects.bulk_create(
+            (
+                SearchDocument(
+                    object_type=object_type,
+                    object_id=instance.pk,
+                    **build(instance),
+                )
+                for instance in queryset.iterator(chunk_size=batch_size)
+            ),
+            batch_size=batch_size,
+        )
+    indexed = 0
+    batch = []
+    for document in SearchDocument.objects.iterator(chunk_size=batch_size):
+        batch.append(document)
+        if len(batch) == batch_size:
+            backend.index(batch)
+            indexed += len(batch)
+            batch = []
+    if batch:
+        backend.index(batch)
+        indexed += len(batch)
+    return indexed
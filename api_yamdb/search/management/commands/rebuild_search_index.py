@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from search.documents import rebuild_index
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """Перестраивает поисковый индекс по произведениям и отзывам."""
+
+    help = 'Перестраивает полнотекстовый поисковый индекс'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='количество документов в одной пачке',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            indexed = rebuild_index(options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано документов: {indexed}.')
+        )
@@ -0,0 +1,45 @@
+# Generated by Django 3.2 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+from search.backends import get_backend
+
+
+def create_index(apps, schema_editor):
+    get_backend(schema_editor.connection.vendor).create_index(schema_editor)
+
+
+def drop_index(apps, schema_editor):
+    get_backend(schema_editor.connection.vendor).drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('title', 'Title'), ('review', 'Review'), ('comment', 'Comment')], max_length=10, verbose_name='Тип объекта')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='Идентификатор объекта')),
+                ('title_id', models.PositiveBigIntegerField(verbose_name='Произведение')),
+                ('review_id', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Отзыв')),
+                ('heading', models.CharField(blank=True, max_length=256, verbose_name='Заголовок')),
+                ('body', models.TextField(blank=True, verbose_name='Текст')),
+            ],
+            options={
+                'verbose_name': 'поисковый документ',
+                'verbose_name_plural': 'Поисковые документы',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('object_type', 'object_id'), name='unique_search_object'),
+        ),
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,54 @@
+from django.db import models
+
+from api_yamdb.constants import MAX_LENGHT_NAME, MAX_LENGTH_STR
+
+
+class SearchDocument(models.Model):
+    """Модель для хранения проиндексированного текста объектов."""
+
+    class Types(models.TextChoices):
+        TITLE = 'title'
+        REVIEW = 'review'
+        COMMENT = 'comment'
+
+    object_type = models.CharField(
+        'Тип объекта',
+        max_length=MAX_LENGTH_STR,
+        choices=Types.choices,
+    )
+    object_id = models.PositiveBigIntegerField(
+        'Идентификатор объекта',
+    )
+    title_id = models.PositiveBigIntegerField(
+        'Произведение',
+    )
+    review_id = models.PositiveBigIntegerField(
+        'Отзыв',
+        blank=True,
+        null=True,
+    )
+    heading = models.CharField(
+        'Заголовок',
+        max_length=MAX_LENGHT_NAME,
+        blank=True,
+    )
+    body = models.TextField(
+        'Текст',
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'поисковый документ'
+        verbose_name_plural = 'Поисковые документы'
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    'object_type',
+                    'object_id',
+                ],
+                name='unique_search_object',
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.object_type} {self.object_id}'
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Comment, Review, Title
+from reviews.signals import bulk_saved
+from search.documents import (index_instance, index_instances,
+                              remove_instance)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+def searchable_saved(sender, instance, **kwargs):
+    index_instance(instance)
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def searchable_deleted(sender, instance, **kwargs):
+    remove_instance(instance)
+
+
+@receiver(bulk_saved, sender=Title)
+def searchable_bulk_saved(sender, instances, **kwargs):
+    index_instances(instances)
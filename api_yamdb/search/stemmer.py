@@ -0,0 +1,88 @@
+"""
+Стеммер Портера (Snowball) для русского языка.
+
+Используется там, где СУБД не умеет стемминг сама (SQLite FTS5):
+в индекс и в поисковый запрос попадают основы слов.
+"""
+import re
+
+VOWELS = 'аеиоуыэюя'
+
+PERFECTIVE_GERUND = re.compile(
+    r'((?<=[ая])(в|вши|вшись)|(ив|ивши|ившись|ыв|ывши|ывшись))$'
+)
+REFLEXIVE = re.compile(r'(ся|сь)$')
+ADJECTIVE = (
+    r'(ее|ие|ые|ое|ими|ыми|ей|ий|ый|ой|ем|им|ым|ом|его|ого|ему|ому|'
+    r'их|ых|ую|юю|ая|яя|ою|ею)'
+)
+PARTICIPLE = r'((?<=[ая])(ем|нн|вш|ющ|щ)|(ивш|ывш|ующ))'
+ADJECTIVAL = re.compile(rf'({PARTICIPLE}?{ADJECTIVE})$')
+VERB = re.compile(
+    r'((?<=[ая])(ла|на|ете|йте|ли|й|л|ем|н|ло|но|ет|ют|ны|ть|ешь|нно)|'
+    r'(ила|ыла|ена|ейте|уйте|ите|или|ыли|ей|уй|ил|ыл|им|ым|ен|ило|ыло|'
+    r'ено|ят|ует|уют|ит|ыт|ены|ить|ыть|ишь|ую|ю))$'
+)
+NOUN = re.compile(
+    r'(а|ев|ов|ие|ье|е|иями|ями|ами|еи|ии|и|ией|ей|ой|ий|й|иям|ям|ием|'
+    r'ем|ам|ом|о|у|ах|иях|ях|ы|ь|ию|ью|ю|ия|ья|я)$'
+)
+DERIVATIONAL = re.compile(r'(ост|ость)$')
+SUPERLATIVE = re.compile(r'(ейше|ейш)$')
+WORD = re.compile(r'\w+')
+
+
+def get_regions(word):
+    """Возвращает начала областей RV и R2."""
+    rv = r1 = r2 = len(word)
+    for index, letter in enumerate(word):
+        if letter in VOWELS:
+            rv = index + 1
+            break
+    for index in range(1, len(word)):
+        if word[index] not in VOWELS and word[index - 1] in VOWELS:
+            r1 = index + 1
+            break
+    for index in range(r1 + 1, len(word)):
+        if word[index] not in VOWELS and word[index - 1] in VOWELS:
+            r2 = index + 1
+            break
+    return rv, r2
+
+
+def remove(pattern, word, start):
+    """Удаляет окончание, если оно целиком лежит в области start."""
+    match = pattern.search(word)
+    if match and match.start() >= start:
+        return word[:match.start()], True
+    return word, False
+
+
+def stem(word):
+    word = word.lower().replace('ё', 'е')
+    rv, r2 = get_regions(word)
+    if rv >= len(word):
+        return word
+    word, removed = remove(PERFECTIVE_GERUND, word, rv)
+    if not removed:
+        word, _ = remove(REFLEXIVE, word, rv)
+        for pattern in (ADJECTIVAL, VERB, NOUN):
+            word, removed = remove(pattern, word, rv)
+            if removed:
+                break
+    if word.endswith('и') and len(word) - 1 >= rv:
+        word = word[:-1]
+    word, _ = remove(DERIVATIONAL, word, r2)
+    if word.endswith('нн') and len(word) - 2 >= rv:
+        word = word[:-1]
+    else:
+        word, removed = remove(SUPERLATIVE, word, rv)
+        if removed and word.endswith('нн'):
+            word = word[:-1]
+        elif word.endswith('ь') and len(word) - 1 >= rv:
+            word = word[:-1]
+    return word
+
+
+def stem_text(text):
+    return ' '.join(stem(word) for word in WORD.findall(text.lower()))
@@ -0,0 +1,69 @@
+"""
+Сравнивает затраты на аутентификацию одного запроса:
+JWTAuthentication с загрузкой пользователя из базы и
+ClaimsJWTAuthentication с пользователем из данных токена.
+
+Запуск из корня репозитория:
+    python benchmarks/auth_overhead.py --requests 5000
+"""
+import argparse
+import time
+from pathlib import Path
+
+if __package__ in (None, ''):
+    import sys
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.utils import setup_django, test_database  # noqa: E402
+
+
+def measure(authentication, token, requests_count):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    factory = APIRequestFactory()
+    http_request = factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+    with CaptureQueriesContext(connection) as context:
+        started = time.perf_counter()
+        for _ in range(requests_count):
+            request = Request(http_request, authenticators=[authentication])
+            assert request.user.is_authenticated
+        elapsed = time.perf_counter() - started
+    return (
+        elapsed / requests_count * 1_000_000,
+        len(context.captured_queries) / requests_count,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=5000)
+    options = parser.parse_args()
+    setup_django()
+    with test_database():
+        from django.contrib.auth import get_user_model
+        from rest_framework_simplejwt.authentication import \
+            JWTAuthentication
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        from api.v1.authentication import (ClaimsAccessToken,
+                                           ClaimsJWTAuthentication)
+        user = get_user_model().objects.create_user(
+            username='benchmark', email='benchmark@yamdb.fake',
+        )
+        print(f'{"способ":<34}{"мкс/запрос":>12}{"SQL/запрос":>12}')
+        for name, authentication, token in (
+            ('JWTAuthentication (до)', JWTAuthentication(),
+             AccessToken.for_user(user)),
+            ('ClaimsJWTAuthentication (после)', ClaimsJWTAuthentication(),
+             ClaimsAccessToken.for_user(user)),
+        ):
+            duration, queries = measure(
+                authentication, str(token), options.requests,
+            )
+            print(f'{name:<34}{duration:>12.1f}{queries:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
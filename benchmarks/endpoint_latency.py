@@ -0,0 +1,88 @@
+"""
+Замеряет задержку GET-маршрутов API для всех ролей и сохраняет
+перцентили (p50, p90, p99) и число SQL-запросов в JSON.
+
+Запуск из корня репозитория:
+    python benchmarks/endpoint_latency.py --size 500 --output latency.json
+"""
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+if __package__ in (None, ''):
+    import sys
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.utils import setup_django, test_database  # noqa: E402
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentiles(samples):
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {f'p{p}': round(cuts[p - 1] * 1000, 3) for p in PERCENTILES}
+
+
+def measure_route(client, url, repeat, warm):
+    from benchmarks.endpoints import clear_caches, count_queries
+    status_code, queries = count_queries(client, url)
+    samples = []
+    for _ in range(repeat):
+        if not warm:
+            clear_caches()
+        started = time.perf_counter()
+        client.get(url)
+        samples.append(time.perf_counter() - started)
+    return {
+        'status': status_code,
+        'queries': queries,
+        **percentiles(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument(
+        '--warm', action='store_true',
+        help='Не сбрасывать кеш ответов между запросами.',
+    )
+    parser.add_argument('--output', default='latency.json')
+    options = parser.parse_args()
+    setup_django()
+    with test_database():
+        from benchmarks.endpoints import get_routes, make_clients, seed
+        seed(options.size)
+        clients = make_clients()
+        results = {
+            name: {
+                role: measure_route(
+                    client, url, options.repeat, options.warm
+                )
+                for role, client in clients.items()
+            }
+            for name, url in get_routes().items()
+        }
+    report = {
+        'size': options.size,
+        'repeat': options.repeat,
+        'warm': options.warm,
+        'unit': 'ms',
+        'routes': results,
+    }
+    Path(options.output).write_text(
+        json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8'
+    )
+    print(f'{"маршрут":<22}{"роль":<11}{"SQL":>5}'
+          + ''.join(f'{f"p{p}, мс":>10}' for p in PERCENTILES))
+    for name, roles in results.items():
+        for role, row in roles.items():
+            print(f'{name:<22}{role:<11}{row["queries"]:>5}'
+                  + ''.join(f'{row[f"p{p}"]:>10.2f}' for p in PERCENTILES))
+
+
+if __name__ == '__main__':
+    main()
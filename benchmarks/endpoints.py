@@ -0,0 +1,153 @@
+"""
+Общая часть для проверки бюджета запросов и замера задержек:
+наполнение базы данными заданного объема и список маршрутов API.
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.v1.authentication import ClaimsAccessToken
+from ranking.rankings import rebuild_rankings
+from reviews.models import Category, Comment, Genre, Review, Title
+from search.documents import rebuild_index
+
+ROLES = (
+    'anonymous',
+    'user',
+    'moderator',
+    'admin',
+)
+TITLE_ID = 1
+REVIEW_ID = 1
+AUTHOR_ID_OFFSET = 1000
+
+
+def make_clients():
+    """Создает пользователей всех ролей и клиентов с их токенами."""
+    User = get_user_model()
+    clients = {'anonymous': APIClient()}
+    for role in ROLES[1:]:
+        user = User.objects.create_user(
+            username=f'budget_{role}',
+            email=f'budget_{role}@yamdb.fake',
+            role=role,
+        )
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {ClaimsAccessToken.for_user(user)}'
+        )
+        clients[role] = client
+    return clients
+
+
+def seed(size):
+    """
+    Доводит объем данных до size произведений, отзывов и комментариев.
+
+    Все отзывы относятся к первому произведению, а комментарии -
+    к первому отзыву, чтобы списки на вложенных маршрутах росли вместе
+    с size.
+    """
+    User = get_user_model()
+    if not Category.objects.exists():
+        Category.objects.bulk_create(
+            Category(id=idx, name=f'Категория {idx}', slug=f'category{idx}')
+            for idx in (1, 2)
+        )
+        Genre.objects.bulk_create(
+            Genre(id=idx, name=f'Жанр {idx}', slug=f'genre{idx}')
+            for idx in (1, 2, 3)
+        )
+    start = Title.objects.count() + 1
+    ids = range(start, size + 1)
+    User.objects.bulk_create(
+        User(
+            id=AUTHOR_ID_OFFSET + idx,
+            username=f'author{idx}',
+            email=f'author{idx}@yamdb.fake',
+        )
+        for idx in ids
+    )
+    Title.objects.bulk_create(
+        Title(
+            id=idx,
+            name=f'Произведение {idx}',
+            year=2000,
+            description='Описание произведения',
+            category_id=1 + idx % 2,
+        )
+        for idx in ids
+    )
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=idx, genre_id=genre_id)
+        for idx in ids
+        for genre_id in (1 + idx % 3, 1 + (idx + 1) % 3)
+    )
+    Review.objects.bulk_create(
+        Review(
+            id=idx,
+            title_id=TITLE_ID,
+            author_id=AUTHOR_ID_OFFSET + idx,
+            text=f'Отзыв о произведении {idx}',
+            score=1 + idx % 10,
+        )
+        for idx in ids
+    )
+    Comment.objects.bulk_create(
+        Comment(
+            id=idx,
+            review_id=REVIEW_ID,
+            author_id=AUTHOR_ID_OFFSET + idx,
+            text=f'Комментарий {idx}',
+        )
+        for idx in ids
+    )
+    # bulk_create не вызывает сигналы, поэтому счетчики отзывов
+    # и комментариев пересчитываются так же, как после загрузки csv.
+    call_command('recalculate_ratings', stdout=StringIO())
+    rebuild_rankings(batch_size=1000)
+    rebuild_index(batch_size=1000)
+
+
+def get_routes():
+    """Возвращает GET-маршруты из api/v1/urls.py с подставленными id."""
+    title = f'/api/v1/titles/{TITLE_ID}/'
+    review = f'{title}reviews/{REVIEW_ID}/'
+    return {
+        'titles-list': '/api/v1/titles/',
+        'titles-list-filtered': '/api/v1/titles/?genre=genre1&year=2000',
+        'titles-detail': title,
+        'titles-stats': f'{title}stats/',
+        'categories-list': '/api/v1/categories/',
+        'genres-list': '/api/v1/genres/',
+        'reviews-list': f'{title}reviews/',
+        'reviews-detail': review,
+        'comments-list': f'{review}comments/',
+        'comments-detail': f'{review}comments/1/',
+        'users-list': '/api/v1/users/',
+        'users-detail': f'/api/v1/users/author{REVIEW_ID}/',
+        'users-me': '/api/v1/users/me/',
+        'search': '/api/v1/search/?q=произведение',
+        'leaderboard': '/api/v1/leaderboard/',
+        'leaderboard-category': '/api/v1/leaderboard/category/category2/',
+        'leaderboard-genre': '/api/v1/leaderboard/genre/genre2/',
+        'leaderboard-year': '/api/v1/leaderboard/year/2000/',
+    }
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+def count_queries(client, url):
+    """Выполняет запрос без прогретого кеша и возвращает число SQL."""
+    clear_caches()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response.status_code, len(context.captured_queries)
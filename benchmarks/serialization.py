@@ -0,0 +1,91 @@
+"""
+Сравнивает затраты на одну строку списка при сериализации и рендеринге:
+экземпляры моделей, обычный сериализатор и JSONRenderer (до) против
+строк values(), режима ValuesSerializerMixin и FastJSONRenderer (после).
+В замер входят запросы к базе.
+
+Запуск из корня репозитория:
+    python benchmarks/serialization.py --size 1000 --repeat 20
+"""
+import argparse
+import time
+from pathlib import Path
+
+if __package__ in (None, ''):
+    import sys
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.utils import setup_django, test_database  # noqa: E402
+
+
+def render_instances(serializer_class, queryset, context, renderer):
+    return renderer.render(
+        serializer_class(queryset, many=True, context=context).data,
+    )
+
+
+def render_values(serializer_class, queryset, context, renderer):
+    serializer = serializer_class(context=context)
+    rows = list(serializer.get_values_queryset(queryset))
+    return renderer.render(serializer.to_values_representation(rows))
+
+
+def measure(render, serializer_class, queryset, context, renderer, repeat):
+    size = queryset.count()
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(serializer_class, queryset, context, renderer)
+        best = min(best, time.perf_counter() - started)
+    return best / size * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    options = parser.parse_args()
+    setup_django()
+    with test_database():
+        from django.db.models import Prefetch
+        from rest_framework.renderers import JSONRenderer
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+
+        from api.v1.renderers import FastJSONRenderer, orjson
+        from api.v1.serializers import TitleGetSerializer
+        from benchmarks.endpoints import seed
+        from reviews.models import Genre, Title
+        seed(options.size)
+        context = {'request': Request(APIRequestFactory().get('/'))}
+        cases = (
+            (
+                'titles',
+                TitleGetSerializer,
+                Title.objects.select_related('category').prefetch_related(
+                    Prefetch('genre', queryset=Genre.objects.order_by('pk')),
+                ).order_by('name'),
+            ),
+        )
+        print(f'orjson: {"установлен" if orjson else "не установлен"}')
+        print(
+            f'{"список":<10}{"до, мкс":>10}'
+            f'{"после, мкс":>12}{"ускорение":>11}'
+        )
+        for name, serializer_class, queryset in cases:
+            before = measure(
+                render_instances, serializer_class, queryset, context,
+                JSONRenderer(), options.repeat,
+            )
+            after = measure(
+                render_values, serializer_class, queryset, context,
+                FastJSONRenderer(), options.repeat,
+            )
+            print(
+                f'{name:<10}{before:>10.2f}{after:>12.2f}'
+                f'{before / after:>10.1f}x'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Сравнивает выгрузку и загрузку данных тремя способами:
+бинарный снимок, файлы csv с load_all и dumpdata/loaddata.
+
+Запуск из корня репозитория:
+    python benchmarks/snapshot_roundtrip.py --titles 2000
+"""
+import argparse
+import csv
+import tempfile
+import time
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+
+if __package__ in (None, ''):
+    import sys
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.utils import setup_django, test_database  # noqa: E402
+
+
+def seed(titles_count, reviews_per_title):
+    from django.contrib.auth import get_user_model
+
+    from reviews.models import Category, Comment, Genre, Review, Title
+    User = get_user_model()
+    pub_date = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    users = User.objects.bulk_create(
+        User(id=idx, username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+        for idx in range(1, reviews_per_title + 1)
+    )
+    categories = Category.objects.bulk_create(
+        Category(id=idx, name=f'Категория {idx}', slug=f'category{idx}')
+        for idx in range(1, 11)
+    )
+    genres = Genre.objects.bulk_create(
+        Genre(id=idx, name=f'Жанр {idx}', slug=f'genre{idx}')
+        for idx in range(1, 21)
+    )
+    titles = Title.objects.bulk_create(
+        Title(
+            id=idx,
+            name=f'Произведение {idx}',
+            year=1900 + idx % 120,
+            description='Описание произведения',
+            category=categories[idx % len(categories)],
+        )
+        for idx in range(1, titles_count + 1)
+    )
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title=title, genre=genres[idx % len(genres)])
+        for idx, title in enumerate(titles)
+    )
+    reviews = Review.objects.bulk_create(
+        Review(
+            id=idx,
+            title=title,
+            author=user,
+            text='Текст отзыва ' * 10,
+            score=1 + idx % 10,
+            pub_date=pub_date,
+        )
+        for idx, (title, user) in enumerate(
+            ((title, user) for title in titles for user in users), 1
+        )
+    )
+    Comment.objects.bulk_create(
+        Comment(review=review, author=users[0], text='Комментарий',
+                pub_date=pub_date)
+        for review in reviews
+    )
+
+
+def flush():
+    from django.core.management import call_command
+    call_command('flush', interactive=False, verbosity=0)
+
+
+def measure(action):
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def snapshot_roundtrip(directory):
+    from django.core.management import call_command
+    path = str(directory / 'snapshot.ymdb')
+    export = measure(lambda: call_command(
+        'export_snapshot', output=path, stdout=StringIO(),
+    ))
+    flush()
+    load = measure(lambda: call_command(
+        'import_snapshot', input=path, stdout=StringIO(),
+    ))
+    return export, load, Path(path).stat().st_size
+
+
+def export_csv(directory):
+    from django.apps import apps
+
+    from reviews.management.commands.load_all import DATA_FILES
+    for label, file_name in DATA_FILES.items():
+        model = apps.get_model(label)
+        names = [field.attname for field in model._meta.concrete_fields]
+        with open(directory / file_name, 'w', encoding='utf-8',
+                  newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(names)
+            writer.writerows(
+                ('' if value is None else value for value in row)
+                for row in model.objects.values_list(*names).iterator()
+            )
+
+
+def csv_roundtrip(directory):
+    from django.core.management import call_command
+
+    from reviews.management.commands import load_data_from_csv
+    from reviews.management.commands.load_all import DATA_FILES
+    export = measure(lambda: export_csv(directory))
+    flush()
+    data_dir = load_data_from_csv.DATA_DIR
+    load_data_from_csv.DATA_DIR = directory
+    try:
+        load = measure(lambda: call_command('load_all', stdout=StringIO()))
+    finally:
+        load_data_from_csv.DATA_DIR = data_dir
+    size = sum(
+        (directory / name).stat().st_size for name in DATA_FILES.values()
+    )
+    return export, load, size
+
+
+def fixture_roundtrip(directory):
+    from django.core.management import call_command
+    path = str(directory / 'fixture.json')
+    export = measure(lambda: call_command(
+        'dumpdata', 'users.CustomUser', 'reviews', output=path,
+    ))
+    flush()
+    load = measure(lambda: call_command('loaddata', path, verbosity=0))
+    return export, load, Path(path).stat().st_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--reviews_per_title', type=int, default=5)
+    options = parser.parse_args()
+    setup_django()
+    with test_database(), tempfile.TemporaryDirectory() as directory:
+        print(f'{"способ":<20}{"выгрузка, с":>14}{"загрузка, с":>14}'
+              f'{"размер, КБ":>14}')
+        for name, roundtrip in (
+            ('snapshot', snapshot_roundtrip),
+            ('csv + load_all', csv_roundtrip),
+            ('dumpdata/loaddata', fixture_roundtrip),
+        ):
+            flush()
+            seed(options.titles, options.reviews_per_title)
+            export, load, size = roundtrip(Path(directory))
+            print(f'{name:<20}{export:>14.3f}{load:>14.3f}'
+                  f'{size / 1024:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+
+
+def setup_django():
+    """Настраивает Django для запуска бенчмарка вне manage.py."""
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Создает временную тестовую базу, рабочая база не затрагивается."""
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_title(self, title_id):
+        return Title.objects.get(pk=title_id)
+
+    def test_01_rating_follows_reviews(self, admin_client, admin, user,
+                                       user_client, moderator,
+                                       moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.rating_count) == (15, 3), (
+            'Проверьте, что при создании отзыва сумма и количество оценок '
+            'произведения обновляются.'
+        )
+        assert title.rating == 5
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 2},
+        )
+        assert response.status_code == HTTPStatus.OK
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.rating_count) == (12, 3), (
+            'Проверьте, что при изменении оценки отзыва рейтинг '
+            'произведения пересчитывается.'
+        )
+        assert title.rating == 4
+
+        response = admin_client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.json().get('rating') == 4
+
+        admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.rating_count) == (7, 2), (
+            'Проверьте, что при удалении отзыва рейтинг произведения '
+            'пересчитывается.'
+        )
+
+        moderator.delete()
+        user.delete()
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.rating_count) == (0, 0), (
+            'Проверьте, что каскадное удаление отзывов вместе с '
+            'пользователем пересчитывает рейтинг произведения.'
+        )
+        assert title.rating is None
+
+    def test_02_recalculate_ratings(self, admin_client, admin, user,
+                                    user_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+        }
+        _, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        Title.objects.filter(pk=title_id).update(
+            rating_sum=1, rating_count=1, rating=1
+        )
+
+        out = StringIO()
+        call_command('recalculate_ratings', '--dry-run', stdout=out)
+        assert 'Расхождений найдено: 1.' in out.getvalue()
+        assert self.get_title(title_id).rating_sum == 1
+
+        call_command('recalculate_ratings', stdout=StringIO())
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.rating_count) == (10, 2)
+        assert title.rating == 5
@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Title
+
+TITLES_COUNT = 7
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        return Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000)
+            for idx in range(TITLES_COUNT)
+        )
+
+    def collect_pages(self, client, url, **extra):
+        names = []
+        while url:
+            response = client.get(url, **extra)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме пагинации не '
+                'возвращается ключ `count`.'
+            )
+            names.extend(title['name'] for title in data['results'])
+            url = data['next']
+        return names
+
+    def test_01_default_is_page_number(self, client, titles):
+        data = client.get(self.TITLES_URL).json()
+        assert data['count'] == TITLES_COUNT, (
+            'Проверьте, что по умолчанию используется постраничная '
+            'пагинация с ключом `count`.'
+        )
+
+    def test_02_cursor_by_query_param(self, client, titles):
+        names = self.collect_pages(
+            client, f'{self.TITLES_URL}?pagination=cursor'
+        )
+        assert names == sorted(title.name for title in titles), (
+            'Проверьте, что курсорная пагинация по `name` возвращает все '
+            'произведения без пропусков и повторов.'
+        )
+
+    def test_03_cursor_by_accept_header(self, client, titles):
+        names = self.collect_pages(
+            client,
+            self.TITLES_URL,
+            HTTP_ACCEPT='application/json; pagination=cursor',
+        )
+        assert len(names) == TITLES_COUNT
@@ -0,0 +1,84 @@
+import pytest
+
+from api.v1.cache import get_cache_stats
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CatalogCache:
+
+    GENRES_URL = '/api/v1/genres/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_anonymous_list_is_cached(self, client, admin_client):
+        assert client.get(self.GENRES_URL)['X-Cache'] == 'MISS'
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос анонима к '
+            f'`{self.GENRES_URL}` отдается из кеша.'
+        )
+        assert get_cache_stats() == {'hits': 1, 'misses': 1}
+
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Ужасы', 'slug': 'horror'}
+        )
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что создание жанра сбрасывает кеш списка жанров.'
+        )
+        assert response.json()['count'] == 1
+
+    def test_02_query_params_are_normalized(self, client):
+        client.get(f'{self.GENRES_URL}?search=a&page=1')
+        response = client.get(f'{self.GENRES_URL}?page=1&search=a')
+        assert response['X-Cache'] == 'HIT'
+
+    def test_03_authenticated_requests_bypass_cache(self, admin_client):
+        admin_client.get(self.GENRES_URL)
+        response = admin_client.get(self.GENRES_URL)
+        assert 'X-Cache' not in response
+        assert get_cache_stats() == {'hits': 0, 'misses': 0}
+
+    def test_04_review_invalidates_title(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        assert client.get(url).json()['rating'] is None
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        create_single_review(admin_client, titles[0]['id'], 'Отлично', 8)
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 8, (
+            'Проверьте, что новый отзыв сбрасывает кеш произведения.'
+        )
+
+    def test_05_cursor_accept_header_not_shared(self, client, admin_client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        response = client.get(
+            url, HTTP_ACCEPT='application/json; pagination=cursor',
+        )
+        assert 'count' not in response.json()
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что ответ в курсорном режиме не отдается '
+            'из кеша на обычный запрос.'
+        )
+        assert 'count' in response.json()
+
+    def test_06_stats_endpoint_admin_only(self, client, user_client,
+                                          admin_client):
+        url = '/api/v1/cache/stats/'
+        assert client.get(url).status_code == 401
+        assert user_client.get(url).status_code == 403
+        assert admin_client.get(url).json() == {
+            'hits': 0, 'misses': 0, 'hit_ratio': None,
+        }
+
+        for _ in range(4):
+            client.get(self.GENRES_URL)
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        assert response.json() == {
+            'hits': 3, 'misses': 1, 'hit_ratio': 0.75,
+        }, 'Проверьте, что счетчики кеша каталога доступны администратору.'
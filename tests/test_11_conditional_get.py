@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ConditionalGet:
+
+    GENRES_URL = '/api/v1/genres/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def assert_not_modified(self, client, url, etag):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+        assert response['ETag'] == etag
+
+    def test_01_catalog_etag(self, client, admin_client):
+        response = client.get(self.GENRES_URL)
+        etag = response['ETag']
+        assert etag and response['Last-Modified'], (
+            f'Проверьте, что ответ на GET-запрос к `{self.GENRES_URL}` '
+            'содержит заголовки `ETag` и `Last-Modified`.'
+        )
+        self.assert_not_modified(client, self.GENRES_URL, etag)
+
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Ужасы', 'slug': 'horror'}
+        )
+        response = client.get(self.GENRES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response['ETag'] != etag
+
+    def test_02_reviews_etag(self, client, admin_client, admin,
+                             user_client, moderator_client):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = client.get(url)['ETag']
+        self.assert_not_modified(client, url, etag)
+
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'text': 'Ок'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение отзыва меняет `ETag` списка отзывов.'
+        )
+        etag = response['ETag']
+
+        create_single_review(moderator_client, titles[1]['id'], 'Другое', 3)
+        self.assert_not_modified(client, url, etag)
+
+        create_single_review(user_client, titles[0]['id'], 'Новый', 3)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 2
+
+    def test_03_username_change(self, client, admin_client, user,
+                                user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Текст', 5)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = client.get(url)['ETag']
+
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'][0]['author'] == 'renamed'
@@ -0,0 +1,128 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.management.commands import load_data_from_csv
+from reviews.management.commands.load_all import get_dependencies
+from ranking.models import RankingEntry
+from reviews.models import Category, Comment, Genre, Review, Title
+from search.models import SearchDocument
+from users.models import CustomUser
+
+CATEGORY_CSV = (
+    'id,name,slug\n'
+    '1,Фильм,movie\n'
+    '2,Книга,book\n'
+    '3,Музыка,music\n'
+)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(load_data_from_csv, 'DATA_DIR', tmp_path)
+    (tmp_path / 'category.csv').write_text(CATEGORY_CSV, encoding='utf-8')
+    return tmp_path
+
+
+def load_categories(*args):
+    out = StringIO()
+    call_command(
+        'load_data_from_csv',
+        '--file_name', 'category.csv',
+        '--app_name', 'reviews',
+        '--model_name', 'Category',
+        *args,
+        stdout=out,
+    )
+    return out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12LoadDataFromCsv:
+
+    def test_01_batches(self, data_dir):
+        output = load_categories('--batch_size', '2')
+        assert output.count('Загружено строк:') == 2, (
+            'Проверьте, что загрузка выполняется пачками размера '
+            '`batch_size` с отчетом о прогрессе.'
+        )
+        assert list(
+            Category.objects.order_by('id').values_list('id', 'slug')
+        ) == [(1, 'movie'), (2, 'book'), (3, 'music')]
+
+    def test_02_failure_rolls_back(self, data_dir):
+        Category.objects.create(id=10, name='Игры', slug='music')
+        with pytest.raises(Exception):
+            load_categories('--batch_size', '2')
+        assert Category.objects.count() == 1, (
+            'Проверьте, что ошибка в середине файла откатывает загрузку.'
+        )
+
+    def test_03_resume(self, data_dir):
+        Category.objects.create(id=1, name='Фильм', slug='movie')
+        checkpoint = data_dir / 'category.csv.checkpoint'
+        checkpoint.write_text('1')
+        load_categories('--resume')
+        assert Category.objects.count() == 3, (
+            'Проверьте, что с `--resume` загрузка продолжается с последней '
+            'зафиксированной строки.'
+        )
+        assert not checkpoint.exists()
+
+    def test_04_rebuilds_rankings_and_search(self, data_dir, user):
+        Category.objects.create(id=1, name='Фильм', slug='movie')
+        (data_dir / 'titles.csv').write_text(
+            'id,name,year,category_id\n1,Побег,1994,1\n', encoding='utf-8',
+        )
+        (data_dir / 'review.csv').write_text(
+            'id,title_id,text,author_id,score,pub_date\n'
+            f'1,1,Отлично,{user.pk},9,2020-01-01T00:00:00Z\n',
+            encoding='utf-8',
+        )
+        for file_name, model_name in (('titles.csv', 'Title'),
+                                      ('review.csv', 'Review')):
+            call_command(
+                'load_data_from_csv',
+                '--file_name', file_name,
+                '--app_name', 'reviews',
+                '--model_name', model_name,
+                stdout=StringIO(),
+            )
+        entry = RankingEntry.objects.get(
+            board=RankingEntry.Boards.ALL, title=1,
+        )
+        assert (entry.rating, entry.rating_count) == (9, 1), (
+            'Проверьте, что после загрузки csv рейтинговые таблицы '
+            'перестраиваются.'
+        )
+        assert SearchDocument.objects.filter(
+            object_type=SearchDocument.Types.REVIEW,
+        ).count() == 1, (
+            'Проверьте, что после загрузки csv перестраивается поисковый '
+            'индекс.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12LoadAll:
+
+    def test_01_dependencies(self):
+        through = Title.genre.through
+        models = {CustomUser, Category, Genre, Title, through, Review,
+                  Comment}
+        dependencies = get_dependencies(models)
+        assert dependencies[Title] == {Category}
+        assert dependencies[through] == {Title, Genre}
+        assert dependencies[Review] == {Title, CustomUser}
+        assert dependencies[Comment] == {Review, CustomUser}
+
+    def test_02_load_all(self):
+        call_command('load_all', '--workers', '2', stdout=StringIO())
+        assert Title.objects.count() == 32
+        assert Title.genre.through.objects.count() == 42
+        assert Comment.objects.count() == 3
+        assert Title.objects.filter(rating__isnull=False).count() == 32, (
+            'Проверьте, что после загрузки отзывов рейтинг произведений '
+            'пересчитывается.'
+        )
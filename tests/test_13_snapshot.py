@@ -0,0 +1,48 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Review, Title
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Snapshot:
+
+    def dump(self):
+        out = StringIO()
+        call_command('dumpdata', 'users.CustomUser', 'reviews', stdout=out)
+        return out.getvalue()
+
+    @pytest.mark.parametrize('compression', ('none', 'zlib', 'lzma'))
+    def test_01_roundtrip(self, tmp_path, compression, admin_client, admin,
+                          user, user_client):
+        create_comments(admin_client, {admin: admin_client,
+                                       user: user_client})
+        Title.objects.filter(pk=Title.objects.first().pk).update(
+            category=None
+        )
+        before = self.dump()
+        path = str(tmp_path / 'snapshot.ymdb')
+        call_command('export_snapshot', output=path,
+                     compression=compression, stdout=StringIO())
+        call_command('flush', interactive=False)
+        call_command('import_snapshot', input=path, stdout=StringIO())
+        assert self.dump() == before, (
+            'Проверьте, что после импорта снимка данные совпадают с '
+            'исходными, включая даты публикации и пустые значения.'
+        )
+        assert Review.objects.count() == 2
+        assert Comment.objects.count() == 2
+
+    def test_02_loaddata_keeps_rating(self, tmp_path, admin_client, admin):
+        create_comments(admin_client, {admin: admin_client})
+        path = str(tmp_path / 'fixture.json')
+        call_command('dumpdata', 'users.CustomUser', 'reviews', output=path)
+        call_command('flush', interactive=False)
+        call_command('loaddata', path, verbosity=0)
+        title = Title.objects.get(reviews__isnull=False)
+        assert (title.rating_sum, title.rating_count) == (5, 1), (
+            'Проверьте, что loaddata не пересчитывает рейтинг повторно.'
+        )
@@ -0,0 +1,67 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from search.models import SearchDocument
+from tests.utils import create_reviews, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Search:
+
+    SEARCH_URL = '/api/v1/search/'
+
+    def search(self, client, **params):
+        response = client.get(self.SEARCH_URL, data=params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.SEARCH_URL}` возвращает '
+            'ответ со статусом 200.'
+        )
+        return response.json()['results']
+
+    def test_01_query_required(self, client):
+        response = client.get(self.SEARCH_URL)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_russian_stemming(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(
+            user_client, titles[1]['id'], 'Лучшие боевики про полицейских', 9
+        )
+        results = self.search(client, q='полицейский боевик')
+        assert [(result['type'], result['title_id']) for result in results] \
+            == [('review', titles[1]['id'])], (
+                'Проверьте, что поиск находит словоформы русских слов.'
+            )
+
+    def test_03_ranking_and_types(self, client, admin_client, admin, user,
+                                  user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/',
+            data={'text': 'Терминатор, терминатор и еще раз терминатор'},
+        )
+        results = self.search(client, q='терминатора')
+        assert results[0]['type'] == 'title', (
+            'Проверьте, что совпадение в названии произведения ранжируется '
+            'выше совпадения в тексте отзыва.'
+        )
+        assert results[0]['rank'] >= results[-1]['rank']
+
+        results = self.search(client, q='терминатор', type='review')
+        assert [result['id'] for result in results] == [reviews[0]['id']]
+
+    def test_04_index_follows_deletes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert self.search(client, q='терминатор') == []
+
+        SearchDocument.objects.all().delete()
+        call_command('rebuild_search_index', stdout=StringIO())
+        results = self.search(client, q='орешек')
+        assert [result['id'] for result in results] == [titles[1]['id']]
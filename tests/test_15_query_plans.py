@@ -0,0 +1,80 @@
+import re
+
+import pytest
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.v1.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
+                          ReviewViewSet, TitleViewSet, UsersViewSet)
+from reviews.models import Review
+
+FULL_SCAN = re.compile(r'\bSCAN (TABLE )?\w+( AS \w+)?$')
+TEMP_SORT = 'USE TEMP B-TREE'
+
+VIEWSET_QUERIES = (
+    (CategoryViewSet, {}, {}),
+    (GenreViewSet, {}, {}),
+    (TitleViewSet, {}, {}),
+    (TitleViewSet, {}, {'year': 1994}),
+    (TitleViewSet, {}, {'name': 'Побег из Шоушенка'}),
+    (TitleViewSet, {}, {'category': 'movie'}),
+    (TitleViewSet, {}, {'genre': 'drama'}),
+    (TitleViewSet, {}, {'genre': 'drama', 'category': 'movie'}),
+    (ReviewViewSet, {'title_id': 1}, {}),
+    (CommentViewSet, {'title_id': 1, 'review_id': 1}, {}),
+    (UsersViewSet, {}, {}),
+)
+
+
+def get_list_queryset(viewset, kwargs, params):
+    view = viewset(
+        request=Request(APIRequestFactory().get('/', params)),
+        kwargs=kwargs,
+        action='list',
+        format_kwarg=None,
+    )
+    queryset = view.filter_queryset(view.get_queryset())
+    return view, queryset
+
+
+def assert_uses_indexes(queryset, description):
+    plan = queryset.explain()
+    for line in plan.splitlines():
+        assert not FULL_SCAN.search(line) and TEMP_SORT not in line, (
+            f'Проверьте индексы для запроса {description}: в плане '
+            f'выполнения есть полный просмотр или сортировка:\n{plan}'
+        )
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Разбор плана выполнения написан для SQLite.',
+)
+@pytest.mark.django_db
+class Test15QueryPlans:
+
+    @pytest.mark.parametrize('viewset, kwargs, params', VIEWSET_QUERIES)
+    def test_01_list_page(self, viewset, kwargs, params):
+        view, queryset = get_list_queryset(viewset, kwargs, params)
+        page_size = view.paginator.page_size
+        assert_uses_indexes(
+            queryset[:page_size], f'{viewset.__name__} {params}'
+        )
+
+    @pytest.mark.parametrize('viewset, kwargs, params', VIEWSET_QUERIES)
+    def test_02_cursor_page(self, viewset, kwargs, params):
+        view, queryset = get_list_queryset(viewset, kwargs, params)
+        ordering = getattr(view.paginator, 'cursor_ordering', None)
+        if ordering is None:
+            pytest.skip('Курсорная пагинация не используется.')
+        assert_uses_indexes(
+            queryset.order_by(*ordering)[:view.paginator.page_size],
+            f'{viewset.__name__} {params} {ordering}',
+        )
+
+    def test_03_default_review_ordering(self):
+        assert_uses_indexes(
+            Review.objects.filter(title_id=1)[:5],
+            'Review.objects.filter(title=...) с Meta.ordering',
+        )
@@ -0,0 +1,145 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.endpoints import (ROLES, count_queries, get_routes,
+                                  make_clients, seed)
+
+SMALL_SIZE = 2
+LARGE_SIZE = settings.REST_FRAMEWORK['PAGE_SIZE'] * 2
+
+# Максимальное число SQL-запросов на маршрут. Пользователь берется
+# из токена, поэтому бюджет одинаков для всех ролей.
+QUERY_BUDGETS = {
+    'titles-list': 3,
+    'titles-list-filtered': 3,
+    'titles-detail': 2,
+    'titles-stats': 1,
+    'categories-list': 2,
+    'genres-list': 2,
+    'reviews-list': 2,
+    'reviews-detail': 1,
+    'comments-list': 2,
+    'comments-detail': 1,
+    'users-list': 2,
+    'users-detail': 1,
+    'users-me': 1,
+    'search': 2,
+    'leaderboard': 1,
+    'leaderboard-category': 2,
+    'leaderboard-genre': 2,
+    'leaderboard-year': 1,
+}
+URL_SIGNUP = '/api/v1/auth/signup/'
+SIGNUP_DATA = {
+    'email': 'budget@yamdb.fake',
+    'username': 'budget_signup',
+}
+USERS_TABLE = 'users_customuser'
+
+
+@pytest.fixture
+def query_counts(db):
+    """Число запросов по маршрутам и ролям на малом и большом объеме."""
+    counts = {}
+    clients = make_clients()
+    for size in (SMALL_SIZE, LARGE_SIZE):
+        seed(size)
+        for role, client in clients.items():
+            for name, url in get_routes().items():
+                counts.setdefault((name, role), []).append(
+                    count_queries(client, url)
+                )
+    return counts
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16QueryBudget:
+
+    def test_00_budget_covers_routes(self):
+        assert set(QUERY_BUDGETS) == set(get_routes()), (
+            'Задайте бюджет запросов для каждого маршрута из get_routes().'
+        )
+
+    def test_01_budget(self, query_counts):
+        for (name, role), results in query_counts.items():
+            for status_code, queries in results:
+                assert queries <= QUERY_BUDGETS[name], (
+                    f'Запрос `{name}` от роли `{role}` выполняет {queries} '
+                    f'SQL-запросов, бюджет - {QUERY_BUDGETS[name]}.'
+                )
+
+    def test_02_no_n_plus_one(self, query_counts):
+        for (name, role), (small, large) in query_counts.items():
+            assert small == large, (
+                f'Число SQL-запросов для `{name}` от роли `{role}` зависит '
+                f'от объема данных: {small[1]} при {SMALL_SIZE} объектах '
+                f'и {large[1]} при {LARGE_SIZE}. Проверьте '
+                'select_related/prefetch_related.'
+            )
+
+    def test_03_all_roles_checked(self, query_counts):
+        assert {role for _, role in query_counts} == set(ROLES)
+        successful = {
+            name for (name, role), results in query_counts.items()
+            if all(status_code == 200 for status_code, _ in results)
+        }
+        assert successful == set(get_routes()), (
+            'Каждый маршрут должен хотя бы для одной роли отвечать 200.'
+        )
+
+
+def signup_queries(client, data):
+    """Запросы к таблице пользователей при регистрации: (чтения, записи)."""
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(URL_SIGNUP, data=data)
+    users_queries = [
+        query['sql'] for query in context.captured_queries
+        if USERS_TABLE in query['sql']
+    ]
+    reads = [sql for sql in users_queries if sql.startswith('SELECT')]
+    return response, len(reads), len(users_queries) - len(reads)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16SignUpQueries:
+
+    @pytest.fixture(autouse=True)
+    def outbox_by_command(self, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+
+    def test_01_new_user(self, client):
+        response, reads, writes = signup_queries(client, SIGNUP_DATA)
+
+        assert response.status_code == 200
+        assert (reads, writes) == (1, 1), (
+            'Регистрация нового пользователя должна выполнять одно чтение '
+            f'и одну запись, выполнено чтений: {reads}, записей: {writes}.'
+        )
+
+    def test_02_existing_user(self, client):
+        client.post(URL_SIGNUP, data=SIGNUP_DATA)
+
+        response, reads, writes = signup_queries(client, SIGNUP_DATA)
+
+        assert response.status_code == 200
+        assert (reads, writes) == (1, 0), (
+            'Повторная регистрация должна выполнять одно чтение без '
+            f'записи, выполнено чтений: {reads}, записей: {writes}.'
+        )
+
+    @pytest.mark.parametrize('field', ('username', 'email'))
+    def test_03_conflict(self, client, field):
+        client.post(URL_SIGNUP, data=SIGNUP_DATA)
+        data = {
+            'email': 'other@yamdb.fake',
+            'username': 'other_username',
+            field: SIGNUP_DATA[field],
+        }
+
+        response, reads, writes = signup_queries(client, data)
+
+        assert response.status_code == 400
+        assert list(response.json()) == [field]
+        assert (reads, writes) == (1, 0)
@@ -0,0 +1,171 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPServerDisconnected
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from mailing.models import OutgoingEmail
+from mailing.outbox import deliver_pending, enqueue
+
+URL_SIGNUP = '/api/v1/auth/signup/'
+SIGNUP_DATA = {
+    'email': 'outbox@yamdb.fake',
+    'username': 'outbox_user',
+}
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise SMTPServerDisconnected('Сервер недоступен.')
+
+
+def enqueue_emails(count):
+    for idx in range(count):
+        enqueue('Тема', 'Текст', f'user{idx}@yamdb.fake')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Outbox:
+
+    def test_01_signup_enqueues_email(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        response = client.post(URL_SIGNUP, data=SIGNUP_DATA)
+
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Регистрация не должна отправлять письмо в потоке запроса.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == SIGNUP_DATA['email']
+        assert email.status == OutgoingEmail.Statuses.PENDING
+
+        call_command('send_outbox', stdout=StringIO())
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [SIGNUP_DATA['email']]
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.Statuses.SENT
+        assert email.sent_at is not None
+        assert email.body == '', (
+            'После отправки код подтверждения не должен храниться в базе.'
+        )
+
+    def test_02_batch_uses_one_connection(self, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        settings.EMAIL_BACKEND = 'tests.test_17_outbox.CountingBackend'
+        CountingBackend.opened = 0
+        enqueue_emails(5)
+
+        stats = deliver_pending(batch_size=5)
+
+        assert stats[OutgoingEmail.Statuses.SENT] == 5
+        assert len(mail.outbox) == 5
+        assert CountingBackend.opened == 1, (
+            'Пачка писем должна отправляться через одно соединение.'
+        )
+
+    def test_03_retry_with_backoff(self, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        settings.EMAIL_BACKEND = 'tests.test_17_outbox.FailingBackend'
+        settings.EMAIL_OUTBOX_RETRY_DELAY = 60
+        enqueue_emails(1)
+
+        stats = deliver_pending()
+
+        assert stats[OutgoingEmail.Statuses.PENDING] == 1
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1
+        assert 'SMTPServerDisconnected' in email.last_error
+        delay = (email.next_attempt_at - timezone.now()).total_seconds()
+        assert 50 < delay <= 60
+        assert not deliver_pending(), (
+            'Письмо не должно отправляться повторно до истечения задержки.'
+        )
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        deliver_pending()
+        email.refresh_from_db()
+        assert email.attempts == 2
+        delay = (email.next_attempt_at - timezone.now()).total_seconds()
+        assert 110 < delay <= 120, 'Задержка должна расти экспоненциально.'
+
+    def test_04_dead_letter(self, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        settings.EMAIL_BACKEND = 'tests.test_17_outbox.FailingBackend'
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        enqueue_emails(1)
+
+        for _ in range(2):
+            OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+            deliver_pending()
+
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.Statuses.DEAD
+        assert email.attempts == 2
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        out = StringIO()
+        call_command('send_outbox', requeue_dead=True, stdout=out)
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.Statuses.SENT
+        assert 'Возвращено в очередь: 1.' in out.getvalue()
+
+    def test_05_filebased_backend(self, settings, tmp_path):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.filebased.EmailBackend'
+        )
+        settings.EMAIL_FILE_PATH = tmp_path
+        enqueue_emails(3)
+        deliver_pending()
+
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1
+        content = files[0].read_text()
+        for idx in range(3):
+            assert f'user{idx}@yamdb.fake' in content
+        assert not OutgoingEmail.objects.exclude(
+            status=OutgoingEmail.Statuses.SENT
+        ).exists()
+
+    def test_06_purge_processed(self, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'command'
+        settings.EMAIL_OUTBOX_RETENTION_DAYS = 7
+        enqueue_emails(4)
+        emails = list(OutgoingEmail.objects.order_by('pk'))
+        for email, status in zip(emails, (
+            OutgoingEmail.Statuses.SENT,
+            OutgoingEmail.Statuses.DEAD,
+            OutgoingEmail.Statuses.PENDING,
+            OutgoingEmail.Statuses.SENT,
+        )):
+            email.status = status
+        OutgoingEmail.objects.bulk_update(emails, ('status',))
+        OutgoingEmail.objects.filter(pk__in=[
+            email.pk for email in emails[:3]
+        ]).update(created=timezone.now() - timedelta(days=8))
+
+        out = StringIO()
+        call_command('send_outbox', '--purge', stdout=out)
+
+        assert 'Удалено писем: 2.' in out.getvalue()
+        assert list(
+            OutgoingEmail.objects.order_by('pk').values_list('pk', flat=True)
+        ) == [emails[2].pk, emails[3].pk], (
+            'Удаляются только старые отправленные и недоставленные письма.'
+        )
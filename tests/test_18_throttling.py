@@ -0,0 +1,147 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.v1.throttling import (CacheBucketStore, LocalBucketStore,
+                               parse_rate)
+
+URL_SIGNUP = '/api/v1/auth/signup/'
+URL_TOKEN = '/api/v1/auth/token/'
+
+
+def signup_data(idx, **fields):
+    return {
+        'email': f'throttle{idx}@yamdb.fake',
+        'username': f'throttle{idx}',
+        **fields,
+    }
+
+
+@pytest.fixture
+def rates(settings):
+    settings.AUTH_THROTTLE_RATES = {}
+    return settings.AUTH_THROTTLE_RATES
+
+
+def assert_throttled(response):
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(response['Retry-After']) > 0, (
+        'Ответ 429 должен содержать заголовок Retry-After.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Throttling:
+
+    def test_01_signup_per_ip(self, client, rates):
+        rates['signup_ip'] = '2/min'
+        for idx in range(2):
+            response = client.post(URL_SIGNUP, data=signup_data(idx))
+            assert response.status_code == HTTPStatus.OK
+
+        assert_throttled(client.post(URL_SIGNUP, data=signup_data(2)))
+        response = client.post(
+            URL_SIGNUP, data=signup_data(3), REMOTE_ADDR='10.0.0.2',
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Ограничение по IP не должно затрагивать другие адреса.'
+        )
+
+    def test_07_forwarded_for_not_trusted(self, client, rates):
+        rates['signup_ip'] = '2/min'
+        for idx in range(2):
+            response = client.post(
+                URL_SIGNUP, data=signup_data(idx),
+                HTTP_X_FORWARDED_FOR=f'10.1.0.{idx}',
+            )
+            assert response.status_code == HTTPStatus.OK
+        assert_throttled(client.post(
+            URL_SIGNUP, data=signup_data(2),
+            HTTP_X_FORWARDED_FOR='10.1.0.2',
+        ))
+
+    @pytest.mark.parametrize('field', ('username', 'email'))
+    def test_02_signup_per_field(self, client, rates, field):
+        rates[f'signup_{field}'] = '1/min'
+        data = signup_data(1)
+        response = client.post(URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+
+        other = signup_data(2, **{field: data[field].upper()})
+        assert_throttled(
+            client.post(URL_SIGNUP, data=other, REMOTE_ADDR='10.0.0.2')
+        )
+
+    def test_03_token_rejected_before_db_and_crypto(
+            self, client, rates, monkeypatch
+    ):
+        rates['token_username'] = '2/min'
+        client.post(URL_SIGNUP, data=signup_data(1))
+        checked = []
+        monkeypatch.setattr(
+            'api.v1.views.default_token_generator.check_token',
+            lambda user, token: checked.append(token),
+        )
+        data = {
+            'username': 'throttle1',
+            'confirmation_code': 'wrong',
+        }
+        for _ in range(2):
+            response = client.post(URL_TOKEN, data=data)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                URL_TOKEN,
+                data=data,
+                HTTP_AUTHORIZATION='Bearer invalid',
+            )
+        assert_throttled(response)
+        assert len(checked) == 2, (
+            'Отклоненный запрос не должен проверять код подтверждения.'
+        )
+        assert not context.captured_queries, (
+            'Отклоненный запрос не должен обращаться к базе данных.'
+        )
+
+    def test_04_unconfigured_scope(self, client, rates):
+        for idx in range(10):
+            response = client.post(URL_SIGNUP, data=signup_data(idx))
+            assert response.status_code == HTTPStatus.OK
+
+    @pytest.mark.parametrize('url', (URL_SIGNUP, URL_TOKEN))
+    @pytest.mark.parametrize('body', ([], ['username'], 'username', 1))
+    def test_05_non_object_body(self, client, rates, url, body):
+        rates.update({
+            'signup_username': '1/min', 'signup_email': '1/min',
+            'token_username': '1/min',
+        })
+        response = client.post(url, data=body,
+                               content_type='application/json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Тело запроса не объектом должно возвращать 400.'
+        )
+
+    def test_06_non_string_field(self, client, rates):
+        rates['signup_username'] = '1/min'
+        response = client.post(URL_SIGNUP, data={'username': ['a']},
+                               content_type='application/json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize('store_class', (LocalBucketStore, CacheBucketStore))
+def test_bucket_refill(store_class):
+    store = store_class()
+    capacity, refill_rate = parse_rate('2/m')
+
+    assert store.consume('key', capacity, refill_rate, now=0) == 0
+    assert store.consume('key', capacity, refill_rate, now=0) == 0
+    assert store.consume('key', capacity, refill_rate, now=0) == 30
+    assert store.consume('other', capacity, refill_rate, now=0) == 0
+    wait = store.consume('key', capacity, refill_rate, now=20)
+    assert wait == pytest.approx(10)
+    assert store.consume('key', capacity, refill_rate, now=31) == 0
+    assert store.consume('key', capacity, refill_rate, now=31) > 0
+    assert store.consume('key', capacity, refill_rate, now=1000) == 0
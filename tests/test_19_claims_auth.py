@@ -0,0 +1,146 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import Category, Review, Title
+
+URL_TOKEN = '/api/v1/auth/token/'
+URL_REVIEWS = '/api/v1/titles/{title_id}/reviews/'
+URL_COMMENTS = '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+USERS_QUERY = re.compile(r'FROM "users_customuser"( WHERE|$)')
+
+
+def get_token(user):
+    response = APIClient().post(URL_TOKEN, data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == HTTPStatus.OK
+    return response.json()['token']
+
+
+def client_for(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.fixture
+def title():
+    return Title.objects.create(
+        name='Произведение',
+        year=2000,
+        category=Category.objects.create(name='Фильм', slug='movie'),
+    )
+
+
+@pytest.fixture
+def review(title, admin):
+    return Review.objects.create(
+        title=title, author=admin, text='Отзыв', score=5,
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ClaimsAuthentication:
+
+    def test_01_token_claims(self, moderator):
+        token = AccessToken(get_token(moderator))
+
+        assert token['username'] == moderator.username
+        assert token['role'] == 'moderator'
+        assert token['is_superuser'] is False
+
+    def test_02_no_user_queries(self, user, title, review):
+        client = client_for(get_token(user))
+        for url in (
+            URL_REVIEWS.format(title_id=title.id),
+            URL_COMMENTS.format(title_id=title.id, review_id=review.id),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            user_queries = [
+                query['sql'] for query in context.captured_queries
+                if USERS_QUERY.search(query['sql'])
+            ]
+            assert not user_queries, (
+                f'GET-запрос к `{url}` с токеном не должен загружать '
+                f'пользователя из базы: {user_queries}'
+            )
+
+    def test_03_write_with_claims_user(self, user, title):
+        client = client_for(get_token(user))
+        response = client.post(
+            URL_REVIEWS.format(title_id=title.id),
+            data={'text': 'Отзыв', 'score': 7},
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert Review.objects.get(title=title).author == user
+
+    def test_04_role_change_revokes_token(self, admin_client, user, review):
+        token = get_token(user)
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+        assert client_for(token).delete(url).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'},
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        response = client_for(token).get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'После смены роли выданный ранее токен должен отзываться.'
+        )
+        user.refresh_from_db()
+        response = client_for(get_token(user)).delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Новый токен должен содержать новую роль.'
+        )
+
+    def test_05_profile_change_keeps_token(self, user):
+        token = get_token(user)
+        client = client_for(token)
+
+        response = client.patch('/api/v1/users/me/', data={'bio': 'Новое'})
+
+        assert response.status_code == HTTPStatus.OK
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+
+    def test_06_deleted_user(self, admin_client, user):
+        client = client_for(get_token(user))
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+
+        response = client.get('/api/v1/users/me/')
+
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_07_rename_revokes_token(self, admin_client, user, title):
+        token = get_token(user)
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'},
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        response = client_for(token).post(
+            URL_REVIEWS.format(title_id=title.id),
+            data={'text': 'Отзыв', 'score': 7},
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'После смены имени выданный ранее токен должен отзываться.'
+        )
+        user.refresh_from_db()
+        response = client_for(get_token(user)).post(
+            URL_REVIEWS.format(title_id=title.id),
+            data={'text': 'Отзыв', 'score': 7},
+        )
+        assert response.json()['author'] == 'renamed'
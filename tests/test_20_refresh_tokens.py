@@ -0,0 +1,119 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.v1.checks import check_auth_caches
+
+URL_TOKEN = '/api/v1/auth/token/'
+URL_REFRESH = '/api/v1/auth/token/refresh/'
+URL_REVOKE = '/api/v1/auth/token/revoke/'
+URL_ME = '/api/v1/users/me/'
+
+
+def get_tokens(user):
+    response = APIClient().post(URL_TOKEN, data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == HTTPStatus.OK
+    return response.json()
+
+
+def get_me(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client.get(URL_ME)
+
+
+def refresh(token):
+    return APIClient().post(URL_REFRESH, data={'refresh': token})
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20RefreshTokens:
+
+    def test_01_token_pair(self, user):
+        tokens = get_tokens(user)
+
+        assert set(tokens) == {'token', 'refresh'}
+        lifetime = AccessToken(tokens['token'])['exp'] - time.time()
+        assert lifetime <= (
+            settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds()
+        ), 'Токен доступа должен жить недолго.'
+        assert get_me(tokens['token']).status_code == HTTPStatus.OK
+
+    def test_02_rotation(self, user):
+        tokens = get_tokens(user)
+
+        response = refresh(tokens['refresh'])
+        assert response.status_code == HTTPStatus.OK
+        new_tokens = response.json()
+        assert new_tokens['refresh'] != tokens['refresh']
+        assert get_me(new_tokens['token']).status_code == HTTPStatus.OK
+
+        assert refresh(tokens['refresh']).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Использованный refresh-токен должен отзываться.'
+        assert refresh(new_tokens['refresh']).status_code == HTTPStatus.OK
+
+    def test_03_refresh_picks_up_new_role(self, admin_client, user):
+        tokens = get_tokens(user)
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'},
+        )
+
+        assert get_me(tokens['token']).status_code == HTTPStatus.UNAUTHORIZED
+        response = refresh(tokens['refresh'])
+        assert response.status_code == HTTPStatus.OK
+        token = response.json()['token']
+        assert AccessToken(token)['role'] == 'moderator'
+        assert get_me(token).status_code == HTTPStatus.OK
+
+    def test_04_revoke(self, user):
+        tokens = get_tokens(user)
+
+        response = APIClient().post(URL_REVOKE, data={
+            'refresh': tokens['refresh'],
+            'token': tokens['token'],
+        })
+
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert refresh(tokens['refresh']).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert get_me(tokens['token']).status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_05_invalid_tokens(self, admin_client, user):
+        tokens = get_tokens(user)
+
+        assert refresh('invalid').status_code == HTTPStatus.UNAUTHORIZED
+        assert refresh(tokens['token']).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Токен доступа нельзя использовать как refresh-токен.'
+        response = APIClient().post(URL_REFRESH)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert refresh(tokens['refresh']).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+
+LOCMEM = 'django.core.cache.backends.locmem.LocMemCache'
+DATABASE_CACHE = 'django.core.cache.backends.db.DatabaseCache'
+
+
+@pytest.mark.parametrize('backend, debug, expected', (
+    (LOCMEM, False, {'api.E001', 'api.W001'}),
+    (LOCMEM, True, set()),
+    (DATABASE_CACHE, False, set()),
+))
+def test_auth_cache_check(settings, backend, debug, expected):
+    settings.DEBUG = debug
+    settings.CACHES = {'default': {'BACKEND': backend, 'LOCATION': 'auth'}}
+    assert {message.id for message in check_auth_caches(None)} == expected
@@ -0,0 +1,192 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+URL_TITLES = '/api/v1/titles/bulk/'
+URL_GENRES = '/api/v1/genres/bulk/'
+URL_CATEGORIES = '/api/v1/categories/bulk/'
+
+
+@pytest.fixture
+def catalog():
+    Category.objects.create(name='Фильм', slug='movie')
+    Genre.objects.create(name='Драма', slug='drama')
+    Genre.objects.create(name='Комедия', slug='comedy')
+
+
+def title_items(count, **fields):
+    return [
+        {
+            'name': f'Произведение {idx}',
+            'year': 2000,
+            'category': 'movie',
+            'genre': ['drama', 'comedy'],
+            **fields,
+        }
+        for idx in range(count)
+    ]
+
+
+def statuses(response):
+    return [item['status'] for item in response.json()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Bulk:
+
+    @pytest.mark.parametrize('url', (URL_TITLES, URL_GENRES, URL_CATEGORIES))
+    def test_01_admin_only(self, client, user_client, url):
+        data = [{'name': 'Имя', 'slug': 'slug'}]
+        response = client.post(
+            url, data=data, content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.post(url, data=data, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    @pytest.mark.parametrize('data', ({}, [], 'text'))
+    def test_02_payload_must_be_list(self, admin_client, data):
+        response = admin_client.post(URL_GENRES, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_max_items(self, admin_client, settings):
+        settings.BULK_MAX_ITEMS = 2
+        response = admin_client.post(
+            URL_GENRES,
+            data=[{'name': str(idx), 'slug': f's{idx}'} for idx in range(3)],
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert not Genre.objects.exists()
+
+    def test_04_create_with_item_errors(self, admin_client):
+        response = admin_client.post(URL_GENRES, data=[
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Без slug'},
+            {'name': 'Повтор', 'slug': 'drama'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ], format='json')
+
+        assert response.status_code == HTTPStatus.OK
+        assert statuses(response) == [201, 400, 400, 201]
+        result = response.json()
+        assert 'slug' in result[1]['errors']
+        assert 'slug' in result[2]['errors']
+        assert result[3]['data'] == {'name': 'Комедия', 'slug': 'comedy'}
+        assert set(Genre.objects.values_list('slug', flat=True)) == {
+            'drama', 'comedy',
+        }
+
+    def test_05_create_titles(self, admin_client, catalog):
+        items = title_items(2)
+        items.insert(1, {
+            'name': 'Ошибка', 'year': 2000, 'category': 'unknown',
+            'genre': ['drama', 'unknown'],
+        })
+
+        response = admin_client.post(URL_TITLES, data=items, format='json')
+
+        assert statuses(response) == [201, 400, 201]
+        errors = response.json()[1]['errors']
+        assert set(errors) == {'category', 'genre'}
+        data = response.json()[2]['data']
+        title = Title.objects.get(pk=data['id'])
+        assert title.name == 'Произведение 1'
+        assert title.category.slug == 'movie'
+        assert set(title.genre.values_list('slug', flat=True)) == {
+            'drama', 'comedy',
+        }
+        assert data['genre'] == ['drama', 'comedy']
+
+    def test_06_create_queries_do_not_grow(self, admin_client, catalog):
+        counts = []
+        for count in (2, 20):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(
+                    URL_TITLES, data=title_items(count), format='json',
+                )
+            assert statuses(response) == [201] * count
+            counts.append(len(context.captured_queries))
+
+        assert counts[0] == counts[1], (
+            'Число SQL-запросов массового создания не должно зависеть '
+            f'от количества объектов: {counts}.'
+        )
+        assert Title.genre.through.objects.count() == 44
+
+    def test_07_update_titles(self, admin_client, catalog):
+        created = admin_client.post(
+            URL_TITLES, data=title_items(2), format='json',
+        ).json()
+        first, second = (item['data']['id'] for item in created)
+
+        response = admin_client.patch(URL_TITLES, data=[
+            {'id': first, 'name': 'Новое название', 'genre': ['comedy']},
+            {'id': second, 'year': 3000},
+            {'id': 100500, 'name': 'Нет такого'},
+            {'name': 'Без id'},
+            {'id': first, 'name': 'Повтор'},
+        ], format='json')
+
+        assert statuses(response) == [200, 400, 404, 400, 400]
+        title = Title.objects.get(pk=first)
+        assert title.name == 'Новое название'
+        assert list(title.genre.values_list('slug', flat=True)) == ['comedy']
+        assert response.json()[0]['data']['genre'] == ['comedy']
+        assert Title.objects.get(pk=second).year == 2000
+
+    def test_08_update_by_slug(self, admin_client, catalog):
+        response = admin_client.patch(URL_CATEGORIES, data=[
+            {'slug': 'movie', 'name': 'Кино'},
+        ], format='json')
+
+        assert statuses(response) == [200]
+        assert Category.objects.get(slug='movie').name == 'Кино'
+
+    def test_09_delete(self, admin_client, catalog):
+        response = admin_client.delete(
+            URL_GENRES, data=['drama', 'unknown'], format='json',
+        )
+
+        assert statuses(response) == [204, 404]
+        assert list(Genre.objects.values_list('slug', flat=True)) == [
+            'comedy',
+        ]
+
+    def test_10_cache_and_search_updated(self, client, admin_client, catalog):
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+
+        admin_client.post(
+            URL_TITLES,
+            data=title_items(1, name='Побег из Шоушенка'),
+            format='json',
+        )
+
+        assert client.get('/api/v1/titles/').json()['count'] == 1, (
+            'Массовое создание должно сбрасывать кеш списка произведений.'
+        )
+        response = client.get('/api/v1/search/', {'q': 'шоушенк'})
+        assert response.json()['count'] == 1, (
+            'Созданные массово произведения должны попадать в поиск.'
+        )
+
+    @pytest.mark.parametrize(
+        'url', ('/api/v1/genres/', '/api/v1/categories/'),
+    )
+    def test_11_bulk_slug_reserved(self, admin_client, url):
+        data = {'name': 'Массовые', 'slug': 'bulk'}
+        response = admin_client.post(url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Slug bulk совпадает с адресом массовых операций '
+            'и должен быть запрещен.'
+        )
+        assert 'slug' in response.json()
+
+        response = admin_client.post(url + 'bulk/', data=[data], format='json')
+        [item] = response.json()
+        assert item['status'] == HTTPStatus.BAD_REQUEST
+        assert not Genre.objects.exists() and not Category.objects.exists()
@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.v1.serializers import TitleCreateSerializer
+from reviews.models import Category, Genre
+
+
+@pytest.fixture
+def genres():
+    Category.objects.create(name='Фильм', slug='movie')
+    return [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(5)
+    ]
+
+
+def title_data(**fields):
+    return {
+        'name': 'Произведение',
+        'year': 2000,
+        'category': 'movie',
+        'genre': [f'genre-{idx}' for idx in range(5)],
+        **fields,
+    }
+
+
+def genre_queries(context):
+    return [
+        query for query in context.captured_queries
+        if 'reviews_genre' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22SlugFields:
+
+    def test_genres_resolved_with_one_query(self, genres):
+        serializer = TitleCreateSerializer(data=title_data())
+        with CaptureQueriesContext(connection) as context:
+            assert serializer.is_valid(), serializer.errors
+        assert len(genre_queries(context)) == 1, (
+            'Список жанров должен разрешаться одним запросом slug__in.'
+        )
+        assert serializer.validated_data['genre'] == genres
+
+    def test_genres_keep_order_and_duplicates(self, genres):
+        slugs = ['genre-3', 'genre-0', 'genre-3']
+        serializer = TitleCreateSerializer(data=title_data(genre=slugs))
+        assert serializer.is_valid(), serializer.errors
+        assert serializer.validated_data['genre'] == [
+            genres[3], genres[0], genres[3],
+        ]
+
+    def test_missing_slugs_reported_together(self, genres):
+        serializer = TitleCreateSerializer(
+            data=title_data(genre=['genre-0', 'nope', 'absent', 'nope']),
+        )
+        assert not serializer.is_valid()
+        message = str(serializer.errors['genre'][0])
+        assert 'nope' in message and 'absent' in message
+        assert message.count('nope') == 1
+
+    @pytest.mark.parametrize('genre', ['genre-0', 5, [{'slug': 'x'}]])
+    def test_invalid_genre_payload(self, genres, genre):
+        serializer = TitleCreateSerializer(data=title_data(genre=genre))
+        assert not serializer.is_valid()
+        assert 'genre' in serializer.errors
+
+    def test_missing_category(self, genres):
+        serializer = TitleCreateSerializer(
+            data=title_data(category='nope'),
+        )
+        assert not serializer.is_valid()
+        assert 'nope' in str(serializer.errors['category'][0])
+
+    def test_shared_cache_between_serializers(self, genres):
+        context = {'slug_cache': {}}
+        first = TitleCreateSerializer(data=title_data(), context=context)
+        assert first.is_valid(), first.errors
+        second = TitleCreateSerializer(
+            data=title_data(genre=['genre-1', 'nope']), context=context,
+        )
+        with CaptureQueriesContext(connection) as queries:
+            assert not second.is_valid()
+            third = TitleCreateSerializer(
+                data=title_data(genre=['genre-2', 'nope']), context=context,
+            )
+            assert not third.is_valid()
+        assert len(genre_queries(queries)) == 1, (
+            'Известные и отсутствующие slug должны браться из slug_cache.'
+        )
+        assert not [
+            query for query in queries.captured_queries
+            if 'reviews_category' in query['sql']
+        ]
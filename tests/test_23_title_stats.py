@@ -0,0 +1,119 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import (create_comments, create_single_comment,
+                         create_single_review)
+
+STATS_URL = '/api/v1/titles/{title_id}/stats/'
+REVIEW_URL = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+
+
+def expected_histogram(**counts):
+    histogram = {str(score): 0 for score in range(1, 11)}
+    histogram.update(counts)
+    return histogram
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TitleStats:
+
+    @pytest.fixture
+    def stats_setup(self, admin_client, admin, user, user_client, moderator,
+                    moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        return titles[0]['id'], reviews, comments
+
+    def test_stats_response(self, client, stats_setup):
+        title_id, _, _ = stats_setup
+        response = client.get(STATS_URL.format(title_id=title_id))
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'id': title_id,
+            'histogram': expected_histogram(**{'5': 3}),
+            'review_count': 3,
+            'comment_count': 3,
+            'mean': 5,
+            'median': 5,
+        }
+
+    def test_stats_empty_title(self, client, stats_setup):
+        title = Title.objects.exclude(pk=stats_setup[0]).first()
+        data = client.get(STATS_URL.format(title_id=title.pk)).json()
+        assert data['histogram'] == expected_histogram()
+        assert data['review_count'] == data['comment_count'] == 0
+        assert data['mean'] is None and data['median'] is None
+
+    def test_stats_not_found(self, client):
+        response = client.get(STATS_URL.format(title_id=404))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_stats_follow_changes(self, client, user_client, admin_client,
+                                  stats_setup):
+        title_id, reviews, comments = stats_setup
+        url = STATS_URL.format(title_id=title_id)
+        response = user_client.patch(
+            REVIEW_URL.format(title_id=title_id, review_id=reviews[1]['id']),
+            data={'score': 2},
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = client.get(url).json()
+        assert data['histogram'] == expected_histogram(**{'2': 1, '5': 2})
+        assert data['median'] == 5
+        assert data['mean'] == 4
+
+        create_single_comment(
+            user_client, title_id, reviews[1]['id'], 'еще комментарий',
+        )
+        assert client.get(url).json()['comment_count'] == 4
+
+        # Удаление отзыва удаляет и его комментарии.
+        admin_client.delete(
+            REVIEW_URL.format(title_id=title_id, review_id=reviews[0]['id']),
+        )
+        data = client.get(url).json()
+        assert data['histogram'] == expected_histogram(**{'2': 1, '5': 1})
+        assert data['review_count'] == 2
+        assert data['comment_count'] == 1
+        assert data['median'] == 3.5
+
+    def test_stats_single_query(self, client, stats_setup):
+        url = STATS_URL.format(title_id=stats_setup[0])
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(url).status_code == HTTPStatus.OK
+        assert len(context.captured_queries) == 1, (
+            'Статистика должна читаться одним запросом к произведению.'
+        )
+
+    def test_median_from_histogram(self):
+        title = Title(rating_count=4, score_1=1, score_7=2, score_10=1)
+        assert title.score_median == 7
+        title = Title(rating_count=5, score_1=2, score_3=1, score_9=2)
+        assert title.score_median == 3
+
+    def test_recalculate_restores_stats(self, admin_client, stats_setup):
+        title_id, _, _ = stats_setup
+        Title.objects.filter(pk=title_id).update(
+            score_5=0, score_9=4, comment_count=0,
+        )
+        call_command('recalculate_ratings', stdout=StringIO())
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_5, title.score_9) == (3, 0)
+        assert title.comment_count == 3
+
+    def test_stats_for_new_review(self, client, admin_client, stats_setup):
+        title = Title.objects.exclude(pk=stats_setup[0]).first()
+        create_single_review(admin_client, title.pk, 'обзор', 9)
+        data = client.get(STATS_URL.format(title_id=title.pk)).json()
+        assert data['histogram'] == expected_histogram(**{'9': 1})
+        assert data['median'] == 9
@@ -0,0 +1,205 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ranking.models import RankingEntry
+from ranking.rankings import get_top
+from reviews.models import Category, Genre, Review, Title
+from tests.test_15_query_plans import assert_uses_indexes
+
+User = get_user_model()
+
+URL = '/api/v1/leaderboard/'
+
+
+def add_reviews(title, scores):
+    for score in scores:
+        author = User.objects.create(
+            username=f'author-{title.pk}-{User.objects.count()}',
+            email=f'author{User.objects.count()}@yamdb.fake',
+        )
+        Review.objects.create(
+            title=title,
+            author=author,
+            text='обзор',
+            score=score,
+        )
+
+
+def ids(response):
+    assert response.status_code == HTTPStatus.OK, response.json()
+    return [row['id'] for row in response.json()]
+
+
+@pytest.fixture
+def catalog(settings):
+    settings.LEADERBOARD_MIN_VOTES = 5
+    settings.LEADERBOARD_PRIOR_RATING = 5.5
+    movie = Category.objects.create(name='Фильм', slug='movie')
+    book = Category.objects.create(name='Книга', slug='book')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    single = Title.objects.create(name='Один голос', year=2000,
+                                  category=movie)
+    single.genre.set([drama])
+    popular = Title.objects.create(name='Популярное', year=2000,
+                                   category=book)
+    popular.genre.set([drama, comedy])
+    average = Title.objects.create(name='Среднее', year=1990,
+                                   category=movie)
+    average.genre.set([comedy])
+    unrated = Title.objects.create(name='Без оценок', year=1990,
+                                   category=movie)
+    add_reviews(single, [10])
+    add_reviews(popular, [9] * 5)
+    add_reviews(average, [6, 7])
+    return {
+        'single': single,
+        'popular': popular,
+        'average': average,
+        'unrated': unrated,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Leaderboard:
+
+    def test_overall_weighted_and_plain(self, client, catalog):
+        response = client.get(URL)
+        assert ids(response) == [
+            catalog['popular'].pk,
+            catalog['single'].pk,
+            catalog['average'].pk,
+        ], 'Байесовский рейтинг должен ставить выше много оценок.'
+        first = response.json()[0]
+        assert first == {
+            'position': 1,
+            'id': catalog['popular'].pk,
+            'name': 'Популярное',
+            'year': 2000,
+            'rating': 9,
+            'weighted_rating': pytest.approx(7.25),
+            'review_count': 5,
+        }
+        assert ids(client.get(URL, {'order': 'rating'})) == [
+            catalog['single'].pk,
+            catalog['popular'].pk,
+            catalog['average'].pk,
+        ]
+
+    def test_boards(self, client, catalog):
+        assert ids(client.get(f'{URL}category/movie/')) == [
+            catalog['single'].pk,
+            catalog['average'].pk,
+        ]
+        assert ids(client.get(f'{URL}genre/comedy/')) == [
+            catalog['popular'].pk,
+            catalog['average'].pk,
+        ]
+        assert ids(client.get(f'{URL}year/1990/')) == [
+            catalog['average'].pk,
+        ]
+        assert ids(client.get(f'{URL}year/1800/')) == []
+
+    def test_pages(self, client, catalog):
+        response = client.get(URL, {'offset': 1, 'limit': 1})
+        assert ids(response) == [catalog['single'].pk]
+        assert response.json()[0]['position'] == 2
+
+    @pytest.mark.parametrize('params', [
+        {'order': 'name'},
+        {'limit': 0},
+        {'limit': 1000},
+        {'offset': -1},
+        {'offset': 'x'},
+    ])
+    def test_invalid_params(self, client, catalog, params):
+        response = client.get(URL, params)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_unknown_board_key(self, client, catalog):
+        response = client.get(f'{URL}genre/unknown/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_follows_review_changes(self, client, catalog):
+        review = catalog['single'].reviews.get()
+        review.score = 1
+        review.save()
+        assert ids(client.get(URL, {'order': 'rating'}))[-1] == (
+            catalog['single'].pk
+        )
+        review.delete()
+        assert catalog['single'].pk not in ids(client.get(URL))
+        add_reviews(catalog['unrated'], [10] * 10)
+        assert ids(client.get(f'{URL}category/movie/'))[0] == (
+            catalog['unrated'].pk
+        )
+
+    def test_text_edit_skips_ranking(self, catalog):
+        review = catalog['single'].reviews.get()
+        review.text = 'Новый текст'
+        with CaptureQueriesContext(connection) as context:
+            review.save()
+        assert not [
+            query for query in context.captured_queries
+            if 'ranking_rankingentry' in query['sql']
+        ], 'Правка текста отзыва не должна обновлять рейтинговые таблицы.'
+
+    def test_review_moved_to_other_title(self, client, catalog):
+        review = catalog['single'].reviews.get()
+        review.title = catalog['unrated']
+        review.save()
+        top = ids(client.get(URL))
+        assert catalog['unrated'].pk in top
+        assert catalog['single'].pk not in top
+
+    def test_follows_title_changes(self, client, catalog):
+        title = Title.objects.get(pk=catalog['single'].pk)
+        title.category = Category.objects.get(slug='book')
+        title.year = 1990
+        title.save()
+        title.genre.remove(Genre.objects.get(slug='drama'))
+        assert title.pk in ids(client.get(f'{URL}category/book/'))
+        assert title.pk not in ids(client.get(f'{URL}category/movie/'))
+        assert title.pk in ids(client.get(f'{URL}year/1990/'))
+        assert title.pk not in ids(client.get(f'{URL}genre/drama/'))
+
+        Genre.objects.get(slug='comedy').titles_of_genre.clear()
+        assert ids(client.get(f'{URL}genre/comedy/')) == []
+        Category.objects.get(slug='book').delete()
+        assert not RankingEntry.objects.filter(
+            board=RankingEntry.Boards.CATEGORY,
+            key__in=[title.category_id],
+        ).exists()
+
+    def test_title_deleted(self, client, catalog):
+        catalog['popular'].delete()
+        assert catalog['popular'].pk not in ids(client.get(URL))
+
+    def test_single_query(self, client, catalog):
+        with CaptureQueriesContext(connection) as context:
+            client.get(URL)
+        assert len(context.captured_queries) == 1
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='Разбор плана выполнения написан для SQLite.',
+    )
+    @pytest.mark.parametrize('ordering', ['weighted', 'rating'])
+    def test_top_uses_index(self, catalog, ordering):
+        assert_uses_indexes(
+            get_top(RankingEntry.Boards.ALL, 0, ordering, 0, 10),
+            f'таблицы лидеров ({ordering})',
+        )
+
+    def test_rebuild(self, client, catalog):
+        expected = client.get(URL).json()
+        RankingEntry.objects.all().delete()
+        call_command('rebuild_rankings', stdout=StringIO())
+        assert client.get(URL).json() == expected
+        assert RankingEntry.objects.count() == 4 * 3 + 4
@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Review, Title
+
+URL_TITLES = '/api/v1/titles/'
+
+
+@pytest.fixture
+def catalog(admin):
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    title = Title.objects.create(name='Произведение', year=2000,
+                                 category=category)
+    title.genre.set([genre])
+    Review.objects.create(title=title, author=admin, text='обзор', score=7)
+    return title
+
+
+def get_with_queries(client, url, params):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    return response, [query['sql'] for query in context.captured_queries]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SparseFields:
+
+    def test_fields_prune_output_and_queries(self, client, catalog):
+        response, queries = get_with_queries(
+            client, URL_TITLES, {'fields': 'id,name'},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == [
+            {'id': catalog.pk, 'name': 'Произведение'},
+        ]
+        assert not any('reviews_genre' in sql for sql in queries), (
+            'Жанры не запрошены - prefetch_related не нужен.'
+        )
+        assert not any('reviews_category' in sql for sql in queries), (
+            'Категория не запрошена - select_related не нужен.'
+        )
+
+    def test_omit(self, client, catalog):
+        response, queries = get_with_queries(
+            client, f'{URL_TITLES}{catalog.pk}/', {'omit': 'genre'},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {
+            'id', 'name', 'description', 'year', 'category', 'rating',
+        }
+        assert response.json()['category'] == {
+            'name': 'Фильм', 'slug': 'movie',
+        }, 'Вложенные сериализаторы выводятся целиком.'
+        assert not any('reviews_genre' in sql for sql in queries)
+
+    def test_fields_and_omit_together(self, client, catalog):
+        response = client.get(
+            URL_TITLES,
+            {'fields': 'id,name,genre', 'omit': 'name'},
+        )
+        assert response.json()['results'][0] == {
+            'id': catalog.pk,
+            'genre': [{'name': 'Драма', 'slug': 'drama'}],
+        }
+
+    @pytest.mark.parametrize('param', ['fields', 'omit'])
+    def test_unknown_field(self, client, catalog, param):
+        response = client.get(URL_TITLES, {param: 'id,secret'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'secret' in response.json()[param]
+
+    def test_reviews(self, client, catalog):
+        url = f'{URL_TITLES}{catalog.pk}/reviews/'
+        response, queries = get_with_queries(
+            client, url, {'fields': 'id,score'},
+        )
+        assert response.json()['results'] == [
+            {'id': catalog.reviews.get().pk, 'score': 7},
+        ]
+        assert not any('users_customuser' in sql for sql in queries)
+        response = client.get(url, {'fields': 'author'})
+        assert response.json()['results'] == [{'author': 'TestAdmin'}]
+
+    def test_users_me(self, admin_client, admin):
+        response = admin_client.get(
+            '/api/v1/users/me/', {'fields': 'username,role'},
+        )
+        assert response.json() == {
+            'username': admin.username,
+            'role': admin.role,
+        }
+
+    def test_write_ignores_fields(self, admin_client, catalog):
+        response = admin_client.post(
+            f'{URL_TITLES}?fields=id',
+            data={
+                'name': 'Новое',
+                'year': 2001,
+                'category': 'movie',
+                'genre': ['drama'],
+            },
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert {'name', 'year', 'category', 'genre'} <= set(response.json())
+
+    def test_cached_responses_per_fields(self, client, catalog):
+        full = client.get(URL_TITLES).json()['results'][0]
+        sparse = client.get(URL_TITLES, {'fields': 'id'}).json()['results']
+        assert sparse == [{'id': catalog.pk}]
+        assert client.get(URL_TITLES).json()['results'][0] == full
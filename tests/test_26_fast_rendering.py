@@ -0,0 +1,98 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.db.models import Prefetch
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.v1 import renderers
+from api.v1.renderers import FastJSONRenderer
+from api.v1.serializers import TitleGetSerializer
+from reviews.models import Category, Comment, Genre, Review, Title
+
+RENDER_DATA = (
+    {'name': 'Произведение', 'rating': None, 'year': 2000},
+    [{'id': 1, 'score': 5.5, 'ok': True}, {'genre': []}],
+    {'text': 'строка и абзац'},
+    {'date': datetime.datetime(2020, 1, 2, 3, 4, 5, 678901,
+                               tzinfo=datetime.timezone.utc)},
+    {'decimal': Decimal('1.50'), 'big': 2 ** 70, 1: 'ключ-число'},
+)
+
+
+@pytest.fixture
+def catalog(admin, user):
+    category = Category.objects.create(name='Фильм', slug='movie')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    first = Title.objects.create(name='Первое', year=2000,
+                                 category=category, description='Текст')
+    first.genre.set([comedy, drama])
+    Title.objects.create(name='Без категории', year=1990)
+    review = Review.objects.create(title=first, author=admin,
+                                   text='обзор', score=7)
+    Review.objects.create(title=first, author=user, text='еще', score=4)
+    Comment.objects.create(review=review, author=user, text='комментарий')
+    return first
+
+
+def make_context(params=None):
+    request = Request(APIRequestFactory().get('/', params or {}))
+    return {'request': request}
+
+
+def assert_same_output(serializer_class, queryset, context):
+    expected = serializer_class(queryset, many=True, context=context).data
+    serializer = serializer_class(context=context)
+    rows = list(serializer.get_values_queryset(queryset))
+    assert serializer.to_values_representation(rows) == expected
+    renderer = JSONRenderer()
+    assert renderer.render(
+        serializer.to_values_representation(rows),
+    ) == renderer.render(expected)
+
+
+class Test26FastRendering:
+
+    @pytest.mark.parametrize('data', RENDER_DATA)
+    def test_renderer_matches_json_renderer(self, data):
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_renderer_indent_and_fallback(self, monkeypatch):
+        data = {'name': 'Произведение'}
+        context = {'indent': 4}
+        assert FastJSONRenderer().render(
+            data, renderer_context=context,
+        ) == JSONRenderer().render(data, renderer_context=context)
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+        assert FastJSONRenderer().render(None) == b''
+
+    @pytest.mark.django_db
+    def test_titles_values_mode(self, catalog):
+        queryset = Title.objects.select_related('category').prefetch_related(
+            Prefetch('genre', queryset=Genre.objects.order_by('pk')),
+        ).order_by('name')
+        assert_same_output(TitleGetSerializer, queryset, make_context())
+
+    @pytest.mark.django_db
+    def test_values_mode_with_sparse_fields(self, catalog):
+        assert_same_output(
+            TitleGetSerializer,
+            Title.objects.order_by('name'),
+            make_context({'fields': 'id,category,rating'}),
+        )
+
+    @pytest.mark.django_db
+    def test_values_mode_queries(self, catalog):
+        serializer = TitleGetSerializer(context=make_context())
+        with CaptureQueriesContext(connection) as context:
+            rows = list(serializer.get_values_queryset(Title.objects.all()))
+            serializer.to_values_representation(rows)
+        assert len(context.captured_queries) == 2, (
+            'Нужны запрос произведений и один запрос жанров.'
+        )
@@ -0,0 +1,90 @@
+import pytest
+from rest_framework.mixins import ListModelMixin
+
+from api.v1.views import TitleViewSet
+from reviews.models import Category, Genre, Review, Title
+
+URL = '/api/v1/titles/'
+
+QUERIES = (
+    {},
+    {'page': 2},
+    {'page': 9},
+    {'year': 1990},
+    {'genre': 'drama'},
+    {'category': 'book', 'genre': 'comedy'},
+    {'name': 'произв'},
+    {'pagination': 'cursor'},
+    {'fields': 'id,name'},
+    {'fields': 'genre,category'},
+    {'omit': 'description', 'pagination': 'cursor'},
+    {'fields': 'rating', 'pagination': 'cursor'},
+)
+
+
+@pytest.fixture
+def catalog(django_user_model):
+    movie = Category.objects.create(name='Фильм', slug='movie')
+    book = Category.objects.create(name='Книга', slug='book')
+    genres = [
+        Genre.objects.create(name=name, slug=slug)
+        for name, slug in (
+            ('Драма', 'drama'),
+            ('Комедия', 'comedy'),
+            ('Ужасы "в кавычках"', 'horror'),
+        )
+    ]
+    author = django_user_model.objects.create(
+        username='author', email='author@yamdb.fake',
+    )
+    for idx in range(12):
+        title = Title.objects.create(
+            name=f'Произведение {idx % 7} «{idx}»',
+            year=1990 + idx % 3 * 5,
+            category=(movie, book, None)[idx % 3],
+            description='Описание\nс переводом строки' if idx % 2 else '',
+        )
+        title.genre.set(genres[idx % 3:] if idx % 4 else [])
+        if idx % 5:
+            Review.objects.create(
+                title=title, author=author, text='обзор', score=1 + idx % 10,
+            )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27TitleValuesList:
+
+    @pytest.mark.parametrize('params', QUERIES)
+    def test_bytes_identical(self, admin_client, catalog, monkeypatch,
+                             params):
+        response = admin_client.get(URL, params)
+        monkeypatch.setattr(
+            TitleViewSet,
+            'list_from_values',
+            ListModelMixin.list,
+        )
+        expected = admin_client.get(URL, params)
+        assert response.status_code == expected.status_code
+        assert response.content == expected.content, (
+            'Список произведений через values() должен совпадать '
+            'с ответом сериализатора байт в байт.'
+        )
+
+    def test_cursor_pages_identical(self, admin_client, catalog,
+                                    monkeypatch):
+        pages = []
+        url = f'{URL}?pagination=cursor&fields=id'
+        while url:
+            data = admin_client.get(url).json()
+            pages.append(data)
+            url = data['next']
+        monkeypatch.setattr(
+            TitleViewSet,
+            'list_from_values',
+            ListModelMixin.list,
+        )
+        url = f'{URL}?pagination=cursor&fields=id'
+        for page in pages:
+            assert admin_client.get(url).json() == page
+            url = page['next']
+        assert sum(len(page['results']) for page in pages) == 12
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+URL_TITLES = '/api/v1/titles/'
+URL_GENRES = '/api/v1/genres/'
+
+
+@pytest.fixture
+def titles():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    for idx in range(7):
+        Title.objects.create(name=f'Произведение {idx}', year=2000,
+                             category=category)
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre{idx}')
+
+
+@pytest.fixture
+def policies(settings):
+    def apply(**overrides):
+        settings.PAGINATION_POLICIES = {
+            'default': {'page_size': 5, 'max_page_size': 100,
+                        'count': 'exact'},
+            **overrides,
+        }
+    return apply
+
+
+def count_queries(captured):
+    return [
+        query for query in captured.captured_queries
+        if 'COUNT(' in query['sql'].upper()
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28PaginationPolicy:
+
+    def test_policy_page_size(self, admin_client, titles, policies):
+        policies(titles={'page_size': 3})
+        data = admin_client.get(URL_TITLES).json()
+        assert len(data['results']) == 3
+        assert data['count'] == 7
+        assert len(admin_client.get(URL_GENRES).json()['results']) == 5, (
+            'Политика titles не должна влиять на другие маршруты.'
+        )
+
+    def test_page_size_param_capped(self, admin_client, titles, policies):
+        policies(catalog={'max_page_size': 4})
+        response = admin_client.get(URL_TITLES, {'page_size': 6})
+        assert len(response.json()['results']) == 6
+        response = admin_client.get(URL_GENRES, {'page_size': 6})
+        assert len(response.json()['results']) == 4
+        response = admin_client.get(URL_GENRES, {'page_size': 'x'})
+        assert len(response.json()['results']) == 5
+
+    def test_page_size_in_cursor_mode(self, admin_client, titles,
+                                      policies):
+        policies(titles={'max_page_size': 4})
+        data = admin_client.get(
+            URL_TITLES, {'pagination': 'cursor', 'page_size': 10},
+        ).json()
+        assert len(data['results']) == 4
+        assert 'page_size=10' in data['next']
+
+    def test_without_count(self, admin_client, titles, policies):
+        policies(titles={'count': 'none', 'page_size': 3})
+        with CaptureQueriesContext(connection) as captured:
+            data = admin_client.get(URL_TITLES).json()
+        assert not count_queries(captured), 'COUNT(*) не должен выполняться.'
+        assert data['count'] is None
+        assert len(data['results']) == 3
+        assert data['previous'] is None
+        data = admin_client.get(data['next']).json()
+        assert [row['name'] for row in data['results']] == [
+            'Произведение 3', 'Произведение 4', 'Произведение 5',
+        ]
+        assert data['previous'].endswith(URL_TITLES)
+        data = admin_client.get(data['next']).json()
+        assert len(data['results']) == 1
+        assert data['next'] is None
+
+    @pytest.mark.parametrize('page', [0, 'x', 10])
+    def test_without_count_invalid_page(self, admin_client, titles,
+                                        policies, page):
+        policies(titles={'count': 'none'})
+        response = admin_client.get(URL_TITLES, {'page': page})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_without_count_empty_list(self, admin_client, policies):
+        policies(default={'page_size': 5, 'max_page_size': 100,
+                          'count': 'none'})
+        data = admin_client.get(URL_TITLES).json()
+        assert data == {
+            'count': None, 'next': None, 'previous': None, 'results': [],
+        }
@@ -0,0 +1,150 @@
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Comment, Review, Title
+from tests.utils import create_comments
+
+URL_TITLES = '/api/v1/titles/'
+URL_REVIEWS = '/api/v1/titles/{title_id}/reviews/'
+URL_COMMENTS = '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+
+
+@pytest.fixture
+def titles():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000, category=category)
+        for idx in range(7)
+    )
+    return category
+
+
+@pytest.fixture
+def comments_setup(admin_client, admin, user, user_client, moderator,
+                   moderator_client):
+    author_map = {
+        admin: admin_client,
+        user: user_client,
+        moderator: moderator_client,
+    }
+    comments, reviews, titles = create_comments(admin_client, author_map)
+    return titles[0]['id'], reviews[0]['id']
+
+
+def count_star_queries(captured):
+    return [
+        query for query in captured.captured_queries
+        if 'COUNT(*)' in query['sql'].upper()
+    ]
+
+
+def get_with_queries(client, url):
+    with CaptureQueriesContext(connection) as captured:
+        data = client.get(url).json()
+    return data, count_star_queries(captured)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Counting:
+
+    def test_auto_exact_for_small_result(self, admin_client, titles,
+                                         settings):
+        settings.COUNT_EXACT_THRESHOLD = 100
+        data, queries = get_with_queries(admin_client, URL_TITLES)
+        assert data['count'] == 7
+        Title.objects.filter(name='Произведение 0').delete()
+        data, queries = get_with_queries(admin_client, URL_TITLES)
+        assert data['count'] == 6
+        assert len(queries) == 1
+
+    def test_auto_cached_for_large_result(self, admin_client, titles,
+                                          settings):
+        settings.COUNT_EXACT_THRESHOLD = 3
+        data, _ = get_with_queries(admin_client, URL_TITLES)
+        assert data['count'] == 7
+        data, queries = get_with_queries(
+            admin_client,
+            URL_TITLES + '?page=2&page_size=2',
+        )
+        assert data['count'] == 7
+        # Остался только подзапрос с LIMIT, полный COUNT(*) взят из кеша.
+        assert len(queries) == 1
+        assert 'LIMIT 4' in queries[0]['sql'].upper()
+
+    def test_cached_count_keyed_by_filters(self, admin_client, titles,
+                                           settings):
+        settings.COUNT_EXACT_THRESHOLD = 0
+        Title.objects.create(name='Другое', year=1990, category=titles)
+        assert admin_client.get(URL_TITLES).json()['count'] == 8
+        data = admin_client.get(URL_TITLES + '?year=1990').json()
+        assert data['count'] == 1
+
+    def test_cached_count_invalidated_by_signals(self, admin_client, titles,
+                                                 settings):
+        settings.COUNT_EXACT_THRESHOLD = 0
+        assert admin_client.get(URL_TITLES).json()['count'] == 7
+        Title.objects.create(name='Новое', year=2000, category=titles)
+        assert admin_client.get(URL_TITLES).json()['count'] == 8
+        Title.objects.get(name='Новое').delete()
+        assert admin_client.get(URL_TITLES).json()['count'] == 7
+
+    def test_related_count_for_reviews(self, client, comments_setup):
+        title_id, _ = comments_setup
+        data, queries = get_with_queries(
+            client,
+            URL_REVIEWS.format(title_id=title_id),
+        )
+        assert data['count'] == 3
+        assert not queries, 'COUNT(*) не должен выполняться.'
+
+    def test_related_count_for_comments(self, client, comments_setup):
+        title_id, review_id = comments_setup
+        url = URL_COMMENTS.format(title_id=title_id, review_id=review_id)
+        data, queries = get_with_queries(client, url)
+        assert data['count'] == 3
+        assert not queries, 'COUNT(*) не должен выполняться.'
+        Comment.objects.filter(review=review_id).first().delete()
+        assert client.get(url).json()['count'] == 2
+
+    def test_related_count_etag_without_aggregate(self, client,
+                                                  comments_setup):
+        title_id, _ = comments_setup
+        url = URL_REVIEWS.format(title_id=title_id)
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url)
+        assert not [
+            query for query in captured.captured_queries
+            if 'COUNT(' in query['sql'].upper()
+        ], 'ETag списка должен строиться без агрегатного запроса.'
+        etag = response['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        Review.objects.filter(title=title_id).first().delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()['count'] == 2
+
+    def test_related_count_missing_parent(self, client):
+        data = client.get(URL_REVIEWS.format(title_id=404)).json()
+        assert data['count'] == 0
+
+    def test_unknown_strategy(self, admin_client, titles, settings):
+        settings.PAGINATION_POLICIES = {
+            'default': {'page_size': 5, 'max_page_size': 100,
+                        'count': 'approximate'},
+        }
+        with pytest.raises(ImproperlyConfigured):
+            admin_client.get(URL_TITLES)
+
+    def test_recalculate_review_comment_count(self, comments_setup):
+        _, review_id = comments_setup
+        Review.objects.filter(pk=review_id).update(comment_count=10)
+        out = StringIO()
+        call_command('recalculate_ratings', stdout=out)
+        assert f'Отзыв {review_id}: comment_count 10 -> 3' in out.getvalue()
+        assert Review.objects.get(pk=review_id).comment_count == 3
@@ -0,0 +1,124 @@
+import json
+import logging
+
+import pytest
+from django.db import connection
+
+from api.v1.profiling import RequestProfile, get_profile
+from reviews.models import Category, Title
+
+URL_TITLES = '/api/v1/titles/'
+LOGGER = 'api.v1.profiling'
+
+
+@pytest.fixture
+def titles():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    for idx in range(3):
+        Title.objects.create(name=f'Произведение {idx}', year=2000,
+                             category=category)
+
+
+@pytest.fixture
+def profiling_header(settings):
+    settings.PROFILING_HEADER = 'X-Profile'
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+def get_profile_records(caplog):
+    return [
+        json.loads(record.getMessage()) for record in caplog.records
+        if record.name == LOGGER
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30Profiling:
+
+    def test_disabled_by_default(self, admin_client, titles, caplog):
+        caplog.set_level(logging.INFO, logger=LOGGER)
+        response = admin_client.get(URL_TITLES, HTTP_X_PROFILE='1')
+        assert 'Server-Timing' not in response
+        assert not get_profile_records(caplog)
+
+    def test_header_enables_server_timing(self, admin_client, titles,
+                                          profiling_header, caplog):
+        caplog.set_level(logging.INFO, logger=LOGGER)
+        response = admin_client.get(
+            URL_TITLES + '?year=2000',
+            HTTP_X_PROFILE='1',
+        )
+        assert response.json()['count'] == 3
+        metrics = parse_server_timing(response['Server-Timing'])
+        for name in ('total', 'auth', 'permissions', 'throttles', 'filter',
+                     'db', 'serialize', 'render'):
+            assert name in metrics, f'В Server-Timing нет этапа {name}.'
+            assert float(metrics[name]['dur']) >= 0
+        assert 'queries' in metrics['db']['desc']
+        assert float(metrics['total']['dur']) >= float(
+            metrics['render']['dur'],
+        )
+        [record] = get_profile_records(caplog)
+        assert record['method'] == 'GET'
+        assert record['path'] == URL_TITLES
+        assert record['status'] == 200
+        assert record['db']['count'] >= 1
+        assert record['db']['slowest']['sql']
+        assert set(record['timings_ms']) >= {'auth', 'filter', 'serialize'}
+
+    def test_header_ignored_for_non_staff(self, client, user_client, titles,
+                                          profiling_header, caplog):
+        caplog.set_level(logging.INFO, logger=LOGGER)
+        for api_client in (client, user_client):
+            response = api_client.get(URL_TITLES, HTTP_X_PROFILE='1')
+            assert 'Server-Timing' not in response, (
+                'Профиль по заголовку доступен только администратору.'
+            )
+        assert not get_profile_records(caplog)
+
+    def test_header_allowed_in_debug(self, client, titles, profiling_header,
+                                     settings):
+        settings.DEBUG = True
+        response = client.get(URL_TITLES, HTTP_X_PROFILE='1')
+        assert 'Server-Timing' in response
+
+    def test_sampling_logs_without_header(self, client, titles, settings,
+                                          caplog):
+        caplog.set_level(logging.INFO, logger=LOGGER)
+        settings.PROFILING_SAMPLE_RATE = 1
+        response = client.get(URL_TITLES)
+        assert 'Server-Timing' not in response
+        assert len(get_profile_records(caplog)) == 1
+
+    def test_profile_reset_after_request(self, admin_client, titles,
+                                         profiling_header):
+        admin_client.get(URL_TITLES, HTTP_X_PROFILE='1')
+        assert get_profile() is None
+        assert not connection.execute_wrappers
+
+    def test_duplicate_queries(self):
+        profile = RequestProfile()
+        with connection.execute_wrapper(profile.execute):
+            for _ in range(2):
+                Title.objects.filter(pk=1).exists()
+            Category.objects.exists()
+        profile.finish()
+        stats = profile.get_db_stats()
+        assert stats['count'] == 3
+        assert len(stats['duplicates']) == 1
+        assert stats['duplicates'][0]['count'] == 2
+        assert 'duplicated' in profile.get_server_timing()
+
+    def test_nested_spans_counted_once(self):
+        profile = RequestProfile()
+        with profile.span('filter'):
+            with profile.span('filter'):
+                pass
+        assert list(profile.timings) == ['filter']